@@ -0,0 +1,164 @@
+'''
+	End-to-end benchmarks of polaris.PAPI against the local mock server of
+	mock_papi.py, which verifies every signature as Polaris does. Measured:
+
+		overhead	microseconds per sequential bibGet, and the same request
+				sent with a bare requests.Session; the difference is the
+				cost of PAPI itself (building, signing, retry and rate
+				limiting plumbing)
+		throughput	bibGet calls per second through bibGetMany with 1, 4,
+				16 and 64 workers; the mock server is itself a threaded
+				Python process, so compare these only between runs on
+				the same machine, with cores to spare
+		memory		peak memory allocated while reading a large reading
+				history buffered (json()), as a result model and as a row
+				stream (Python 3 only)
+		cache		microseconds per bibGet answered from a MemoryCache and
+				from a SqliteCache
+
+	The mock server runs in a separate process. Every figure is the median
+	of five runs (one with --quick). Results are printed as a table
+	and, with --json, written to a file together with the Python, requests
+	and git versions, so that runs of different versions can be compared
+	and regressions in the hot path caught.
+
+	Usage:
+	$ python benchmarks/bench_papi.py [--quick] [--json results.json] [suite ...]
+'''
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from time import time
+import requests
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0,os.path.join(here,os.pardir))
+sys.path.insert(0,here)
+import polaris
+import polaris.cache
+
+try: import tracemalloc
+except ImportError: tracemalloc = None
+
+accessKey = 'benchmark-access-key'
+accessKeyID = 'benchmark'
+patronBarcode = '21234000123456'
+patronPassword = '1234'
+
+def median(values):
+	values = sorted(values)
+	middle = len(values)//2
+	return values[middle] if len(values)%2 else (values[middle-1]+values[middle])/2.0
+
+def timed(func,iterations,repeats):
+	# The median over repeats of the seconds per call of func.
+	results = []
+	for repeat in range(repeats):
+		started = time()
+		for iteration in range(iterations): func()
+		results.append((time()-started)/iterations)
+	return median(results)
+
+def overhead(hostname,settings):
+	papi = polaris.PAPI(accessKey,accessKeyID,hostname)
+	session = requests.Session()
+	def bare():
+		# The request PAPI would send, prepared and signed up front.
+		response = session.send(preparedRequest)
+		response.json()
+	def signed():
+		papi.bibGet('353063').json()
+	endpoint = polaris._endpoints['bibGet']
+	preparedRequest = papi._prepare(endpoint.protocol,endpoint.HTTPMethod,endpoint.protection,endpoint.suffixURI({'bibID':'353063'}))
+	bare()
+	signed()
+	perCall = timed(signed,settings['calls'],settings['repeats'])
+	baseline = timed(bare,settings['calls'],settings['repeats'])
+	return [('bibGet us/call',perCall*1e6),('bare session us/call',baseline*1e6),('PAPI overhead us/call',(perCall-baseline)*1e6)]
+
+def throughput(hostname,settings):
+	rows = []
+	for workers in (1,4,16,64):
+		papi = polaris.PAPI(accessKey,accessKeyID,hostname,poolSize=workers)
+		bibIDs = [str(353063+index) for index in range(settings['batch'])]
+		def batch():
+			for result in papi.bibGetMany(bibIDs,maxWorkers=workers):
+				if result.error is not None: raise result.error
+		batch()
+		seconds = timed(batch,1,settings['repeats'])
+		rows.append(('{0} workers calls/s'.format(workers),len(bibIDs)/seconds))
+	return rows
+
+def memory(hostname,settings):
+	if tracemalloc is None: return []
+	papi = polaris.PAPI(accessKey,accessKeyID,hostname)
+	def buffered():
+		return len(papi.patronReadingHistoryGet(patronBarcode,patronPassword,'1','0').json()['PatronReadingHistoryGetRows'])
+	def model():
+		return len(papi.patronReadingHistoryGet(patronBarcode,patronPassword,'1','0',model=True).rows)
+	def streamed():
+		return sum(1 for row in papi.patronReadingHistoryGet(patronBarcode,patronPassword,'1','0',stream=True))
+	rows = []
+	for label,func in (('buffered json() peak MiB',buffered),('result model peak MiB',model),('row stream peak MiB',streamed)):
+		peaks = []
+		for repeat in range(settings['repeats']):
+			tracemalloc.start()
+			count = func()
+			peaks.append(tracemalloc.get_traced_memory()[1])
+			tracemalloc.stop()
+			if count != settings['rows']: raise AssertionError('{0} rows read, {1} expected'.format(count,settings['rows']))
+		rows.append((label,median(peaks)/1048576.0))
+	return rows
+
+def cache(hostname,settings):
+	rows = []
+	directory = tempfile.mkdtemp()
+	for label,backend in (('MemoryCache hit us/call',polaris.cache.MemoryCache()),('SqliteCache hit us/call',polaris.cache.SqliteCache(os.path.join(directory,'cache.sqlite')))):
+		papi = polaris.PAPI(accessKey,accessKeyID,hostname,cache=polaris.cache.ResponseCache(backend,ttls={'bibGet':3600}))
+		papi.bibGet('353063')
+		def hit():
+			papi.bibGet('353063').json()
+		rows.append((label,timed(hit,settings['calls'],settings['repeats'])*1e6))
+	return rows
+
+suites = (('overhead',overhead),('throughput',throughput),('memory',memory),('cache',cache))
+
+def versions():
+	try: commit = subprocess.check_output(['git','describe','--always','--dirty'],cwd=here,stderr=subprocess.STDOUT).decode('ascii').strip()
+	except Exception: commit = None
+	return {'python':platform.python_version(),'implementation':platform.python_implementation(),'requests':requests.__version__,'commit':commit}
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmarks polaris.PAPI against a local mock Polaris server.')
+	parser.add_argument('suites',nargs='*',metavar='suite',help='the suites to run: overhead, throughput, memory or cache (default all)')
+	parser.add_argument('--quick',action='store_true',help='fewer calls, for a smoke test')
+	parser.add_argument('--json',metavar='PATH',help='also write the results to PATH as JSON')
+	arguments = parser.parse_args()
+	unknown = set(arguments.suites)-set(name for name,suite in suites)
+	if unknown: parser.error('unknown suite: '+', '.join(sorted(unknown)))
+	settings = {'calls':200,'batch':500,'rows':100000,'repeats':5}
+	if arguments.quick: settings = {'calls':20,'batch':50,'rows':10000,'repeats':1}
+	server = subprocess.Popen([sys.executable,os.path.join(here,'mock_papi.py'),str(settings['rows'])],stdin=subprocess.PIPE,stdout=subprocess.PIPE)
+	hostname = server.stdout.readline().decode('ascii').strip()
+	results = {}
+	try:
+		# The mock must reject a wrong signature, or the figures mean nothing.
+		if polaris.PAPI('not-the-access-key',accessKeyID,hostname).bibGet('353063').status_code != 401: raise AssertionError('the mock server accepted a wrong signature')
+		print('{0:<12}{1:<28}{2:>14}'.format('suite','measure','value'))
+		for name,suite in suites:
+			if arguments.suites and name not in arguments.suites: continue
+			results[name] = suite(hostname,settings)
+			for measure,value in results[name]: print('{0:<12}{1:<28}{2:>14.2f}'.format(name,measure,value))
+	finally:
+		answered,rejected = [int(count) for count in server.communicate()[0].decode('ascii').split()]
+	if rejected != 1: raise AssertionError('{0} requests failed signature verification'.format(rejected-1))
+	if arguments.json:
+		with open(arguments.json,'w') as file:
+			json.dump({'versions':versions(),'settings':settings,'results':dict((name,dict(rows)) for name,rows in results.items())},file,indent=2,sort_keys=True)
+
+if __name__ == '__main__':
+	main()
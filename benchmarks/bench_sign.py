@@ -0,0 +1,57 @@
+'''
+	Micro-benchmark of PAPI request signing. "before" keys a new HMAC and
+	formats the Date for every signature, as _getPAPIHash and _prepare did;
+	"after" clones the keyed HMAC of polaris.client._Signer with the Date
+	cached per second. Before timing anything, both implementations are
+	checked against known-good signatures (also produced by openssl dgst
+	-sha1 -hmac).
+
+	Usage:
+	$ python benchmarks/bench_sign.py [iterations]
+'''
+import base64
+from email.utils import formatdate
+from hashlib import sha1
+import hmac
+import os
+import sys
+import timeit
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),os.pardir))
+import polaris
+
+# (access key, HTTP method, URI, Date, password or secret, signature)
+knownGood = [
+	('benchmark-access-key','GET','http://papi.example.org/PAPIService/REST/public/v1/1033/100/1/bib/353063','Wed, 17 Oct 2012 22:23:32 GMT','','akBTirLUxnc9stY1HnrrRzlkkH8='),
+	('benchmark-access-key','GET','http://papi.example.org/PAPIService/REST/public/v1/1033/100/1/patron/21234000123456/basicdata','Wed, 17 Oct 2012 22:23:32 GMT','1234','wXmHk/f9N0AZSDPRGssvMJid3RQ='),
+	('7F3E0F60-3F4C-4C1B-8B67-1A2B3C4D5E6F','POST','https://papi.example.org/PAPIService/REST/protected/v1/1033/100/1/authenticator/staff','Mon, 03 Apr 2017 14:05:09 GMT','','bH029hOpVQlA9ICUkgIc6y83mnc='),
+	('7F3E0F60-3F4C-4C1B-8B67-1A2B3C4D5E6F','PUT','https://papi.example.org/PAPIService/REST/public/v1/1033/100/1/patron/21234000123456/itemsout/8675309?wsid=1&userid=1&action=renew','Mon, 03 Apr 2017 14:05:09 GMT','staff-access-secret','2Qwcw/80IP+qOvhsEriqvXKK0+4='),
+]
+
+def legacySign(accessKey,HTTPMethod,URI,HTTPDate,password):
+	message = HTTPMethod + URI + HTTPDate + password
+	hashed = hmac.new(polaris.client._bytes(accessKey),polaris.client._bytes(message),sha1)
+	return polaris.client._native(base64.b64encode(hashed.digest()))
+
+def validate():
+	for accessKey,HTTPMethod,URI,HTTPDate,password,signature in knownGood:
+		signer = polaris.client._Signer(accessKey)
+		assert legacySign(accessKey,HTTPMethod,URI,HTTPDate,password) == signature
+		assert signer.sign(HTTPMethod,URI,HTTPDate,password) == signature
+		assert polaris.PAPI(accessKey,'benchmark','papi.example.org')._getPAPIHash(HTTPMethod,URI,HTTPDate,password) == signature
+	HTTPDate = polaris.client._httpDate()
+	assert HTTPDate == formatdate(polaris.client._date[0],localtime=False,usegmt=True)
+
+def main():
+	iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+	validate()
+	accessKey,HTTPMethod,URI,HTTPDate,password,signature = knownGood[1]
+	signer = polaris.client._Signer(accessKey)
+	before = timeit.timeit(lambda: legacySign(accessKey,HTTPMethod,URI,formatdate(timeval=None,localtime=False,usegmt=True),password),number=iterations)
+	after = timeit.timeit(lambda: signer.sign(HTTPMethod,URI,polaris.client._httpDate(),password),number=iterations)
+	print('{0:<10}{1:>10}{2:>10}'.format('signer','us/call','speedup'))
+	for name,seconds in (('before',before),('after',after)):
+		print('{0:<10}{1:>10.2f}{2:>9.2f}x'.format(name,seconds*1e6/iterations,before/seconds))
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,78 @@
+'''
+	Benchmark of the cold start cost of the polaris package, as paid by a
+	serverless function or cron worker, and of its per-call cost once warm.
+	Each run is a fresh interpreter which times, in milliseconds:
+
+		import polaris		the package alone
+		polaris.PAPI		loading the client and requests
+		PAPI()			constructing a client
+		first bibGet		the first call, against the mock server of
+					mock_papi.py, including its connection
+		warm bibGet		the mean of the next calls on the kept alive
+					connection
+		subsystems		importing polaris.cache, polaris.resilience,
+					polaris.ratelimit and polaris.models
+
+	and reports whether requests had been imported by import polaris. The
+	figures are medians over the runs.
+
+	Usage:
+	$ python benchmarks/bench_startup.py [runs] [calls]
+'''
+import json
+import os
+import subprocess
+import sys
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+probe = r'''
+import sys
+from time import time
+sys.path.insert(0,{root!r})
+started = time()
+import polaris
+imported = time()
+eager = 'requests' in sys.modules
+PAPI = polaris.PAPI
+loaded = time()
+papi = PAPI('benchmark-access-key','benchmark',{hostname!r})
+constructed = time()
+papi.bibGet('353063').json()
+first = time()
+for call in range({calls}): papi.bibGet('353063').json()
+warm = time()
+import polaris.cache, polaris.resilience, polaris.ratelimit, polaris.models
+subsystems = time()
+import json
+print(json.dumps({{'import polaris':(imported-started)*1e3,'polaris.PAPI':(loaded-imported)*1e3,'PAPI()':(constructed-loaded)*1e3,'first bibGet':(first-constructed)*1e3,'warm bibGet':(warm-first)*1e3/{calls},'subsystems':(subsystems-warm)*1e3,'eager':eager}}))
+'''
+
+measures = ('import polaris','polaris.PAPI','PAPI()','first bibGet','warm bibGet','subsystems')
+
+def median(values):
+	values = sorted(values)
+	middle = len(values)//2
+	return values[middle] if len(values)%2 else (values[middle-1]+values[middle])/2.0
+
+def main():
+	runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+	calls = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+	server = subprocess.Popen([sys.executable,os.path.join(here,'mock_papi.py'),'10'],stdin=subprocess.PIPE,stdout=subprocess.PIPE)
+	hostname = server.stdout.readline().decode('ascii').strip()
+	results = []
+	try:
+		code = probe.format(root=os.path.join(here,os.pardir),hostname=hostname,calls=calls)
+		for run in range(runs):
+			output = subprocess.check_output([sys.executable,'-c',code]).decode('utf-8')
+			results.append(json.loads(output))
+	finally:
+		answered,rejected = [int(count) for count in server.communicate()[0].decode('ascii').split()]
+	if rejected: raise AssertionError('{0} requests failed signature verification'.format(rejected))
+	print('{0:<16}{1:>10}'.format('measure','ms'))
+	for measure in measures:
+		print('{0:<16}{1:>10.2f}'.format(measure,median([result[measure] for result in results])))
+	print('{0:<16}{1:>10}'.format('requests eager','yes' if any(result['eager'] for result in results) else 'no'))
+
+if __name__ == '__main__':
+	main()
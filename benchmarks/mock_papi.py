@@ -0,0 +1,171 @@
+'''
+	A local mock of the Polaris API server for benchmarks. It checks the
+	PWS signature of every request exactly as Polaris does, HMAC-SHA1 of
+	HTTP method + URI + Date + patron password (or access secret) under the
+	access key, and answers a fixed set of public methods with canned
+	payloads encoded once at startup:
+
+		bibGet, bibHoldingsGet, patronBasicDataGet, patronReadingHistoryGet
+
+	Requests with a missing, stale or wrong signature get a 401. Every
+	bibID exists; the patrons are those given to the constructor.
+
+	Run it in its own process, so that it does not compete with the client
+	being measured for the interpreter lock; it prints the hostname to use
+	and serves until its standard input is closed, then prints the number
+	of requests answered and rejected:
+	$ python benchmarks/mock_papi.py [readingHistorySize]
+
+	or in process:
+	>>> server = MockPAPI('benchmark-access-key','benchmark',{'21234000123456':'1234'})
+	>>> hostname = server.start()
+	>>> papi = polaris.PAPI('benchmark-access-key','benchmark',hostname)
+	>>> server.stop()
+'''
+import base64
+from email.utils import mktime_tz, parsedate_tz
+from hashlib import sha1
+import hmac
+import json
+import re
+import sys
+import threading
+from time import time
+try:
+	from http.server import BaseHTTPRequestHandler, HTTPServer
+	from socketserver import ThreadingMixIn
+except ImportError:
+	from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+	from SocketServer import ThreadingMixIn
+
+_route = re.compile(r'^/PAPIService/REST/public/v1/\d+/\d+/\d+/(bib|patron)/([^/?]+)(/[a-z]+)?(?:\?(.*))?$')
+
+def _payload(body):
+	return json.dumps(body,separators=(',',':')).encode('utf-8')
+
+def bibRows(bibID):
+	labels = [(35,'Title:','The benchmark of everything'),(18,'Author:','Doe, Jane'),(2,'Publisher:','Example Press, 2017'),(17,'ISBN:','0-316-76948-7 (pbk.)'),(10,'Format:','Book'),(3,'Call Number:','FIC DOE'),(12,'Subject:','Benchmarks -- Fiction')]
+	return [{'ElementID':elementID,'Position':position,'Label':label,'Value':value} for position,(elementID,label,value) in enumerate(labels,1)]
+
+def holdingsRows(count=6):
+	return [{'LocationID':3+index%3,'LocationName':['Main Library','North Branch','South Branch'][index%3],'CollectionName':'Adult Fiction','Barcode':'3123400%07d' % index,'PublicNote':'','CallNumber':'FIC DOE','Designation':'','VolumeNumber':'','ShelfLocation':'New Books','CircStatus':'In' if index%2 else 'Out','LastCircDate':'/Date(1491058000000-0400)/','MaterialType':'Book','TextualHoldingsNote':'','RetentionStatement':'','HoldingsStatement':'','HoldingsNote':'','Holdable':True,'DueDate':'/Date(1492058000000-0400)/' if index%2 == 0 else None} for index in range(count)]
+
+def readingHistoryRows(count):
+	return [{'PatronReadingHistoryID':index,'BibID':100000+index,'CheckOutDate':'/Date(1491058000000-0400)/','Title':'Title number %d of the reading history' % index,'Author':'Doe, Jane','FormatID':1,'FormatDescription':'Book','ItemBarcode':'3123400%07d' % index,'LoaningOrgID':3,'LoaningOrgName':'Main Library'} for index in range(count)]
+
+class MockPAPI(object):
+
+	def __init__(self,accessKey,accessKeyID,patrons=None,readingHistorySize=100000,maxSkew=900):
+		self.accessKey = accessKey
+		self.accessKeyID = accessKeyID
+		self.patrons = dict(patrons or {})
+		self.maxSkew = maxSkew
+		self.requests = 0
+		self.rejected = 0
+		self._lock = threading.Lock()
+		self._bib = _payload({'PAPIErrorCode':7,'ErrorMessage':'','BibGetRows':bibRows('1')})
+		self._holdings = _payload({'PAPIErrorCode':6,'ErrorMessage':'','BibHoldingsGetRows':holdingsRows()})
+		self._history = readingHistoryRows(readingHistorySize)
+		self._historyAll = _payload({'PAPIErrorCode':len(self._history),'ErrorMessage':'','PatronReadingHistoryGetRows':self._history})
+		self._server = None
+
+	def signature(self,HTTPMethod,URI,HTTPDate,password):
+		message = (HTTPMethod+URI+HTTPDate+password).encode('utf-8')
+		return base64.b64encode(hmac.new(self.accessKey.encode('utf-8'),message,sha1).digest())
+
+	def start(self):
+		'''
+			Starts serving on a free local port and returns the hostname to
+			give to polaris.PAPI.
+		'''
+		mock = self
+		class Handler(_Handler):
+			server_mock = mock
+		self._server = _Server(('127.0.0.1',0),Handler)
+		thread = threading.Thread(target=self._server.serve_forever)
+		thread.daemon = True
+		thread.start()
+		return '127.0.0.1:{port}'.format(port=self._server.server_address[1])
+
+	def stop(self):
+		self._server.shutdown()
+		self._server.server_close()
+
+	def answer(self,method,path,headers):
+		# Returns (status,payload) for a request; a status of None drops
+		# the connection without answering.
+		with self._lock: self.requests += 1
+		match = _route.match(path)
+		if match is None: return 404,_payload({'PAPIErrorCode':-1,'ErrorMessage':'Unknown method'})
+		kind,key,action,query = match.groups()
+		if kind == 'patron':
+			if key not in self.patrons: return 200,_payload({'PAPIErrorCode':-3000,'ErrorMessage':'Patron does not exist'})
+			password = self.patrons[key]
+		else: password = ''
+		if not self._authorised(method,path,headers,password):
+			with self._lock: self.rejected += 1
+			return 401,_payload({'PAPIErrorCode':-1,'ErrorMessage':'Invalid signature'})
+		if kind == 'bib' and action is None: return 200,self._bib
+		if kind == 'bib' and action == '/holdings': return 200,self._holdings
+		if kind == 'patron' and action == '/basicdata':
+			return 200,_payload({'PAPIErrorCode':0,'ErrorMessage':'','PatronBasicData':{'PatronID':121175,'Barcode':key,'NameFirst':'Jane','NameLast':'Doe','PhoneNumber':'555-0100','EmailAddress':'jane@example.org','ItemsOutCount':3,'ItemsOutOverdue':0,'HoldRequestsTotalCount':2,'ChargeBalance':1.5}})
+		if kind == 'patron' and action == '/readinghistory':
+			params = dict(pair.split('=',1) for pair in (query or '').split('&') if '=' in pair)
+			rowsPerPage = int(params.get('rowsperpage','0'))
+			if rowsPerPage == 0: return 200,self._historyAll
+			page = int(params.get('page','1'))
+			rows = self._history[(page-1)*rowsPerPage:page*rowsPerPage]
+			return 200,_payload({'PAPIErrorCode':len(rows),'ErrorMessage':'','PatronReadingHistoryGetRows':rows})
+		return 404,_payload({'PAPIErrorCode':-1,'ErrorMessage':'Unknown method'})
+
+	def _authorised(self,method,path,headers,password):
+		authorization = headers.get('Authorization') or ''
+		HTTPDate = headers.get('Date') or ''
+		prefix = 'PWS {accessKeyID}:'.format(accessKeyID=self.accessKeyID)
+		if not authorization.startswith(prefix): return False
+		date = parsedate_tz(HTTPDate)
+		if date is None or abs(mktime_tz(date)-time()) > self.maxSkew: return False
+		URI = 'http://{host}{path}'.format(host=headers.get('Host'),path=path)
+		signature = authorization[len(prefix):]
+		if not isinstance(signature,bytes): signature = signature.encode('latin-1')
+		return hmac.compare_digest(signature,self.signature(method,URI,HTTPDate,password))
+
+class _Server(ThreadingMixIn,HTTPServer):
+	daemon_threads = True
+	request_queue_size = 512
+
+class _Handler(BaseHTTPRequestHandler):
+	protocol_version = 'HTTP/1.1'
+	# Headers and body go out in separate writes; without this, Nagle's
+	# algorithm and delayed ACKs add 40ms to every response.
+	disable_nagle_algorithm = True
+
+	def log_message(self,*args):
+		pass
+
+	def _answer(self):
+		length = int(self.headers.get('Content-Length') or 0)
+		if length: self.rfile.read(length)
+		status,payload = self.server_mock.answer(self.command,self.path,self.headers)
+		if status is None:
+			self.close_connection = True
+			return
+		self.send_response(status)
+		self.send_header('Content-Type','application/json')
+		self.send_header('Content-Length',str(len(payload)))
+		self.end_headers()
+		self.wfile.write(payload)
+
+	do_GET = do_PUT = do_POST = do_DELETE = _answer
+
+def main():
+	server = MockPAPI('benchmark-access-key','benchmark',{'21234000123456':'1234'},int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
+	print(server.start())
+	sys.stdout.flush()
+	sys.stdin.read()
+	server.stop()
+	print('{0} {1}'.format(server.requests,server.rejected))
+	sys.stdout.flush()
+
+if __name__ == '__main__':
+	main()
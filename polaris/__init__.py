@@ -0,0 +1,33 @@
+import sys
+
+# Importing polaris loads nothing else. The client, and with it requests,
+# is imported the first time polaris.PAPI (or any other name of
+# polaris.client) is used, and every optional subsystem (polaris.cache,
+# polaris.aio, ...) the first time it is used or imported itself, so that
+# short lived workers only pay for what they call.
+
+__all__ = ['PAPI','PAPIError','DeadlineExceeded','NotAdmitted','SingleFlight','StaffTokenManager','BatchResult','HoldOutcome']
+
+_submodules = ('aio','cache','circulation','client','export','metrics','mirror','models','ratelimit','replay','resilience','scheduler','stream','sync')
+
+if sys.version_info >= (3,7):
+	import importlib
+
+	def __getattr__(name):
+		if name in _submodules: return importlib.import_module('.'+name,__name__)
+		if name.startswith('__'): raise AttributeError("module 'polaris' has no attribute '{0}'".format(name))
+		client = importlib.import_module('.client',__name__)
+		if not hasattr(client,name): raise AttributeError("module 'polaris' has no attribute '{0}'".format(name))
+		value = getattr(client,name)
+		# Private names of the client (such as the Date cache) can change
+		# and are looked up afresh every time.
+		if name in __all__: globals()[name] = value
+		return value
+
+	def __dir__():
+		return sorted(set(globals())|set(__all__)|set(_submodules))
+else:
+	# Without module __getattr__ (Python < 3.7) the client is imported
+	# eagerly; the subsystems must still be imported by name.
+	from . import client
+	globals().update((name,value) for name,value in vars(client).items() if not name.startswith('__'))
@@ -0,0 +1,193 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from itertools import count
+from time import time
+from .client import PAPI, BatchResult, _availability, _body, _branchNames, _holdCreateFields
+
+class AsyncPAPI(PAPI):
+	'''
+	An asyncio interface into the Polaris API (Python 3.7+)
+
+	AsyncPAPI exposes the same methods as polaris.PAPI, but every method
+	returns a coroutine which resolves to the requests library Response
+	object, and the batch helpers (bibGetMany, placeHoldMany, ...) and the
+	iter* methods are asynchronous generators, to be used with async for.
+	URI construction, HMAC signing and the keyword arguments accepted by
+	the PAPI constructor (such as cache) are shared with PAPI; only the
+	sending of the request differs.
+
+	Example usage:
+
+	>>> import polaris.aio
+	>>> papi = polaris.aio.AsyncPAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',concurrency=20)
+	>>> resp = await papi.bibGet('353063')
+	>>> resps = await asyncio.gather(*[papi.bibHoldingsGet(bibID) for bibID in bibIDs])
+	>>> async for result in papi.bibGetMany(bibIDs,maxWorkers=4):
+	...	print(result.key, result.error or result.response.json())
+
+	Requests are sent over a pooled keep-alive connection per host. At most
+	concurrency requests are in flight at once; further calls wait for a
+	free slot before they are signed, so that the Date header of a request
+	is never older than the moment it is sent.
+	'''
+
+	def __init__(self,accessKey,accessKeyID,hostname,concurrency=10,**kwargs):
+		# Unless sized otherwise, the pools keep a connection open for every
+		# request that may be in flight at the same time.
+		kwargs.setdefault('poolSize',concurrency)
+		PAPI.__init__(self,accessKey,accessKeyID,hostname,**kwargs)
+		self._concurrency = concurrency
+		self._executor = ThreadPoolExecutor(max_workers=concurrency)
+		self._semaphore = None
+		self._inflight = {}
+		self._coalesced = 0
+
+	def _slot(self):
+		# The semaphore is created lazily so that it belongs to the event
+		# loop actually running the calls rather than whichever loop was
+		# current when the object was constructed.
+		if self._semaphore is None:
+			self._semaphore = asyncio.Semaphore(self._concurrency)
+		return self._semaphore
+
+	async def _dispatch(self,protocol,HTTPMethod,protection,suffixURI,endpoint,**kwargs):
+		# The synchronous pipeline of PAPI (cache lookup, signing, sending)
+		# runs on a worker thread, so every PAPI option applies here too.
+		loop = asyncio.get_running_loop()
+		call = functools.partial(PAPI._undifferentiatied,self,protocol,HTTPMethod,protection,suffixURI,endpoint,**kwargs)
+		async with self._slot():
+			return await loop.run_in_executor(self._executor,call)
+
+	async def _undifferentiatied(self,protocol,HTTPMethod,protection,suffixURI,endpoint=None,**kwargs):
+		if self._singleFlight is None or HTTPMethod!='GET':
+			return await self._dispatch(protocol,HTTPMethod,protection,suffixURI,endpoint,**kwargs)
+		# Identical GETs are coalesced before they take a concurrency slot,
+		# so waiting callers do not hold worker threads.
+		key = self._flightKey(HTTPMethod,protocol,protection,suffixURI,**kwargs)
+		future = self._inflight.get(key)
+		if future is None:
+			future = self._inflight[key] = asyncio.ensure_future(self._dispatch(protocol,HTTPMethod,protection,suffixURI,endpoint,**kwargs))
+			future.add_done_callback(lambda future: self._inflight.pop(key,None))
+		else: self._coalesced += 1
+		return await asyncio.shield(future)
+
+	async def _request(self,name,fields,model=False,**kwargs):
+		response = await self._call(name,fields,**kwargs)
+		return self._result(name,response,model,kwargs.get('stream',False))
+
+	async def _requestWithStaffToken(self,endpoint,fields,**kwargs):
+		# As PAPI._requestWithStaffToken, but authentication (which may block)
+		# happens on a worker thread.
+		loop = asyncio.get_running_loop()
+		accessToken,accessSecret = await loop.run_in_executor(self._executor,self._tokens.get)
+		response = await self._undifferentiatied(endpoint.protocol,endpoint.HTTPMethod,endpoint.protection,endpoint.suffixURI(dict(fields,accessToken=accessToken)),endpoint=endpoint.name,**dict(kwargs,accessSecret=accessSecret))
+		if response.status_code not in (401,403): return response
+		accessToken,accessSecret = await loop.run_in_executor(self._executor,self._tokens.renew,accessToken)
+		return await self._undifferentiatied(endpoint.protocol,endpoint.HTTPMethod,endpoint.protection,endpoint.suffixURI(dict(fields,accessToken=accessToken)),endpoint=endpoint.name,**dict(kwargs,accessSecret=accessSecret))
+
+	async def placeHold(self,patronID,bibID,pickupOrgID,workstationID,userID,requestingOrgID,answerPolicy=None,maxSteps=10,**kwargs):
+		# As PAPI.placeHold; every conversation only holds a concurrency
+		# slot while one of its requests is in flight, so any number can be
+		# gathered at once.
+		started = time()
+		replyKwargs = dict((key,value) for key,value in kwargs.items() if key not in _holdCreateFields)
+		response = await self.holdRequestCreate(patronID,bibID,pickupOrgID,workstationID,userID,requestingOrgID,**kwargs)
+		steps = 1
+		while True:
+			outcome,reply = self._holdProgress(response,requestingOrgID,answerPolicy,steps,maxSteps,started)
+			if outcome is not None: return outcome
+			response = await self.holdRequestReply(*reply,**replyKwargs)
+			steps += 1
+
+	async def _fanOut(self,method,items,key,ordered=True,maxWorkers=8,queueDepth=32,deadline=None,**kwargs):
+		# As PAPI._fanOut, with tasks instead of worker threads: at most
+		# maxWorkers calls are running at once (and within them at most
+		# concurrency requests in flight). queueDepth is accepted for
+		# compatibility; items are only read as calls are started.
+		kwargs.setdefault('priority','batch')
+		deadlineAt = time()+deadline if deadline is not None else None
+		async def call(args):
+			callKwargs = kwargs if deadlineAt is None else dict(kwargs,deadline=deadlineAt-time())
+			try: return BatchResult(key(args),await method(*args,**callKwargs),None)
+			except Exception as e: return BatchResult(key(args),None,e)
+		items = iter(items)
+		pending = deque()
+		try:
+			while True:
+				for args in items:
+					pending.append(asyncio.ensure_future(call(args)))
+					if len(pending) >= maxWorkers: break
+				if not pending: return
+				if ordered: yield await pending.popleft()
+				else:
+					done,_ = await asyncio.wait(pending,return_when=asyncio.FIRST_COMPLETED)
+					for task in done:
+						pending.remove(task)
+						yield task.result()
+		finally:
+			for task in pending: task.cancel()
+
+	async def _iterPages(self,fetchPage,rowsKey,perPage,prefetch,firstPage=1):
+		# As PAPI._iterPages; fetchPage(page) returns a coroutine, and the
+		# next prefetch pages are requested as tasks while the current one
+		# is being consumed.
+		perPage = int(perPage)
+		if perPage <= 0: prefetch = 0
+		pages = count(firstPage)
+		pending = deque()
+		try:
+			while True:
+				while len(pending) <= prefetch:
+					page = next(pages)
+					pending.append((page,asyncio.ensure_future(fetchPage(page))))
+				page,task = pending.popleft()
+				body = _body(await task)
+				rows = body.get(rowsKey) or []
+				total = body.get('TotalRecordsFound')
+				del body
+				for row in rows: yield row
+				if perPage <= 0 or len(rows) < perPage or (total is not None and page*perPage >= total): return
+		finally:
+			for page,task in pending: task.cancel()
+
+	async def bibAvailabilityGet(self,bibIDs,orgIDs=None,maxWorkers=None,**kwargs):
+		# As PAPI.bibAvailabilityGet; the holdings are fetched as tasks,
+		# maxWorkers (by default concurrency) at a time.
+		bibIDs = [str(bibID) for bibID in bibIDs]
+		kwargs.setdefault('priority','interactive')
+		workers = asyncio.Semaphore(maxWorkers or self._concurrency)
+		async def fetch(bibID):
+			async with workers:
+				return _body(await self.bibHoldingsGet(bibID,**kwargs)).get('BibHoldingsGetRows') or []
+		results = await asyncio.gather(self._branchNames(**kwargs),*[fetch(bibID) for bibID in bibIDs],return_exceptions=True)
+		branches = results[0] if not isinstance(results[0],Exception) else None
+		holdings = dict((bibID,rows) for bibID,rows in zip(bibIDs,results[1:]) if not isinstance(rows,Exception))
+		return _availability(bibIDs,holdings,branches,orgIDs)
+
+	async def _branchNames(self,**kwargs):
+		# As PAPI._branchNames; no lock is needed on the event loop.
+		if self._branches is None: self._branches = _branchNames(_body(await self.organizationsGet('branch',**kwargs)))
+		return self._branches
+
+	def singleFlightStats(self):
+		stats = PAPI.singleFlightStats(self)
+		stats['coalesced'] += self._coalesced
+		return stats
+
+	async def close(self):
+		'''
+			Release the worker threads and pooled connections.
+
+			Example:
+			>>> await papi.close()
+		'''
+		self._executor.shutdown(wait=True)
+		self._session.close()
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self,*excInfo):
+		await self.close()
@@ -0,0 +1,242 @@
+from collections import OrderedDict
+from hashlib import sha1
+import json
+import sqlite3
+import threading
+from time import time
+import requests
+from .client import SingleFlight
+
+class ResponseCache(object):
+	'''
+	A response cache for the idempotent (GET) methods of polaris.PAPI
+
+	Example usage:
+
+	>>> import polaris.cache
+	>>> cache = polaris.cache.ResponseCache(ttls={'collectionsGet':3600,'organizationsGet':3600})
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',cache=cache)
+	>>> papi.collectionsGet()	# sent to Polaris
+	>>> papi.collectionsGet()	# answered from the cache for the next hour
+
+	ttls maps PAPI method names to the number of seconds their successful
+	responses stay fresh. Methods without a ttl are never cached. By default
+	the near-static reference data methods collectionsGet,
+	organizationsGet, limitFiltersGet and sortOptionsGet are cached for an
+	hour.
+
+	Responses are stored in backend, which defaults to an in-process
+	MemoryCache. Use a SqliteCache to share one warm cache between worker
+	processes. Entries are keyed on the method, the full request URI and a
+	hash of any patron password or access secret and token used, so
+	credentials themselves are never stored.
+
+	staleWhileRevalidate maps method names to a further number of seconds
+	during which an expired entry is still returned immediately while a
+	single background request refreshes it. This suits records which change
+	rarely but must stay reasonably current, for example:
+
+	>>> cache = polaris.cache.ResponseCache(ttls={'bibGet':3600,'bibHoldingsGet':30},staleWhileRevalidate={'bibGet':86400,'bibHoldingsGet':60})
+
+	Whenever an entry is missing, concurrent calls for the same key wait for
+	one request to Polaris instead of each sending their own.
+
+	Cached entries are returned as fresh requests Response objects with the
+	attribute fromCache set to True.
+	'''
+
+	defaultTTLs = {	'collectionsGet':3600,
+					'organizationsGet':3600,
+					'limitFiltersGet':3600,
+					'sortOptionsGet':3600}
+
+	def __init__(self,backend=None,ttls=None,staleWhileRevalidate=None):
+		self._backend = backend if backend is not None else MemoryCache()
+		self._ttls = dict(self.defaultTTLs if ttls is None else ttls)
+		self._stale = dict(staleWhileRevalidate or {})
+		self._misses = SingleFlight()
+		self._refreshing = set()
+		self._lock = threading.Lock()
+
+	def ttl(self,endpoint):
+		'''
+			Returns the ttl of the PAPI method named endpoint, or None if its
+			responses are not cached.
+		'''
+		return self._ttls.get(endpoint)
+
+	def key(self,endpoint,URI,credential=''):
+		credentialHash = sha1(credential.encode('utf-8')).hexdigest() if credential else ''
+		return '{endpoint}|{URI}|{credentialHash}'.format(endpoint=endpoint,URI=URI,credentialHash=credentialHash)
+
+	def fetch(self,endpoint,key,send):
+		'''
+			Returns the response cached under key for the PAPI method named
+			endpoint, calling send() to obtain (and store) it from Polaris
+			when it is missing. Stale entries are returned while send() runs
+			on a background thread.
+		'''
+		entry = self._load(key)
+		if entry is None:
+			return self._misses.do(key,lambda: self._store(endpoint,key,send()))
+		response,freshUntil = entry
+		if freshUntil <= time(): self._refresh(endpoint,key,send)
+		return response
+
+	def _refresh(self,endpoint,key,send):
+		with self._lock:
+			if key in self._refreshing: return
+			self._refreshing.add(key)
+		def refresh():
+			try: self._store(endpoint,key,send())
+			except Exception: pass	# the stale entry is kept until it expires
+			finally:
+				with self._lock: self._refreshing.discard(key)
+		thread = threading.Thread(target=refresh)
+		thread.daemon = True
+		thread.start()
+
+	def _load(self,key):
+		payload = self._backend.get(key)
+		if payload is None: return None
+		return _loads(payload)
+
+	def _store(self,endpoint,key,response):
+		if response.status_code == 200:
+			ttl = self._ttls[endpoint]
+			self._backend.set(key,_dumps(response,time()+ttl),ttl+self._stale.get(endpoint,0))
+		return response
+
+	def invalidate(self,endpoint=None):
+		'''
+			Drops the cached responses of the PAPI method named endpoint, or
+			every cached response when called without arguments.
+
+			Example:
+			>>> cache.invalidate('organizationsGet')
+		'''
+		self._backend.delete('' if endpoint is None else endpoint+'|')
+
+def _dumps(response,freshUntil):
+	head = json.dumps({	'status':response.status_code,
+						'reason':response.reason,
+						'url':response.url,
+						'encoding':response.encoding,
+						'headers':dict(response.headers),
+						'freshUntil':freshUntil})
+	return head.encode('utf-8')+b'\n'+response.content
+
+def _loads(payload):
+	head,content = payload.split(b'\n',1)
+	head = json.loads(head.decode('utf-8'))
+	response = requests.Response()
+	response.status_code = head['status']
+	response.reason = head['reason']
+	response.url = head['url']
+	response.encoding = head['encoding']
+	response.headers = requests.structures.CaseInsensitiveDict(head['headers'])
+	response._content = content
+	response.fromCache = True
+	return response,head['freshUntil']
+
+class MemoryCache(object):
+	'''
+	In-process storage for ResponseCache. Holds at most maxEntries entries
+	and, if maxBytes is given, at most maxBytes bytes of payload, evicting
+	the least recently used entries first.
+	'''
+
+	def __init__(self,maxEntries=1024,maxBytes=None):
+		self._maxEntries = maxEntries
+		self._maxBytes = maxBytes
+		self._entries = OrderedDict()
+		self._bytes = 0
+		self._lock = threading.Lock()
+
+	def _remove(self,key):
+		expires,payload = self._entries.pop(key)
+		self._bytes -= len(payload)
+
+	def get(self,key):
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None: return None
+			if entry[0] <= time():
+				self._remove(key)
+				return None
+			# Re-inserting moves the entry to the most recently used end.
+			del self._entries[key]
+			self._entries[key] = entry
+			return entry[1]
+
+	def set(self,key,payload,ttl):
+		with self._lock:
+			if key in self._entries: self._remove(key)
+			self._entries[key] = (time()+ttl,payload)
+			self._bytes += len(payload)
+			while self._entries and (len(self._entries) > self._maxEntries or (self._maxBytes is not None and self._bytes > self._maxBytes)):
+				self._remove(next(iter(self._entries)))
+
+	def delete(self,prefix=''):
+		with self._lock:
+			for key in [key for key in self._entries if key.startswith(prefix)]:
+				self._remove(key)
+
+class SqliteCache(object):
+	'''
+	On-disk storage for ResponseCache which may be shared by every process
+	on a host. Holds at most maxEntries entries and, if maxBytes is given,
+	at most maxBytes bytes of payload, evicting the least recently used
+	entries first. Recency is approximate: a hit only records its time of
+	use if the last one recorded is more than touchInterval seconds old, so
+	that reads of hot entries do not each take the write lock of the
+	database.
+
+	Example:
+	>>> cache = polaris.cache.ResponseCache(polaris.cache.SqliteCache('/var/tmp/papi-cache.sqlite'))
+	'''
+
+	def __init__(self,path,maxEntries=100000,maxBytes=None,touchInterval=60.0):
+		self._maxEntries = maxEntries
+		self._maxBytes = maxBytes
+		self._touchInterval = touchInterval
+		self._lock = threading.Lock()
+		self._db = sqlite3.connect(path,timeout=30,isolation_level=None,check_same_thread=False)
+		self._db.execute('PRAGMA journal_mode=WAL')
+		self._db.execute('CREATE TABLE IF NOT EXISTS papi_cache (key TEXT PRIMARY KEY, payload BLOB NOT NULL, size INTEGER NOT NULL, expires REAL NOT NULL, used REAL NOT NULL)')
+		self._db.execute('CREATE INDEX IF NOT EXISTS papi_cache_used ON papi_cache (used)')
+
+	def get(self,key):
+		now = time()
+		with self._lock:
+			row = self._db.execute('SELECT payload,expires,used FROM papi_cache WHERE key=?',(key,)).fetchone()
+			if row is None: return None
+			if row[1] <= now:
+				self._db.execute('DELETE FROM papi_cache WHERE key=?',(key,))
+				return None
+			if now-row[2] > self._touchInterval:
+				self._db.execute('UPDATE papi_cache SET used=? WHERE key=? AND used<?',(now,key,now-self._touchInterval))
+			return bytes(row[0])
+
+	def set(self,key,payload,ttl):
+		now = time()
+		with self._lock:
+			self._db.execute('BEGIN IMMEDIATE')
+			try:
+				self._db.execute('INSERT OR REPLACE INTO papi_cache (key,payload,size,expires,used) VALUES (?,?,?,?,?)',(key,sqlite3.Binary(payload),len(payload),now+ttl,now))
+				self._db.execute('DELETE FROM papi_cache WHERE expires<=?',(now,))
+				self._db.execute('DELETE FROM papi_cache WHERE key IN (SELECT key FROM papi_cache ORDER BY used DESC LIMIT -1 OFFSET ?)',(self._maxEntries,))
+				if self._maxBytes is not None:
+					total = self._db.execute('SELECT COALESCE(SUM(size),0) FROM papi_cache').fetchone()[0]
+					while total > self._maxBytes:
+						oldest,size = self._db.execute('SELECT key,size FROM papi_cache ORDER BY used LIMIT 1').fetchone()
+						self._db.execute('DELETE FROM papi_cache WHERE key=?',(oldest,))
+						total -= size
+				self._db.execute('COMMIT')
+			except Exception:
+				self._db.execute('ROLLBACK')
+				raise
+
+	def delete(self,prefix=''):
+		with self._lock:
+			self._db.execute('DELETE FROM papi_cache WHERE substr(key,1,?)=?',(len(prefix),prefix))
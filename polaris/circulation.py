@@ -0,0 +1,154 @@
+from collections import namedtuple
+import json
+import os
+from time import time
+from .client import _boundedMap, _parseDate
+
+CirculationOutcome = namedtuple('CirculationOutcome',['patronBarcode','action','id','ok','errorCode','message'])
+
+class CirculationEngine(object):
+	'''
+	Bulk circulation operations across many patrons with polaris.PAPI
+
+	Example usage:
+
+	>>> import polaris.circulation
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname')
+	>>> engine = polaris.circulation.CirculationEngine(papi,maxWorkers=32,report='/var/tmp/autorenew.jsonl')
+	>>> dueSoon = lambda item: polaris.circulation.dueWithin(item,days=3)
+	>>> for outcome in engine.renew(credentials,logonBranchID='3',logonUserID='2',logonWorkstationID='1',select=dueSoon):
+	...	if not outcome.ok: print(outcome)
+	>>> engine.stats
+	{'renew': {'ok': 10412, 'failed': 377}, 'itemsOut': {'ok': 25000, 'failed': 0}}
+
+	credentials is any iterable (a generator over a patron export, say) of
+	(patronBarcode,patronPassword) pairs; it is read only as fast as the
+	patrons are processed. For every patron, the items out (or hold
+	requests) are fetched and the selected ones renewed (or suspended),
+	with maxWorkers patrons processed at a time. As every worker has at
+	most one request in flight, maxWorkers is the number of concurrent
+	requests made against the Polaris server.
+
+	Each operation yields a CirculationOutcome(patronBarcode,action,id,ok,
+	errorCode,message) per item renewed or hold request suspended, and one
+	with action 'itemsOut' or 'holdRequests' and id None for patrons whose
+	items or holds could not be fetched. Outcomes are yielded as patrons
+	complete, not in input order.
+
+	With report, the path of a file, every outcome is also appended to it
+	as a line of JSON, followed by a line marking the patron done. Patrons
+	marked done in an existing report are skipped, so an interrupted job
+	resumes by running it again with the same report. (A patron is only
+	marked done once all of its items or holds are processed, so those of
+	a patron interrupted part way through are processed again.) Passwords
+	are never written to the report.
+
+	Further keyword arguments are passed on to every PAPI call; pass
+	accessToken and the access secret in place of the patron passwords to
+	use staff override. Calls are made with priority='batch' unless told
+	otherwise.
+	'''
+
+	def __init__(self,papi,maxWorkers=16,queueDepth=64,report=None):
+		self._papi = papi
+		self._maxWorkers = maxWorkers
+		self._queueDepth = queueDepth
+		self._report = report
+		self.stats = {}
+
+	def renew(self,credentials,logonBranchID,logonUserID,logonWorkstationID,ignoreOverrideErrors='true',select=None,**kwargs):
+		'''
+			Renews the items out to every patron in credentials for which
+			select(item), given a row of PatronItemsOutGetRows, is true; by
+			default all of them.
+		'''
+		kwargs.setdefault('priority','batch')
+		def process(patronBarcode,patronPassword):
+			response = self._papi.patronItemsOutGet(patronBarcode,patronPassword,'all',**kwargs)
+			body,failure = _checked(response)
+			if failure is not None: return [CirculationOutcome(patronBarcode,'itemsOut',None,False,*failure)]
+			outcomes = []
+			for item in body.get('PatronItemsOutGetRows') or []:
+				if select is not None and not select(item): continue
+				outcomes.append(_outcome(patronBarcode,'renew',item['ItemID'],lambda: self._papi.itemRenew(patronBarcode,patronPassword,item['ItemID'],logonBranchID,logonUserID,logonWorkstationID,ignoreOverrideErrors,**kwargs)))
+			return outcomes
+		return self._run('itemsOut',credentials,process)
+
+	def suspend(self,credentials,activity,userID,activationDate,select=None,**kwargs):
+		'''
+			Calls holdRequestSuspendAllForPatron (activity 'inactive' to
+			suspend until activationDate, 'active' to reactivate) for every
+			patron in credentials having at least one hold request for which
+			select(hold), given a row of PatronHoldRequestsGetRows, is true;
+			by default any hold request. Every such hold request gets the
+			outcome of its patron's call.
+		'''
+		kwargs.setdefault('priority','batch')
+		def process(patronBarcode,patronPassword):
+			response = self._papi.patronHoldRequestsGet(patronBarcode,patronPassword,'all',**kwargs)
+			body,failure = _checked(response)
+			if failure is not None: return [CirculationOutcome(patronBarcode,'holdRequests',None,False,*failure)]
+			holds = [hold for hold in body.get('PatronHoldRequestsGetRows') or [] if select is None or select(hold)]
+			if not holds: return []
+			outcome = _outcome(patronBarcode,'suspend',None,lambda: self._papi.holdRequestSuspendAllForPatron(patronBarcode,patronPassword,activity,userID,activationDate=activationDate,**kwargs))
+			return [outcome._replace(id=hold['HoldRequestID']) for hold in holds]
+		return self._run('holdRequests',credentials,process)
+
+	def _run(self,fetch,credentials,process):
+		done = self._done()
+		report = open(self._report,'a') if self._report else None
+		def work(credential):
+			return process(*credential)
+		try:
+			patrons = (tuple(credential) for credential in credentials if credential[0] not in done)
+			for index,credential,outcomes,error in _boundedMap(work,patrons,self._maxWorkers,self._queueDepth,ordered=False):
+				if error is not None: outcomes = [CirculationOutcome(credential[0],fetch,None,False,None,repr(error))]
+				elif not any(outcome.action == fetch for outcome in outcomes): self._count(fetch,True)
+				for outcome in outcomes:
+					self._count(outcome.action,outcome.ok)
+					if report is not None: report.write(json.dumps(outcome._asdict())+'\n')
+					yield outcome
+				if report is not None:
+					report.write(json.dumps({'patronBarcode':credential[0],'action':'done'})+'\n')
+					report.flush()
+		finally:
+			if report is not None: report.close()
+
+	def _count(self,action,ok):
+		counts = self.stats.setdefault(action,{'ok':0,'failed':0})
+		counts['ok' if ok else 'failed'] += 1
+
+	def _done(self):
+		# The patron barcodes marked done in the report of an earlier run.
+		done = set()
+		if not self._report or not os.path.exists(self._report): return done
+		with open(self._report) as report:
+			for line in report:
+				try: entry = json.loads(line)
+				except ValueError: continue	# a line cut short by an interruption
+				if entry.get('action') == 'done': done.add(entry['patronBarcode'])
+		return done
+
+def _checked(response):
+	# (body,None) for a successful response, otherwise (None,(errorCode,message)).
+	if response.status_code != 200: return None,(None,'HTTP {status} {reason}'.format(status=response.status_code,reason=response.reason))
+	body = response.json()
+	if body.get('PAPIErrorCode',0) < 0: return None,(body['PAPIErrorCode'],body.get('ErrorMessage') or '')
+	return body,None
+
+def _outcome(patronBarcode,action,id,call):
+	# The CirculationOutcome of call(), which sends one PAPI request.
+	try: body,failure = _checked(call())
+	except Exception as e: failure = (None,repr(e))
+	if failure is not None: return CirculationOutcome(patronBarcode,action,id,False,*failure)
+	return CirculationOutcome(patronBarcode,action,id,True,body.get('PAPIErrorCode',0),body.get('ErrorMessage') or '')
+
+def dueWithin(item,days,now=None):
+	'''
+		True if the item (a row of PatronItemsOutGetRows) is due within
+		days days of now (in seconds since the Epoch, by default the
+		current time), including overdue items.
+	'''
+	dueDate = _parseDate(item.get('DueDate') or '')
+	if dueDate is None: return False
+	return dueDate <= (time() if now is None else now)+days*86400
@@ -0,0 +1,1575 @@
+import base64
+from collections import namedtuple
+from email.utils import formatdate
+from hashlib import sha1
+import hmac
+from itertools import count
+import json
+import re
+import requests
+from requests.utils import requote_uri
+import threading
+from time import time
+try:
+	import queue
+except ImportError:
+	import Queue as queue
+
+def _bytes(value):
+	# hmac and base64 want bytes on Python 3; on Python 2 str already is.
+	if isinstance(value,bytes): return value
+	return value.encode('utf-8')
+
+def _native(value):
+	# The inverse of _bytes for header values, which must be native str.
+	if isinstance(value,str): return value
+	return value.decode('ascii')
+
+_date = (None,None)
+
+def _httpDate():
+	# The RFC 1123 Date header for now. It changes once a second, so it is
+	# formatted once a second; the (second,string) pair is replaced whole
+	# and needs no lock.
+	global _date
+	second = int(time())
+	if _date[0] != second: _date = (second,formatdate(second,localtime=False,usegmt=True))
+	return _date[1]
+
+class _Signer(object):
+	# Computes PAPI signatures, base64(HMAC-SHA1(access key, HTTP method +
+	# URI + Date + password)). The HMAC of the access key, with its inner
+	# and outer states already keyed, is built once and cloned for every
+	# signature rather than rekeyed. A keyed HMAC which is never updated
+	# can be copied from any number of threads.
+
+	def __init__(self,accessKey):
+		self._keyed = hmac.new(_bytes(accessKey),digestmod=sha1)
+
+	def sign(self,HTTPMethod,URI,HTTPDate,password):
+		hashed = self._keyed.copy()
+		hashed.update(_bytes(HTTPMethod+URI+HTTPDate+password))
+		return _native(base64.b64encode(hashed.digest()))
+
+class _PoolAdapter(requests.adapters.HTTPAdapter):
+	# A requests HTTPAdapter which counts the requests it sends and the
+	# connections it opens, for PAPI.connectionStats.
+
+	def __init__(self,**kwargs):
+		self._lock = threading.Lock()
+		self.requests = 0
+		self.connections = 0
+		requests.adapters.HTTPAdapter.__init__(self,**kwargs)
+
+	def _opened(self):
+		with self._lock: self.connections += 1
+
+	def init_poolmanager(self,*args,**kwargs):
+		requests.adapters.HTTPAdapter.init_poolmanager(self,*args,**kwargs)
+		# Every (re)connect of a pooled connection goes through connect().
+		adapter = self
+		def counting(poolClass):
+			class ConnectionCls(poolClass.ConnectionCls):
+				def connect(self):
+					adapter._opened()
+					return poolClass.ConnectionCls.connect(self)
+			return type(poolClass.__name__,(poolClass,),{'ConnectionCls':ConnectionCls})
+		classes = self.poolmanager.pool_classes_by_scheme
+		self.poolmanager.pool_classes_by_scheme = dict((scheme,counting(poolClass)) for scheme,poolClass in classes.items())
+
+	def send(self,request,**kwargs):
+		with self._lock: self.requests += 1
+		return requests.adapters.HTTPAdapter.send(self,request,**kwargs)
+
+# The characters which requote_uri and PreparedRequest.prepare_url treat
+# differently.
+_requotedApart = '%[]'
+
+def _ascii(value):
+	try: value.encode('ascii')
+	except UnicodeError: return False
+	return True
+
+def _normaliseURL(URL):
+	preparedRequest = requests.PreparedRequest()
+	preparedRequest.prepare_url(URL,None)
+	return preparedRequest.url
+
+# One outcome of a batch (*Many) method. key identifies the input item, and
+# exactly one of response and error is set.
+BatchResult = namedtuple('BatchResult',['key','response','error'])
+HoldOutcome = namedtuple('HoldOutcome',['statusType','statusValue','message','body','steps','latency'])
+
+# Keyword arguments of holdRequestCreate which end up in its request body
+# and so must not be passed on to holdRequestReply.
+_holdCreateFields = ('itemBarcode','volumeNumber','designation','isBorrowByMail','patronNotes','answer','activationDate','targetGUID')
+
+def _holdAnswer(answerPolicy,body):
+	# The Answer ('1' yes, '0' no) to the conditional prompt in body.
+	if answerPolicy is None: accept = False
+	elif callable(answerPolicy): accept = answerPolicy(body)
+	else: accept = answerPolicy.get(body.get('StatusValue'),False)
+	return '1' if accept else '0'
+
+def _boundedMap(func,items,maxWorkers=8,queueDepth=32,ordered=True):
+	# Calls func(item) for every item on maxWorkers threads and yields
+	# (index,item,result,error) tuples. At most maxWorkers+queueDepth items
+	# are taken from items but not yet yielded, so items may be a generator
+	# of any length without the whole batch being held in memory. With
+	# ordered=True results are yielded in input order, otherwise as they
+	# complete. Closing the generator early abandons the queued work.
+	tasks = queue.Queue()
+	results = queue.Queue()
+	cancelled = threading.Event()
+
+	def work():
+		while True:
+			task = tasks.get()
+			if task is None: return
+			index,item = task
+			if cancelled.is_set(): continue
+			try: results.put((index,item,func(item),None))
+			except Exception as e: results.put((index,item,None,e))
+
+	workers = [threading.Thread(target=work) for i in range(maxWorkers)]
+	for worker in workers:
+		worker.daemon = True
+		worker.start()
+	window = maxWorkers+queueDepth
+	iterator = iter(items)
+	exhausted = False
+	submitted = 0
+	yielded = 0
+	buffered = {}
+	try:
+		while True:
+			while not exhausted and submitted-yielded < window:
+				try: item = next(iterator)
+				except StopIteration:
+					exhausted = True
+					break
+				tasks.put((submitted,item))
+				submitted += 1
+			if submitted == yielded: return
+			outcome = results.get()
+			if not ordered:
+				yielded += 1
+				yield outcome
+				continue
+			buffered[outcome[0]] = outcome
+			while yielded in buffered:
+				outcome = buffered.pop(yielded)
+				yielded += 1
+				yield outcome
+	finally:
+		cancelled.set()
+		for worker in workers: tasks.put(None)
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+	'''
+	Raised when a call is not completed (including any retries) within the
+	deadline given to it or to the batch it is part of.
+	'''
+
+class NotAdmitted(requests.exceptions.RequestException):
+	'''
+	Raised when a request is held back on this side, by a scheduler or a
+	rate limiter, and never sent to Polaris. A RetryPolicy neither retries
+	these errors nor counts them against a circuit breaker.
+	'''
+
+class AdmissionTimeout(NotAdmitted,DeadlineExceeded):
+	'''
+	Raised when a request would have to wait past its deadline, or the
+	longest wait of its priority class, to be admitted.
+	'''
+
+def _cappedTimeout(timeout,deadlineAt):
+	# The requests timeout for an attempt, shortened to end by deadlineAt.
+	if deadlineAt is None: return timeout
+	remaining = max(deadlineAt-time(),0.001)
+	if timeout is None: return remaining
+	if isinstance(timeout,tuple): return tuple(min(part,remaining) for part in timeout)
+	return min(timeout,remaining)
+
+class SingleFlight(object):
+	'''
+	Collapses concurrent calls for the same key into one: while do(key,func)
+	is running func, further calls of do with that key wait for and share
+	its result (or exception) instead of calling their own func. The number
+	of calls of func is counted in the attribute calls, and the number of
+	calls answered by another call's result in the attribute coalesced.
+	'''
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._calls = {}
+		self.calls = 0
+		self.coalesced = 0
+
+	def do(self,key,func):
+		with self._lock:
+			call = self._calls.get(key)
+			leader = call is None
+			if leader:
+				call = self._calls[key] = _Call()
+				self.calls += 1
+			else: self.coalesced += 1
+		if not leader:
+			call.done.wait()
+			if call.error is not None: raise call.error
+			return call.result
+		try:
+			call.result = func()
+			return call.result
+		except Exception as e:
+			call.error = e
+			raise
+		finally:
+			with self._lock: del self._calls[key]
+			call.done.set()
+
+class _Call(object):
+	__slots__ = ('done','result','error')
+
+	def __init__(self):
+		self.done = threading.Event()
+		self.result = None
+		self.error = None
+
+class PAPIError(Exception):
+	'''
+	Raised by the higher level helpers built on top of the PAPI methods
+	(such as the iter* methods) when Polaris answers a request with a
+	negative PAPIErrorCode. The plain methods never raise it; they return
+	the Response as is.
+	'''
+
+	def __init__(self,errorCode,errorMessage=''):
+		Exception.__init__(self,'PAPIErrorCode {errorCode}: {errorMessage}'.format(errorCode=errorCode,errorMessage=errorMessage))
+		self.errorCode = errorCode
+		self.errorMessage = errorMessage
+
+def _body(response):
+	# The JSON body of a response. Raises for an HTTP error status or an
+	# error reported by Polaris.
+	response.raise_for_status()
+	body = response.json()
+	if body.get('PAPIErrorCode',0) < 0: raise PAPIError(body['PAPIErrorCode'],body.get('ErrorMessage',''))
+	return body
+
+def _branchNames(body):
+	# The display names of the branches of an organizationsGet body, by
+	# OrganizationID.
+	return dict((row['OrganizationID'],row.get('DisplayName') or row['Name']) for row in body.get('OrganizationsGetRows') or [])
+
+def _availability(bibIDs,holdings,branches,orgIDs=None):
+	# The result of bibAvailabilityGet from the holdings rows of every bib
+	# fetched and the names of the branches (or None).
+	orgIDs = set(str(orgID) for orgID in orgIDs) if orgIDs is not None else None
+	availability = {}
+	for bibID in bibIDs:
+		if bibID not in holdings:
+			availability[bibID] = None
+			continue
+		summary = availability[bibID] = {}
+		for row in holdings[bibID]:
+			orgID = row.get('LocationID')
+			if orgIDs is not None and str(orgID) not in orgIDs: continue
+			counts = summary.setdefault((branches or {}).get(orgID) or row.get('LocationName') or str(orgID),{'total':0,'available':0})
+			counts['total'] += 1
+			if row.get('CircStatus') == 'In': counts['available'] += 1
+	return availability
+
+def _require(name,**arguments):
+	# Raises TypeError naming the arguments of the method name left None.
+	missing = sorted(argument for argument,value in arguments.items() if value is None)
+	if missing: raise TypeError('{name}() requires {arguments}'.format(name=name,arguments=', '.join(missing)))
+
+class StaffTokenManager(object):
+	'''
+	Keeps the access token and access secret returned by
+	authenticateStaffUser for the staff domain account given, so that
+	protected methods can be called without them (see the staffCredentials
+	keyword argument of PAPI). Authentication happens on first use and
+	again once the token has expired. Within refreshMargin seconds of
+	expiry the token is renewed on a background thread while the current
+	one stays in use. Safe to share between threads; AsyncPAPI calls it
+	from its worker threads.
+	'''
+
+	def __init__(self,papi,domain,username,password,refreshMargin=3600):
+		self._papi = papi
+		self._credentials = {'Domain':domain,'Username':username,'Password':password}
+		self._refreshMargin = refreshMargin
+		self._lock = threading.Lock()
+		self._token = None
+		self._expires = 0
+		self._renewing = False
+
+	def _authenticate(self):
+		# Always sent through the synchronous pipeline, also for AsyncPAPI.
+		endpoint = _endpoints['authenticateStaffUser']
+		response = PAPI._undifferentiatied(self._papi,endpoint.protocol,endpoint.HTTPMethod,endpoint.protection,endpoint.template,endpoint=endpoint.name,data=self._credentials)
+		body = response.json()
+		if body.get('PAPIErrorCode',0) < 0 or not body.get('AccessToken'):
+			raise PAPIError(body.get('PAPIErrorCode',response.status_code),body.get('ErrorMessage',''))
+		expires = _parseDate(body.get('AuthExpDate'))
+		return (body['AccessToken'],body['AccessSecret']),(expires if expires is not None else time()+86400)
+
+	def get(self):
+		'''
+			Returns a valid (accessToken,accessSecret) pair, authenticating
+			first if there is none.
+		'''
+		with self._lock:
+			now = time()
+			if self._token is None or now >= self._expires:
+				self._token,self._expires = self._authenticate()
+			elif now >= self._expires-self._refreshMargin and not self._renewing:
+				self._renewing = True
+				thread = threading.Thread(target=self._renewInBackground)
+				thread.daemon = True
+				thread.start()
+			return self._token
+
+	def renew(self,rejected):
+		'''
+			Returns a new (accessToken,accessSecret) pair after Polaris
+			rejected the access token rejected. Concurrent callers holding
+			the same rejected token share one authentication.
+		'''
+		with self._lock:
+			if self._token is None or self._token[0] == rejected:
+				self._token,self._expires = self._authenticate()
+			return self._token
+
+	def _renewInBackground(self):
+		try:
+			token,expires = self._authenticate()
+			with self._lock: self._token,self._expires = token,expires
+		except Exception: pass	# retried on the next call, or on expiry
+		finally: self._renewing = False
+
+def _parseDate(value):
+	# Polaris dates look like /Date(1391058000000-0500)/, in milliseconds.
+	match = re.match(r'/Date\((-?\d+)',value or '')
+	if match is None: return None
+	return int(match.group(1))/1000.0
+
+class _Endpoint(object):
+	# One Polaris API method: how it is sent and the template of the part of
+	# its URI following the root (see PAPI._rootURI). The template is turned
+	# into a %-style pattern once, which is cheaper to fill in per call than
+	# parsing the str.format template every time.
+	__slots__ = ('name','protocol','HTTPMethod','protection','template','family','_pattern')
+
+	def __init__(self,name,protocol,HTTPMethod,protection,template):
+		self.name = name
+		self.protocol = protocol
+		self.HTTPMethod = HTTPMethod
+		self.protection = protection
+		self.template = template
+		# The family (bib, patron, holdrequest, synch, ...) is the first
+		# path segment after the access token of protected methods.
+		self.family = template.replace('{accessToken}/','').split('/')[0]
+		self._pattern = template.replace('%','%%').replace('{','%(').replace('}',')s')
+
+	def suffixURI(self,fields):
+		return self._pattern % fields
+
+# The registry of every Polaris API method wrapped by PAPI, by method name.
+_endpoints = dict((endpoint.name,endpoint) for endpoint in [
+	_Endpoint('authenticateStaffUser','https','POST','protected','authenticator/staff'),
+	_Endpoint('bibGet','http','GET','public','bib/{bibID}'),
+	_Endpoint('bibSearch','http','GET','public','search/bibs/keyword/{qualifierName}'),
+	_Endpoint('headingSearch','http','GET','public','search/headings/{qualifierName}'),
+	_Endpoint('collectionsGet','http','GET','public','collections'),
+	_Endpoint('bibHoldingsGet','http','GET','public','bib/{bibID}/holdings'),
+	_Endpoint('holdRequestCancel','http','PUT','public','patron/{patronBarcode}/holdrequests/{requestID}/cancelled'),
+	_Endpoint('holdRequestCreate','http','POST','public','holdrequest'),
+	_Endpoint('holdRequestReply','http','PUT','public','holdrequest/{requestGUID}'),
+	_Endpoint('holdRequestSuspend','http','PUT','public','patron/{patronBarcode}/holdrequests/{requestID}/{activity}'),
+	_Endpoint('itemRenew','http','PUT','public','patron/{patronBarcode}/itemsout/{itemID}'),
+	_Endpoint('limitFiltersGet','http','GET','public','limitfilters'),
+	_Endpoint('notificationUpdate','http','PUT','protected','{accessToken}/notification/{notificationTypeID}'),
+	_Endpoint('organizationsGet','http','GET','public','organizations/{tier}'),
+	_Endpoint('patronAccountGet','http','GET','public','patron/{patronBarcode}/account/{status}'),
+	_Endpoint('patronAccountPay','https','PUT','protected','{accessToken}/patron/{patronBarcode}/account/{chargeTxnID}/pay'),
+	_Endpoint('patronBasicDataGet','http','GET','public','patron/{patronBarcode}/basicdata'),
+	_Endpoint('patronCirculateBlocksGet','http','GET','public','patron/{patronBarcode}/circulationblocks'),
+	_Endpoint('createPatronBlocks','https','POST','protected','{accessToken}/patron/{patronBarcode}/blocks'),
+	_Endpoint('patronHoldRequestsGet','http','GET','public','patron/{patronBarcode}/holdrequests/{status}'),
+	_Endpoint('patronItemsOutGet','http','GET','public','patron/{patronBarcode}/itemsout/{status}'),
+	_Endpoint('patronMessagesGet','http','GET','public','patron/{patronBarcode}/messages'),
+	_Endpoint('patronMessageUpdateStatus','http','PUT','public','patron/{patronBarcode}/messages/{messageType}/{messageID}'),
+	_Endpoint('patronMessageDelete','http','DELETE','public','patron/{patronBarcode}/messages/{messageType}/{messageID}'),
+	_Endpoint('patronPreferencesGet','http','GET','public','patron/{patronBarcode}/preferences'),
+	_Endpoint('patronReadingHistoryClear','http','DELETE','public','patron/{patronBarcode}/readinghistory'),
+	_Endpoint('patronRegistrationCreate','http','POST','public','patron'),
+	_Endpoint('patronRenewBlocksGet','https','GET','protected','{accessToken}/circulation/patron/{patronID}/renewblocks'),
+	_Endpoint('patronSavedSearchesGet','http','GET','public','patron/{patronBarcode}/savedsearches'),
+	_Endpoint('patronReadingHistoryGet','http','GET','public','patron/{patronBarcode}/readinghistory'),
+	_Endpoint('patronSearch','https','GET','protected','{accessToken}/search/patrons/Boolean'),
+	_Endpoint('patronUpdate','http','PUT','public','patron/{patronBarcode}'),
+	_Endpoint('patronValidate','http','GET','public','patron/{patronBarcode}'),
+	_Endpoint('sortOptionsGet','http','GET','public','sortoptions'),
+	_Endpoint('synchItemsByBibIDGet','https','GET','protected','{accessToken}/synch/items/bibid/{bibID}'),
+	_Endpoint('synchTasksCheckout','https','PUT','protected','{accessToken}/synch/tasks/checkout'),
+])
+
+class PAPI(object):
+	'''
+	A Python interface into the Polaris API
+
+	Example usage:
+
+	>>> import polaris
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname')
+	
+	All methods return a requests library Response object.
+	To get bibliographic information associated with bibID, '353063':
+
+	>>> resp = papi.bibGet('353063')
+	>>> print(resp.json())
+
+	All method descriptions are derived from the original language present in
+	the Polaris Application Programming Interface (PAPI) Reference Guide.
+	Every method makes requests with the following defaults unless keyword
+	arguments are otherwise provided in the function call:
+
+		version='v1'
+		langID='1033'	#English
+		appID='100'	#third-party
+		orgID='1'	#system level
+
+	Each method requires all arguments marked as required in the Polaris
+	Application Programming Interface (PAPI) Reference Guide. Any additional
+	arguments may be passed as keyword arguments in which the keyword is the
+	name provided in the Polaris Application Programming Interface (PAPI)
+	Reference Guide though in some cases altered to conform with camelCase.
+	(eg. org_ID becomes orgID)
+
+	Note about query sting parameters:
+	With the exception of holdRequestCancel, holdRequestCancelAllForPatron,
+	patronAccountPay and patronReadingHistoryGet (for which all two of the
+	query string parameters are simply required as function arguments), all
+	methods which use query sting parameters expect a dictionary, params,
+	containing keyword-value pairs in which the keyword is the name provided
+	in the Polaris Application Programming Interface (PAPI) Reference Guide
+	under Query String Parameters for that method.
+ 	
+ 	For example:
+ 	>>> papi.headingSearch(qualifierName='su',params={'startpoint':'civil war','numterms':'10'})
+ 	(N.B. the values provided in params are NOT URL encoded.)
+
+	Use of protected methods:
+	see authenticateStaffUser. Alternatively, pass the staff domain account
+	as the keyword argument staffCredentials and omit accessToken and
+	accessSecret when calling protected methods; a StaffTokenManager then
+	authenticates when needed and reuses the access token until it expires.
+	The other arguments of protected methods are required: leaving one out
+	raises TypeError.
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',staffCredentials=('yourdomain','yourusername','yourpassword'))
+	>>> papi.patronSearch(params={'q':'PATNL=Bar'})
+
+	Use of patron password override:
+	Any patron method can be overriden by an authenticated staff user by
+	providing an access secret in place of the patron password and passing the
+	associated access token as a keyword argument as in the following example.
+	>>> papi.patronBasicDataGet(patronBarcode='patronbarcode',patronPassword='accesssecret',accessToken='accesstoken')
+
+	Note on activation date:
+	All functions requiring activationDate expect the date to be supplied as a
+	string representation of the integer value of seconds since Epoch Time.
+
+	Response caching:
+	Passing a polaris.cache.ResponseCache as the keyword argument cache lets
+	the responses of selected GET methods be answered from a cache.
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',cache=polaris.cache.ResponseCache())
+
+	Connections:
+	Connections to the Polaris server are kept alive and pooled, by default
+	up to 10 per scheme (http for public methods, https for protected ones).
+	The keyword arguments poolSize and protectedPoolSize set the size of the
+	http and https pools, poolBlock=True makes these a hard limit on open
+	connections (callers wait for a free one), keepAlive=False closes every
+	connection after its request, and timeout is passed to requests as the
+	(connect,read) timeout in seconds. transport replaces the requests
+	Session used for sending; it must provide a requests compatible
+	send(preparedRequest,timeout=None); polaris.replay.Recorder and
+	polaris.replay.Replayer are such transports, for recording traffic and
+	replaying it without a Polaris server. See connectionStats.
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',poolSize=32,protectedPoolSize=4,timeout=(3.05,30))
+
+	Retries and circuit breaking:
+	Passing a polaris.resilience.RetryPolicy as the keyword argument
+	retryPolicy retries failed idempotent requests with exponential backoff,
+	re-signing every attempt, and fails fast while an endpoint family (bib,
+	patron, holdrequest, synch, ...) is unhealthy. Any method also accepts
+	the keyword argument deadline, the number of seconds after which it
+	raises DeadlineExceeded instead of sending or retrying.
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',retryPolicy=polaris.resilience.RetryPolicy(retries=3))
+	>>> papi.bibGet('353063',deadline=5)
+
+	Rate limiting:
+	Passing a polaris.ratelimit.RateLimiter as the keyword argument
+	rateLimiter holds requests back to stay within a number of requests per
+	second, overall and per endpoint family. Any method accepts the keyword
+	argument priority ('interactive' by default, 'batch' for the *Many
+	methods) so that interactive calls are sent ahead of bulk work.
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',rateLimiter=polaris.ratelimit.RateLimiter(rate=20,burst=40))
+
+	Scheduling:
+	Passing a polaris.scheduler.Scheduler as the keyword argument scheduler
+	bounds the requests sent at once and queues the rest per priority
+	class, serving the classes by weight with a concurrency budget, queue
+	limit and maximum queue wait each, so that patron-facing calls are not
+	stuck behind a bulk sweep sharing the same PAPI.
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',scheduler=polaris.scheduler.Scheduler(maxConcurrency=12,concurrency={'batch':6}),poolSize=12)
+
+	Result models:
+	Any method called with the keyword argument model=True returns a
+	polaris.models.Result instead of the Response. It decodes the JSON only
+	when first read, gives typed access to PAPIErrorCode and keeps rows as
+	compact namedtuples; the Response remains available as its response.
+	>>> [item.Barcode for item in papi.patronItemsOutGet('21234000123456','1234','all',model=True)]
+
+	Streaming rows:
+	Methods returning rows also accept the keyword argument stream=True.
+	They then return a polaris.stream.RowStream which yields the rows one
+	at a time as the response arrives, keeping memory bounded by a single
+	row however large the response.
+	>>> for row in papi.patronReadingHistoryGet('21234000123456','1234','1','0',stream=True): print(row['Title'])
+
+	Instrumentation:
+	instrumentation is an object whose beforeSend(endpoint,preparedRequest)
+	is called before every request is sent and whose afterResponse(endpoint,
+	preparedRequest,response,error,timings) is called once it has been
+	answered or has failed, with timings giving the seconds spent on
+	signing, preparation and the network. polaris.metrics.Metrics turns
+	these into per-method histograms and counters in the Prometheus text
+	format.
+	>>> metrics = polaris.metrics.Metrics()
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',instrumentation=metrics)
+	>>> print(metrics.prometheus())
+
+	Request coalescing:
+	With singleFlight=True, a GET request issued while an identical one
+	(same URI and credentials) is still in flight waits for and returns the
+	Response of the first instead of being sent. See singleFlightStats.
+	'''
+
+	def __init__(self,accessKey,accessKeyID,hostname,cache=None,singleFlight=False,staffCredentials=None,poolSize=10,protectedPoolSize=None,poolBlock=False,keepAlive=True,timeout=None,transport=None,retryPolicy=None,rateLimiter=None,scheduler=None,instrumentation=None):
+		self._accessKey = accessKey
+		self._accessKeyID = accessKeyID
+		self._signer = _Signer(accessKey)
+		self._hostname = hostname
+		self._roots = {}
+		if transport is None:
+			# Public methods go over http and protected ones over https; each
+			# gets its own adapter so that the two pools can be sized apart.
+			transport = requests.Session()
+			transport.mount('http://',_PoolAdapter(pool_connections=1,pool_maxsize=poolSize,pool_block=poolBlock))
+			transport.mount('https://',_PoolAdapter(pool_connections=1,pool_maxsize=protectedPoolSize or poolSize,pool_block=poolBlock))
+		self._session = transport
+		self._poolSize = poolSize
+		self._keepAlive = keepAlive
+		self._timeout = timeout
+		self._retryPolicy = retryPolicy
+		self._rateLimiter = rateLimiter
+		self._scheduler = scheduler
+		self._instrumentation = instrumentation
+		self._cache = cache
+		self._singleFlight = SingleFlight() if singleFlight else None
+		self._tokens = StaffTokenManager(self,*staffCredentials) if staffCredentials else None
+		self._branches = None
+		self._branchesLock = threading.Lock()
+
+	def _getPAPIHash(self,HTTPMethod,URI,HTTPDate,patronPassword):
+		return self._signer.sign(HTTPMethod,URI,HTTPDate,patronPassword)
+
+	def _dictParse(self,params):
+		# Despite the requests library handling URL encoding in the 
+		# construction of a request, I could only consistently pass server 
+		# authetication requirements by parsing query string parameters as
+		# follows and then manually appending them.
+		if not params: return ''
+		return '?'+'&'.join(paramKey.replace(' ','+')+'='+paramValue.replace(' ','+') for paramKey,paramValue in params.items())
+
+	def _rootURI(self,protocol,protection,**kwargs):
+		# The root of every URI depends only on these six values, so it is
+		# built and normalised by requests once per combination.
+		rootKey = (protocol,protection,kwargs.get('version','v1'),kwargs.get('langID','1033'),kwargs.get('appID','100'),kwargs.get('orgID','1'))
+		root = self._roots.get(rootKey)
+		if root is None:
+			root = '{0}://{hostname}/PAPIService/REST/{1}/{2}/{3}/{4}/{5}/'.format(*rootKey,hostname=self._hostname)
+			root = self._roots[rootKey] = _normaliseURL(root)
+		return root
+
+	def _buildURI(self,protocol,protection,suffixURI,**kwargs):
+		# Returns the URI exactly as requests would prepare it. Requoting the
+		# part after the (already normalised) root gives the same result
+		# for all but escaped or dot-segment paths, brackets (which
+		# requote_uri leaves as they are but urllib3 escapes) and non-ASCII
+		# characters (which requote_uri cannot quote on Python 2), which
+		# take the slow path.
+		tail = suffixURI+self._dictParse(kwargs.get('params',{}))
+		root = self._rootURI(protocol,protection,**kwargs)
+		if '/.' in tail or tail.startswith('.') or any(character in tail for character in _requotedApart) or not _ascii(tail): return _normaliseURL(root+tail)
+		return root+requote_uri(tail)
+
+	def _prepare(self,protocol,HTTPMethod,protection,suffixURI,timings=None,**kwargs):
+		# Builds, signs and returns the requests PreparedRequest for a call
+		# without sending it. Shared by PAPI and polaris.aio.AsyncPAPI so
+		# that the URI construction and HMAC signing exist in one place.
+		# The time spent signing is recorded in timings, if given.
+		data = json.dumps(kwargs['data']) if 'data' in kwargs else '{}'
+		patronPassword = kwargs.get('accessSecret',kwargs.get('patronPassword',''))
+		accessToken = kwargs.get('accessToken','')
+
+		preparedRequest = requests.PreparedRequest()
+		preparedRequest.method = HTTPMethod
+		preparedRequest.url = self._buildURI(protocol,protection,suffixURI,**kwargs)
+		preparedRequest.body = data
+		HTTPDate = _httpDate()
+		if timings is None: signature = self._signer.sign(HTTPMethod,preparedRequest.url,HTTPDate,patronPassword)
+		else:
+			started = time()
+			signature = self._signer.sign(HTTPMethod,preparedRequest.url,HTTPDate,patronPassword)
+			timings['signing'] = time()-started
+		headers = {	'Authorization':'PWS {accessKeyID}:{signature}'.format(accessKeyID=self._accessKeyID,signature=signature),
+					'Date':HTTPDate,
+					'Content-Type':'application/json',
+					'Content-Length':len(data),
+					'Accept':'application/json'}
+		if accessToken and protection=='public': headers.update({'X-PAPI-AccessToken':accessToken})
+		if not self._keepAlive: headers['Connection'] = 'close'
+		preparedRequest.headers = headers
+		return preparedRequest
+
+	def _credential(self,**kwargs):
+		return kwargs.get('accessSecret',kwargs.get('patronPassword',''))+kwargs.get('accessToken','')
+
+	def _cacheKey(self,endpoint,protocol,protection,suffixURI,**kwargs):
+		return self._cache.key(endpoint,self._buildURI(protocol,protection,suffixURI,**kwargs),self._credential(**kwargs))
+
+	def _flightKey(self,HTTPMethod,protocol,protection,suffixURI,**kwargs):
+		return (HTTPMethod,self._buildURI(protocol,protection,suffixURI,**kwargs),self._credential(**kwargs))
+
+	def _send(self,protocol,HTTPMethod,protection,suffixURI,endpoint=None,family=None,**kwargs):
+		# Every attempt is prepared afresh, so that a retried request is
+		# signed with a current Date, and only after any wait for the rate
+		# limiter and then for a slot of the scheduler. Tokens are taken
+		# first, so that requests waiting for them hold no slot.
+		def attempt(timeout):
+			if self._rateLimiter is not None:
+				self._rateLimiter.acquire(family,kwargs.get('priority'),deadlineAt)
+				timeout = _cappedTimeout(timeout,deadlineAt)
+			if self._scheduler is not None: return self._scheduler.run(kwargs.get('priority'),deadlineAt,lambda: admitted(_cappedTimeout(timeout,deadlineAt)))
+			return admitted(timeout)
+		def admitted(timeout):
+			if self._instrumentation is not None:
+				return self._instrumentedAttempt(endpoint,protocol,HTTPMethod,protection,suffixURI,timeout,**kwargs)
+			preparedRequest = self._prepare(protocol,HTTPMethod,protection,suffixURI,**kwargs)
+			if kwargs.get('stream'): return self._session.send(preparedRequest,timeout=timeout,stream=True)
+			return self._session.send(preparedRequest,timeout=timeout)
+		deadline = kwargs.get('deadline',self._retryPolicy.deadline if self._retryPolicy is not None else None)
+		deadlineAt = time()+deadline if deadline is not None else None
+		if self._retryPolicy is not None:
+			return self._retryPolicy.call(family,HTTPMethod,attempt,self._timeout,deadlineAt)
+		if deadlineAt is not None and deadlineAt <= time(): raise DeadlineExceeded('deadline exceeded before sending')
+		return attempt(_cappedTimeout(self._timeout,deadlineAt))
+
+	def _instrumentedAttempt(self,endpoint,protocol,HTTPMethod,protection,suffixURI,timeout,**kwargs):
+		# An attempt of _send which reports to the instrumentation hooks.
+		timings = {}
+		started = time()
+		preparedRequest = self._prepare(protocol,HTTPMethod,protection,suffixURI,timings=timings,**kwargs)
+		timings['preparation'] = time()-started-timings['signing']
+		self._instrumentation.beforeSend(endpoint,preparedRequest)
+		started = time()
+		try:
+			if kwargs.get('stream'): response = self._session.send(preparedRequest,timeout=timeout,stream=True)
+			else: response = self._session.send(preparedRequest,timeout=timeout)
+		except Exception as e:
+			timings['network'] = time()-started
+			self._instrumentation.afterResponse(endpoint,preparedRequest,None,e,timings)
+			raise
+		timings['network'] = time()-started
+		self._instrumentation.afterResponse(endpoint,preparedRequest,response,None,timings)
+		return response
+
+	def _undifferentiatied(self,protocol,HTTPMethod,protection,suffixURI,endpoint=None,**kwargs):
+		# This is the heart of the API wrapper. All the Polaris API methods
+		# take their method specific input and parse it and call this method
+		# which then constructs and sends the appropriate request. endpoint
+		# is the name of the calling method, used to look up its policies.
+		family = _endpoints[endpoint].family if endpoint in _endpoints else None
+		send = lambda: self._send(protocol,HTTPMethod,protection,suffixURI,endpoint,family,**kwargs)
+		# A streamed body can be read only once, by its caller.
+		if kwargs.get('stream'): return send()
+		if self._singleFlight is not None and HTTPMethod=='GET':
+			flightKey = self._flightKey(HTTPMethod,protocol,protection,suffixURI,**kwargs)
+			send = lambda send=send: self._singleFlight.do(flightKey,send)
+		if self._cache is not None and HTTPMethod=='GET' and self._cache.ttl(endpoint):
+			key = self._cacheKey(endpoint,protocol,protection,suffixURI,**kwargs)
+			return self._cache.fetch(endpoint,key,send)
+		return send()
+
+	def _call(self,name,fields,**kwargs):
+		# Sends the Polaris API method name from the endpoint registry, with
+		# fields filling in the placeholders of its URI template.
+		endpoint = _endpoints[name]
+		# The arguments of protected methods default to None so that the
+		# token and secret can be omitted; the others are still required,
+		# rather than sent as 'None'.
+		_require(name,**dict((field,value) for field,value in fields.items() if field != 'accessToken' or self._tokens is None))
+		if 'accessToken' in fields and fields['accessToken'] is None:
+			return self._requestWithStaffToken(endpoint,fields,**kwargs)
+		return self._undifferentiatied(endpoint.protocol,endpoint.HTTPMethod,endpoint.protection,endpoint.suffixURI(fields),endpoint=endpoint.name,**kwargs)
+
+	def _request(self,name,fields,model=False,**kwargs):
+		return self._result(name,self._call(name,fields,**kwargs),model,kwargs.get('stream',False))
+
+	def _result(self,name,response,model,stream):
+		# What a method returns for response: the Response itself unless
+		# the caller asked for a result model or a row stream.
+		if stream:
+			from .stream import RowStream
+			return RowStream(name,response,compact=model)
+		if model:
+			from .models import Result
+			return Result(name,response)
+		return response
+
+	def _requestWithStaffToken(self,endpoint,fields,**kwargs):
+		# Protected method called without accessToken: use the managed one,
+		# and if Polaris rejects it re-authenticate and try once more.
+		accessToken,accessSecret = self._tokens.get()
+		response = self._undifferentiatied(endpoint.protocol,endpoint.HTTPMethod,endpoint.protection,endpoint.suffixURI(dict(fields,accessToken=accessToken)),endpoint=endpoint.name,**dict(kwargs,accessSecret=accessSecret))
+		if response.status_code not in (401,403): return response
+		accessToken,accessSecret = self._tokens.renew(accessToken)
+		return self._undifferentiatied(endpoint.protocol,endpoint.HTTPMethod,endpoint.protection,endpoint.suffixURI(dict(fields,accessToken=accessToken)),endpoint=endpoint.name,**dict(kwargs,accessSecret=accessSecret))
+
+	def connectionStats(self):
+		'''
+			Returns, per scheme, the number of requests sent, the number of
+			connections opened for them (including reconnects of dropped
+			keep-alive connections) and hence the number of requests which
+			reused a pooled connection. Empty when a custom transport is in
+			use.
+
+			Example:
+			>>> papi.connectionStats()
+			{'http': {'requests': 120, 'connections': 4, 'reused': 116}, 'https': {'requests': 2, 'connections': 1, 'reused': 1}}
+		'''
+		stats = {}
+		for prefix,adapter in getattr(self._session,'adapters',{}).items():
+			if isinstance(adapter,_PoolAdapter):
+				stats[prefix.split(':')[0]] = {'requests':adapter.requests,'connections':adapter.connections,'reused':adapter.requests-adapter.connections}
+		return stats
+
+	def singleFlightStats(self):
+		'''
+			Returns a dictionary with the number of GET requests sent while
+			request coalescing is enabled (calls) and the number of calls
+			answered by an identical request already in flight (coalesced).
+
+			Example:
+			>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',singleFlight=True)
+			>>> papi.singleFlightStats()
+			{'calls': 0, 'coalesced': 0}
+		'''
+		if self._singleFlight is None: return {'calls':0,'coalesced':0}
+		return {'calls':self._singleFlight.calls,'coalesced':self._singleFlight.coalesced}
+
+	def _fanOut(self,method,items,key,ordered=True,maxWorkers=8,queueDepth=32,deadline=None,**kwargs):
+		# Shared implementation of the *Many methods. Every item is a tuple
+		# of positional arguments for method; key maps it to the key of its
+		# BatchResult. All calls share this PAPI's requests Session, and as
+		# a PAPI talks to a single host, maxWorkers is the number of
+		# concurrent requests made against the Polaris server. deadline
+		# bounds the whole batch: calls get whatever is left of it. Unless
+		# told otherwise, a rate limiter treats the calls as batch work.
+		kwargs.setdefault('priority','batch')
+		if deadline is None: call = lambda args: method(*args,**kwargs)
+		else:
+			deadlineAt = time()+deadline
+			call = lambda args: method(*args,deadline=deadlineAt-time(),**kwargs)
+		for index,args,response,error in _boundedMap(call,items,maxWorkers,queueDepth,ordered):
+			yield BatchResult(key(args),response,error)
+
+	def _iterPages(self,fetchPage,rowsKey,perPage,prefetch,firstPage=1):
+		# Shared implementation of the iter* methods. fetchPage(page) returns
+		# the Response for a 1-based page number; the rows found under
+		# rowsKey are yielded one at a time, from firstPage on, and only
+		# prefetch pages beyond the current one are ever held. Iteration
+		# stops after a short page or once TotalRecordsFound rows have been
+		# paged through; a perPage of 0 (all rows) has a single page.
+		perPage = int(perPage)
+		if perPage <= 0: prefetch = 0
+		# The page being consumed counts against the window of _boundedMap,
+		# hence the queueDepth of one.
+		if prefetch: pages = _boundedMap(fetchPage,count(firstPage),maxWorkers=prefetch,queueDepth=1)
+		else: pages = ((page,page,fetchPage(page),None) for page in count(firstPage))
+		try:
+			for _,page,response,error in pages:
+				if error: raise error
+				body = _body(response)
+				rows = body.get(rowsKey) or []
+				total = body.get('TotalRecordsFound')
+				del body
+				for row in rows: yield row
+				if perPage <= 0 or len(rows) < perPage or (total is not None and page*perPage >= total): return
+		finally:
+			pages.close()
+
+	def authenticateStaffUser(self,domain,username,password,**kwargs):
+		'''
+			A call to authenticateStaffUser is required before calling any 
+			protected methods (unless PAPI was given staffCredentials). Upon success, this method will return an access
+			token and access secret. These will be used to create the hash for
+			protected methods. The access token is valid for 24 hours. 
+			Subsequent calls to authenticateStaffUser with the same domain
+			account information will generate a new access token, access
+			secret and expiration date.
+
+			Example:
+			>>> papi.authenticateStaffUser(domain='yourdomain',username='yourusername',password='yourpassword')
+		'''
+		data = {'Domain':domain,
+				'Username':username,
+				'Password':password}
+		return self._request('authenticateStaffUser',{},data=data,**kwargs)
+
+	def bibGet(self,bibID,**kwargs):
+		'''	Returns bibliographic information for a specified record.
+
+			Example:
+			>>> papi.bibGet(bibID='353063')
+		'''
+		return self._request('bibGet',{'bibID':bibID},**kwargs)
+
+	def bibGetMany(self,bibIDs,**kwargs):
+		'''
+			Calls bibGet for every bibID in bibIDs on a bounded pool of worker
+			threads and yields a BatchResult(key,response,error) per bibID,
+			where key is the bibID. A failed call sets error instead of
+			aborting the batch. Results are yielded in input order unless
+			ordered=False is given, in which case they are yielded as they
+			complete. maxWorkers (default 8) limits concurrent requests to
+			the Polaris server and queueDepth (default 32) how many further
+			bibIDs are read ahead of the results consumed. With deadline, a
+			number of seconds for the whole batch, calls not completed in
+			time fail with DeadlineExceeded.
+
+			Example:
+			>>> for result in papi.bibGetMany(['353063','353064'],maxWorkers=4):
+			...	print(result.key, result.response.json())
+		'''
+		return self._fanOut(self.bibGet,((bibID,) for bibID in bibIDs),lambda args: args[0],**kwargs)
+
+	def bibSearch(self,qualifierName,params,**kwargs):
+		'''
+			Returns list of bibliographic records that match search criteria.
+			For boolean searches, you may opt to include the SORTBY clause
+			when using the q query string parameter. This returns search
+			results sorted in the specified sort order. 
+
+			Example:
+			>>> papi.bibSearch(qualifierName='bc',params={'q':'32491015192050'})
+		'''
+		return self._request('bibSearch',{'qualifierName':qualifierName},params=params,**kwargs)
+
+	def iterBibSearch(self,qualifierName,params,bibsPerPage='50',prefetch=0,**kwargs):
+		'''
+			Generator over the BibSearchRows of every page of a bibSearch,
+			fetching bibsPerPage rows per request. With prefetch=N the next N
+			pages are requested concurrently while the current one is being
+			consumed. Raises PAPIError if Polaris reports an error.
+
+			Example:
+			>>> for row in papi.iterBibSearch(qualifierName='KW',params={'q':'civil war'},prefetch=2):
+			...	print(row['Title'])
+		'''
+		def fetchPage(page):
+			pageParams = dict(params,page=str(page),bibsperpage=str(bibsPerPage))
+			return self.bibSearch(qualifierName,pageParams,**kwargs)
+		return self._iterPages(fetchPage,'BibSearchRows',bibsPerPage,prefetch)
+
+	def headingSearch(self,qualifierName,params,**kwargs):
+		'''
+			Searches an ordered list of terms and returns headings information 
+			relative to a given start point.
+
+			Example:
+			>>> papi.headingSearch(qualifierName='su',params={'startpoint':'civil war','numterms':'10'})
+		'''
+		return self._request('headingSearch',{'qualifierName':qualifierName},params=params,**kwargs)
+
+	def collectionsGet(self,**kwargs):
+		'''
+			Returns a list of collections based on the organization ID (passed
+			as the keywoard argument orgID, otherwise defaults to '1').
+			Branches utilize a subset of collection information maintained at
+			the system level in Polarisself.To retrieve a list of all
+			collections in the system, call without any arguments. To retrieve
+			a list of collections for a specific branch, pass the branch ID.
+
+			Example:
+			>>> papi.collectionsGet(orgID='2')
+		'''
+		return self._request('collectionsGet',{},**kwargs)
+
+	def bibHoldingsGet(self,bibID,**kwargs):
+		'''
+			Returns holdings information for a specified bibliographic record.
+
+			Example:
+			>>> papi.bibHoldingsGet(bibID='353063')
+		'''
+		return self._request('bibHoldingsGet',{'bibID':bibID},**kwargs)
+
+	def bibHoldingsGetMany(self,bibIDs,**kwargs):
+		'''
+			Calls bibHoldingsGet for every bibID in bibIDs concurrently. See
+			bibGetMany for the batch keyword arguments and results.
+
+			Example:
+			>>> for result in papi.bibHoldingsGetMany(bibIDs,ordered=False):
+			...	if result.error: print(result.key, result.error)
+		'''
+		return self._fanOut(self.bibHoldingsGet,((bibID,) for bibID in bibIDs),lambda args: args[0],**kwargs)
+
+	def bibAvailabilityGet(self,bibIDs,orgIDs=None,maxWorkers=None,**kwargs):
+		'''
+			Returns, for every bibID in bibIDs, the number of its items and
+			the number of them checked in at each branch, as
+			{bibID:{branchName:{'total':n,'available':m}}}, optionally only
+			for the branches whose OrganizationID is in orgIDs. The holdings
+			of the bibs are fetched concurrently, maxWorkers at a time (by
+			default poolSize, so that no further connections are opened). A
+			page of results takes about the time of one bibHoldingsGet only
+			if maxWorkers, and poolSize, are at least the number of bibs on
+			it: with the default poolSize of 10, a page of 50 bibs takes five
+			rounds. Size both to the page for a single round trip.
+			Holdings still fresh in the cache of this PAPI are not fetched
+			again; give bibHoldingsGet a short ttl to share them between
+			pages. Branch names are fetched with organizationsGet once per
+			PAPI, alongside the first holdings. A bib whose holdings could not
+			be fetched maps to None. Calls default to priority='interactive';
+			further keyword arguments are passed on to every call.
+
+			Example:
+			>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',poolSize=50,cache=polaris.cache.ResponseCache(ttls={'bibHoldingsGet':60,'organizationsGet':3600}))
+			>>> papi.bibAvailabilityGet(['353063','353064'],orgIDs=[3,4])
+			{'353063': {'Main Library': {'total': 3, 'available': 1}, 'Branch Library': {'total': 1, 'available': 1}}, '353064': {}}
+		'''
+		bibIDs = [str(bibID) for bibID in bibIDs]
+		kwargs.setdefault('priority','interactive')
+		def fetch(bibID):
+			if bibID is None: return self._branchNames(**kwargs)
+			return _body(self.bibHoldingsGet(bibID,**kwargs)).get('BibHoldingsGetRows') or []
+		# None stands for the branch names, fetched with the first holdings.
+		tasks = ([None] if self._branches is None else [])+bibIDs
+		holdings = {}
+		branches = self._branches
+		for index,bibID,rows,error in _boundedMap(fetch,tasks,maxWorkers or max(min(len(tasks),self._poolSize),1),len(tasks),ordered=False):
+			if bibID is None: branches = rows
+			elif error is None: holdings[bibID] = rows
+		return _availability(bibIDs,holdings,branches,orgIDs)
+
+	def _branchNames(self,**kwargs):
+		# The names of the branches by OrganizationID, fetched once. Until a
+		# fetch succeeds, the holdings rows' own LocationName is used.
+		with self._branchesLock:
+			if self._branches is None: self._branches = _branchNames(_body(self.organizationsGet('branch',**kwargs)))
+			return self._branches
+
+	def holdRequestCancel(self,patronBarcode,patronPassword,requestID,workstationID,userID,**kwargs):
+		'''
+			Cancel a single hold request.
+
+			Example:
+			>>> papi.holdRequestCancel(patronBarcode='patronbarcode',patronPassword='patronpassword',requestID='311260',workstationID='1',userID='2')
+		'''
+		params={'wsid':workstationID,
+				'userid':userID}
+		return self._request('holdRequestCancel',{'patronBarcode':patronBarcode,'requestID':requestID},patronPassword=patronPassword,params=params,**kwargs)
+
+	def holdRequestCancelAllForPatron(self,patronBarcode,patronPassword,workstationID,userID,**kwargs):
+		'''
+			Cancel all local hold requests for a specific patron whose hold
+			requests have a status of inactive (1), active (2) or pending (4).
+
+			Example:
+			>>> papi.holdRequestCancelAllForPatron(patronBarcode='patronbarcode',patronPassword='patronpassword',workstationID='1',userID='2')
+		'''
+		return self.holdRequestCancel(patronBarcode,patronPassword,0,workstationID,userID,**kwargs)
+
+	def holdRequestCreate(self,patronID,bibID,pickupOrgID,workstationID,userID,requestingOrgID,**kwargs):
+		'''
+			Start the local hold request process. This process is based on a
+			"messaging" system and will allow a Polaris patron to place a
+			local hold request. After calling the HoldRequestCreate method,
+			one or more calls to the HoldRequestReply method may be required.
+			The message exchange is complete when a StatusType of Error (1) or
+			Answer (2) is returned or if an error is raised via a database
+			exception. Uses current time if ActivationDate is not supplied.
+
+			Example:
+			>>> papi.holdRequestCreate(patronID='121175',bibID='353063',pickupOrgID='3',workstationID='1',userID='2',requestingOrgID='3')
+		'''
+		data = {'PatronID':patronID,
+				'BibID':bibID,
+				'ItemBarcode':kwargs.get('itemBarcode',''),
+				'VolumeNumber':kwargs.get('volumeNumber',''),
+				'Designation':kwargs.get('designation',''),
+				'PickupOrgID':pickupOrgID,
+				'IsBorrowByMail':kwargs.get('isBorrowByMail','0'),
+				'PatronNotes':kwargs.get('patronNotes',''),
+				'Answer':kwargs.get('answer',None),
+				'ActivationDate':'/Date({timestamp}000-0000)/'.format(timestamp=kwargs.get('activationDate',str(int(time())))),
+				'UserID':userID,
+				'RequestingOrgID':requestingOrgID,
+				'TargetGUID':kwargs.get('targetGUID','')}
+		return self._request('holdRequestCreate',{},data=data,**kwargs)
+
+	def holdRequestReply(self,requestGUID,txnGroupQualifier,txnQualifier,requestingOrgID,answer,state,**kwargs):
+		'''
+			Send a reply message responding to the results of a previous
+			HoldRequestCreate or HoldRequestReply procedure call. The 
+			HoldRequestCreate procedure must be called before executing this
+			procedure. The RequestGUID, TxnGroupQualifier and TxnQualifier
+			returned by the HoldRequestCreate procedure will be used as input
+			parameters for this procedure call. These three values connect the
+			messages together to create an ILL conversation. After calling the
+			HoldRequestReply procedure, one or more calls to the 
+			HoldRequestReply procedure may be required. The message exchange
+			is complete when a StatusType of Error (1) or Answer (2) is
+			returned or if an error is raised via a database exception.
+
+			Example:
+			>>> papi.holdRequestReply(requestGUID='6297419E-57C1-460B-9A84-BC4A04B3F715',txnGroupQualifier='sIeGLBBJaKEtHvRFoXq3pa',txnQualifier='1al_YfH4ge6$nbiJ7pNaXW',requestingOrgID='3',answer='0',state='3')
+
+		'''
+		data = {'TxnGroupQualifier':txnGroupQualifier,
+				'TxnQualifier':txnQualifier,
+				'RequestingOrgID':requestingOrgID,
+				'Answer':answer,
+				'State':state}
+		return self._request('holdRequestReply',{'requestGUID':requestGUID},data=data,**kwargs)
+
+	def placeHold(self,patronID,bibID,pickupOrgID,workstationID,userID,requestingOrgID,answerPolicy=None,maxSteps=10,**kwargs):
+		'''
+			Places a local hold request by calling holdRequestCreate and then
+			holdRequestReply for as long as Polaris asks a conditional
+			question (StatusType 3), until a StatusType of Error (1) or Answer
+			(2) is returned. Returns a HoldOutcome(statusType,statusValue,
+			message,body,steps,latency) where body is the decoded final
+			response, steps the number of requests made and latency the
+			seconds the conversation took.
+
+			answerPolicy decides the answer to each conditional question. It
+			is either a function taking the decoded response (with its
+			StatusValue and Message) and returning True to answer yes, or a
+			dictionary mapping the StatusValues to answer yes to to True.
+			Questions it does not accept, and all questions by default, are
+			answered no. Raises PAPIError if Polaris returns an error
+			without a StatusType, or if the conversation is not over after
+			maxSteps requests. Keyword arguments are those of
+			holdRequestCreate.
+
+			Example:
+			>>> outcome = papi.placeHold('121175','353063','3','1','2','3',answerPolicy={7:True})
+			>>> outcome.statusType, outcome.message
+			(2, u'Your request has been placed.')
+		'''
+		started = time()
+		replyKwargs = dict((key,value) for key,value in kwargs.items() if key not in _holdCreateFields)
+		response = self.holdRequestCreate(patronID,bibID,pickupOrgID,workstationID,userID,requestingOrgID,**kwargs)
+		steps = 1
+		while True:
+			outcome,reply = self._holdProgress(response,requestingOrgID,answerPolicy,steps,maxSteps,started)
+			if outcome is not None: return outcome
+			response = self.holdRequestReply(*reply,**replyKwargs)
+			steps += 1
+
+	def _holdProgress(self,response,requestingOrgID,answerPolicy,steps,maxSteps,started):
+		# One step of placeHold: returns (HoldOutcome,None) once the
+		# conversation is over and (None,holdRequestReply arguments) while
+		# it is not.
+		response.raise_for_status()
+		body = response.json()
+		statusType = body.get('StatusType')
+		if statusType is None and body.get('PAPIErrorCode',0) < 0:
+			raise PAPIError(body['PAPIErrorCode'],body.get('ErrorMessage',''))
+		if statusType in (1,2):
+			return HoldOutcome(statusType,body.get('StatusValue'),body.get('Message'),body,steps,time()-started),None
+		if steps >= maxSteps:
+			raise PAPIError(body.get('PAPIErrorCode',0),'hold request not complete after {steps} steps'.format(steps=steps))
+		return None,(body['RequestGUID'],body['TxnGroupQualifier'],body['TxnQualifier'],requestingOrgID,_holdAnswer(answerPolicy,body),str(body.get('StatusValue','')))
+
+	def placeHoldMany(self,holds,**kwargs):
+		'''
+			Calls placeHold for every tuple of its positional arguments
+			(patronID,bibID,pickupOrgID,workstationID,userID,requestingOrgID)
+			in holds, running maxWorkers (default 8) conversations at once,
+			and yields a BatchResult(key,response,error) per hold, where key
+			is (patronID,bibID) and response the HoldOutcome. Keyword
+			arguments are those of placeHold and bibGetMany.
+
+			Example:
+			>>> holds = [('121175',bibID,'3','1','2','3') for bibID in readingList]
+			>>> for result in papi.placeHoldMany(holds,maxWorkers=100):
+			...	print(result.key, result.error or (result.response.statusType, result.response.steps, result.response.latency))
+		'''
+		return self._fanOut(self.placeHold,(tuple(hold) for hold in holds),lambda args: (args[0],args[1]),**kwargs)
+
+	def holdRequestSuspend(self,patronBarcode,patronPassword,requestID,activity,userID,activationDate,**kwargs):
+		'''
+			Suspend or reactivate a single hold request.
+
+			Example:
+			>>> papi.holdRequestSuspend(patronBarcode='patronbarcode',patronPassword='patronpassword',requestID='311608',activity='active',userID='1',activationDate='1491058000000')
+		'''
+		data = {'UserID':userID,
+				'ActivationDate':'/Date({timestamp}000-0000)/'.format(timestamp=activationDate)}
+		return self._request('holdRequestSuspend',{'patronBarcode':patronBarcode,'requestID':requestID,'activity':activity},patronPassword=patronPassword,data=data,**kwargs)
+
+	def holdRequestSuspendAllForPatron(self,patronBarcode,patronPassword,activity,userID,**kwargs):
+		'''
+			Suspend or reactivate all local hold requests for a specific
+			patron whose hold requests have a status of inactive (1),
+			active (2) or pending (4).
+
+			Example:
+			>>> papi.holdRequestSuspendAllForPatron(patronBarcode=PATRONBARCODE,patronPassword=PATRONPASSWORD,activity='active',userID='1',activationDate='1491058000000')
+		'''
+		return self.holdRequestSuspend(patronBarcode,patronPassword,'0',activity,userID,**kwargs)
+
+	def itemRenew(self,patronBarcode,patronPassword,itemID,logonBranchID,logonUserID,logonWorkstationID,ignoreOverrideErrors,**kwargs):
+		'''
+			Attempt to renew an item that is already checked out.
+
+			Example:
+			>>> papi.itemRenew(patronBarcode='patronbarcode',patronPassword='patronpassword',itemID='311608',logonBranchID='3',logonUserID='2',logonWorkstationID='1',ignoreOverrideErrors='true')
+		'''
+		data = {'Action':'renew',
+				'LogonBranchID':logonBranchID,
+				'LogonUserID':logonUserID,
+				'LogonWorkstationID':logonWorkstationID,
+				'RenewData':{'IgnoreOverrideErrors':ignoreOverrideErrors}}
+		return self._request('itemRenew',{'patronBarcode':patronBarcode,'itemID':itemID},patronPassword=patronPassword,data=data,**kwargs)
+	
+	def itemRenewAllForPatron(self,patronBarcode,patronPassword,logonBranchID,logonUserID,logonWorkstationID,ignoreOverrideErrors,**kwargs):
+		'''
+			Attempt to renew all items currently out to a patron.
+
+			Example:
+			>>> papi.itemRenewAllForPatron(patronBarcode='patronbarcode',patronPassword='patronpassword',logonBranchID='3',logonUserID='2',logonWorkstationID='1',ignoreOverrideErrors='true')
+		'''
+		return self.itemRenew(patronBarcode,patronPassword,0,logonBranchID,logonUserID,logonWorkstationID,ignoreOverrideErrors,**kwargs)
+
+	def limitFiltersGet(self,**kwargs):
+		'''
+			Returns list of valid bib search limit filters based on the
+			organization's Polaris System Administration values.
+
+			Example:
+			>>> papi.limitFiltersGet()
+		'''
+		return self._request('limitFiltersGet',{},**kwargs)
+
+	def notificationUpdate(self,accessToken=None,accessSecret=None,notificationTypeID=None,logonBranchID=None,logonUserID=None,logonWorkstationID=None,notificationStatusID=None,notificationDeliveryDate=None,deliveryOptionID=None,deliveryString=None,patronID=None,patronLanguageID=None,**kwargs):
+		'''
+			The NotificationUpdate method will update the Notification Log and
+			remove or update the Notification Queue entry. It is also
+			responsible for updating related ItemCheckout data elements and
+			rolling phone notification into print notification. This method
+			should be called after a patron is contacted.
+			
+			This method only supports telephone notification processing and
+			may be used in conjunction with the phone notification export
+			process.
+
+			Example:
+			>>> papi.notificationUpdate(accessToken='accesstoken',accessSecret='accesssecret',notificationTypeID='3',logonBranchID='3',logonUserID='2',logonWorkstationID='1',notificationStatusID='1',notificationDeliveryDate='/Date(1391058000000-0500)/',deliveryOptionID='3',deliveryString='4237570576',patronID='121175',patronLanguageID='1033',itemRecordID='353063',reportingOrgID='3')
+		'''
+		#UNABLE TO TEST
+		_require('notificationUpdate',logonBranchID=logonBranchID,logonUserID=logonUserID,logonWorkstationID=logonWorkstationID,notificationStatusID=notificationStatusID,notificationDeliveryDate=notificationDeliveryDate,deliveryOptionID=deliveryOptionID,deliveryString=deliveryString,patronID=patronID,patronLanguageID=patronLanguageID)
+		data = {'LogonBranchID':logonBranchID,
+				'LogonUserID':logonUserID,
+				'LogonWorkstationID':logonWorkstationID,
+				'ReportingOrgID':kwargs.get('reportingOrgID',None),
+				'NotificationStatusID':notificationStatusID,
+				'NotificationDeliveryDate':notificationDeliveryDate,
+				'DeliveryOptionID':deliveryOptionID,
+				'DeliveryString':deliveryString,
+				'Details':kwargs.get('details',None),
+				'PatronID':patronID,
+				'PatronLanguageID':patronLanguageID,
+				'ItemRecordID':kwargs.get('itemRecordID',None)}
+		return self._request('notificationUpdate',{'accessToken':accessToken,'notificationTypeID':notificationTypeID},accessSecret=accessSecret,data=data,**kwargs)
+
+	def organizationsGet(self,tier,**kwargs):
+		'''
+			Returns list of system, library and branch level organizations.
+			The list can be filtered by system, library or branch.
+
+			Example:
+			>>> papi.organizationsGet('all')
+		'''
+		return self._request('organizationsGet',{'tier':tier},**kwargs)
+
+	def patronAccountGet(self,patronBarcode,patronPassword,status,**kwargs):
+		'''
+			Returns list of fines and fees associated with a specified patron.
+			The list can be filtered by outstanding (current) or reconciled
+			(historical) fines and fees.
+
+			Example:
+			>>> papi.patronAccountGet(patronBarcode='patronbarcode',patronPassword='patronpassword',status='reconciled')
+		'''
+		return self._request('patronAccountGet',{'patronBarcode':patronBarcode,'status':status},patronPassword=patronPassword,**kwargs)
+
+	def patronAccountPay(self,accessToken=None,accessSecret=None,patronBarcode=None,chargeTxnID=None,txnAmount=None,paymentMethodID=None,workstationID=None,userID=None,**kwargs):
+		'''
+			Makes a payment on an existing charge on the Polaris patron
+			account.
+
+			Example:
+			>>> papi.patronAccountPay(accessToken='accesstoken',accessSecret='accesssecret',patronBarcode='patronbarcode',chargeTxnID='1170113',txnAmount='0',paymentMethodID='11',workstationID='1',userID='2')
+		'''
+		_require('patronAccountPay',txnAmount=txnAmount,paymentMethodID=paymentMethodID,workstationID=workstationID,userID=userID)
+		data = {'TxnAmount':txnAmount,
+				'PaymentMethodID':paymentMethodID,
+				'FreeTextNote':kwargs.get('freeTextNote',None)}
+		params={'wsid':workstationID,
+				'userid':userID}
+		return self._request('patronAccountPay',{'accessToken':accessToken,'patronBarcode':patronBarcode,'chargeTxnID':chargeTxnID},accessSecret=accessSecret,data=data,params=params,**kwargs)
+
+	def patronBasicDataGet(self,patronBarcode,patronPassword,**kwargs):
+		'''
+			Return basic name, address, circulation counts, and account
+			balances for a patron.
+
+			Example:
+			>>> papi.patronBasicDataGet(patronBarcode='patronbarcode',patronPassword='patronpassword')
+		'''
+		return self._request('patronBasicDataGet',{'patronBarcode':patronBarcode},patronPassword=patronPassword,**kwargs)
+
+	def patronBasicDataGetMany(self,credentials,**kwargs):
+		'''
+			Calls patronBasicDataGet for every (patronBarcode,patronPassword)
+			pair in credentials concurrently. The key of each BatchResult is
+			the patron barcode. See bibGetMany for the batch keyword arguments
+			and results.
+
+			Example:
+			>>> for result in papi.patronBasicDataGetMany([('patronbarcode','patronpassword')]):
+			...	print(result.key, result.response.json())
+		'''
+		return self._fanOut(self.patronBasicDataGet,(tuple(credential) for credential in credentials),lambda args: args[0],**kwargs)
+
+	def patronCirculateBlocksGet(self,patronBarcode,patronPassword,**kwargs):
+		'''
+			Validate that a patron is part of the Polaris database, and return
+			blocks and status telling the caller if the given patron is
+			allowed to perform a circulation activity (checkout).
+
+			Example:
+			>>> papi.patronCirculateBlocksGet(patronBarcode='patronbarcode',patronPassword='patronpassword')
+		'''
+		return self._request('patronCirculateBlocksGet',{'patronBarcode':patronBarcode},patronPassword=patronPassword,**kwargs)
+
+	def createPatronBlocks(self,accessToken=None,accessSecret=None,patronBarcode=None,blockTypeID=None,blockValue=None,**kwargs):
+		'''
+			This protected method will create a block on a patron record.
+
+			Example:
+			>>> papi.createPatronBlocks(accessToken='accesstoken',accessSecret='accesssecret',patronBarcode='patronbarcode',blockTypeID='1',blockValue='hello world')
+		'''
+		_require('createPatronBlocks',blockTypeID=blockTypeID,blockValue=blockValue)
+		data = {'BlockTypeID':blockTypeID,
+				'BlockValue':blockValue}
+		return self._request('createPatronBlocks',{'accessToken':accessToken,'patronBarcode':patronBarcode},accessSecret=accessSecret,data=data,**kwargs)
+
+	def patronHoldRequestsGet(self,patronBarcode,patronPassword,status,**kwargs):
+		'''
+			Returns a list of hold requests placed by the specified patron.
+			The list can be filtered by ALL hold requests or by the status of
+			the request.
+
+			Example:
+			>>> papi.patronHoldRequestsGet(patronBarcode='patronbarcode',patronPassword='patronpassword','all')
+		'''
+		return self._request('patronHoldRequestsGet',{'patronBarcode':patronBarcode,'status':status},patronPassword=patronPassword,**kwargs)
+
+	def patronItemsOutGet(self,patronBarcode,patronPassword,status,**kwargs):
+		'''
+			Returns list of items out to the specified patron. The list can be
+			filtered by ALL items out, OVERDUE items only, or LOST items only.
+
+			Example:
+			>>> papi.patronItemsOutGet(patronBarcode='patronbarcode',patronPassword='patronpassword','all')
+		'''
+		return self._request('patronItemsOutGet',{'patronBarcode':patronBarcode,'status':status},patronPassword=patronPassword,**kwargs)
+
+	def patronMessagesGet(self,patronBarcode,patronPassword,**kwargs):
+		'''
+			Retrieves a list of new and read patron messages.
+
+			Example:
+			>>> papi.patronMessagesGet(patronBarcode='patronbarcode',patronPassword='patronpassword')
+		'''
+		return self._request('patronMessagesGet',{'patronBarcode':patronBarcode},patronPassword=patronPassword,**kwargs)
+
+	def patronMessageUpdateStatus(self,patronBarcode,patronPassword,messageType,messageID,**kwargs):
+		'''
+			Marks a message as read.
+
+			Example:
+			>>> papi.patronMessageUpdateStatus(patronBarcode='patronbarcode',patronPassword='patronpassword',messageType='freetext',messageID='2330')
+		'''
+		return self._request('patronMessageUpdateStatus',{'patronBarcode':patronBarcode,'messageType':messageType,'messageID':messageID},patronPassword=patronPassword,**kwargs)
+
+	def patronMessageDelete(self,patronBarcode,patronPassword,messageType,messageID,**kwargs):
+		'''
+			Delete a specific patron message.
+
+			Example:
+			>>> papi.patronMessageDelete(patronBarcode='patronbarcode',patronPassword='patronpassword',messageType='freetext',messageID='2330')
+		'''
+		return self._request('patronMessageDelete',{'patronBarcode':patronBarcode,'messageType':messageType,'messageID':messageID},patronPassword=patronPassword,**kwargs)
+
+	def patronPreferencesGet(self,patronBarcode,patronPassword,**kwargs):
+		'''
+			Return preferences for a patron including reading list, email
+			format, and notification type.
+
+			Example:
+			>>> papi.patronPreferencesGet(patronBarcode='patronbarcode',patronPassword='patronpassword')
+		'''
+		return self._request('patronPreferencesGet',{'patronBarcode':patronBarcode},patronPassword=patronPassword,**kwargs)
+
+	def patronReadingHistoryClear(self,patronBarcode,patronPassword,**kwargs):
+		'''
+			Clears the historical list of items a patron has checked out.
+
+			Example:
+			>>> papi.patronReadingHistoryClear(patronBarcode='patronbarcode',patronPassword='patronpassword')
+		'''
+		return self._request('patronReadingHistoryClear',{'patronBarcode':patronBarcode},patronPassword=patronPassword,**kwargs)
+
+	def patronRegistrationCreate(self,logonBranchID,logonUserID,logonWorkstationID,patronBranchID,nameFirst,nameLast,**kwargs):
+		'''
+			Create a new patron registration record; basic patron duplicate 
+			detection (name, username, barcode) is performed.
+
+			Example:
+			>>> papi.patronRegistrationCreate(logonBranchID='3',logonUserID='2',logonWorkstationID='1',patronBranchID='3',nameFirst='Foo',nameLast='Bar')
+		'''
+		data = {'LogonBranchID':logonBranchID,
+				'LogonUserID':logonUserID,
+				'LogonWorkstationID':logonWorkstationID,
+				'PatronBranchID':patronBranchID,
+				'PostalCode':kwargs.get('postalCode',None),
+				'ZipPlusFour':kwargs.get('zipPlusFour',None),
+				'City':kwargs.get('city',None),
+				'State':kwargs.get('state',None),
+				'County':kwargs.get('county',None),
+				'CountryID':kwargs.get('countryID',None),
+				'StreetOne':kwargs.get('streetOne',None),
+				'StreetTwo':kwargs.get('streetTwo',None),
+				'NameFirst':nameFirst,
+				'NameLast':nameLast,
+				'NameMiddle':kwargs.get('nameMiddle',None),
+				'User1':kwargs.get('user1',None),
+				'User2':kwargs.get('user2',None),
+				'User3':kwargs.get('user3',None),
+				'User4':kwargs.get('user4',None),
+				'User5':kwargs.get('user5',None),
+				'Gender':kwargs.get('gender',None),
+				'Birthdate':kwargs.get('birthdate',None),
+				'PhoneVoice1':kwargs.get('phoneVoice1',None),
+				'PhoneVoice2':kwargs.get('phoneVoice2',None),
+				'EmailAddress':kwargs.get('emailAddress',None),
+				'LanguageID':kwargs.get('languageID',None),
+				'DeliveryOptionID':kwargs.get('deliveryOptionID',None),
+				'UserName':kwargs.get('username',None),
+				'Password':kwargs.get('password',None),
+				'Password2':kwargs.get('password2',None),
+				'AltEmailAddress':kwargs.get('altEmailAddress',None),
+				'PhoneVoice3':kwargs.get('phoneVoice3',None),
+				'Phone1CarrierID':kwargs.get('phone1CarrierID',None),
+				'Phone2CarrierID':kwargs.get('phone2CarrierID',None),
+				'Phone3CarrierID':kwargs.get('phone3CarrierID',None),
+				'Enable':kwargs.get('enable',None),
+				'TxtPhoneNumber':kwargs.get('txtPhoneNumber',None),
+				'Barcode':kwargs.get('barcode',None),
+				'EReceiptOPtionID':kwargs.get('EReceiptOPtionID',None)}
+		return self._request('patronRegistrationCreate',{},data=data,**kwargs)
+
+	def patronRenewBlocksGet(self,accessToken=None,accessSecret=None,patronID=None,**kwargs):
+		'''
+			This method takes in a Patron ID and returns patron renewal blocks
+			(if any). It also indicates whether the patron is allowed to renew
+			(the blocks may be informational or actual blocks). It is a 
+			protected method and staff must authenticate before calling this
+			method.
+
+			Example:
+			>>> papi.patronRenewBlocksGet(accessToken='accesstoken',accessSecret='accesssecret,'121175')
+		'''
+		return self._request('patronRenewBlocksGet',{'accessToken':accessToken,'patronID':patronID},accessSecret=accessSecret,**kwargs)
+
+	def patronSavedSearchesGet(self,patronBarcode,patronPassword,**kwargs):
+		'''
+			Returns list of saved searches to the specified patron.
+
+			Example:
+			>>> papi.patronSavedSearchesGet(patronBarcode='patronbarcode',patronPassword='patronpassword')
+
+		'''
+		return self._request('patronSavedSearchesGet',{'patronBarcode':patronBarcode},patronPassword=patronPassword,**kwargs)
+
+	def patronReadingHistoryGet(self,patronBarcode,patronPassword,page,rowsPerPage,**kwargs):
+		'''
+			Returns historical list of items patron has checked out. The
+			procedure is capable of returning just a count of the total number
+			of titles in the patron's check-out history, a list of all titles
+			in the history, or a specific page of titles of a specified
+			length.
+
+			Example:
+			>>> papi.patronReadingHistoryGet(patronBarcode='patronbarcode',patronPassword='patronpassword','10','10')
+
+			The whole history (rowsPerPage='0') is best read as a stream:
+			>>> for row in papi.patronReadingHistoryGet('patronbarcode','patronpassword','1','0',stream=True): print(row['Title'])
+		'''
+		params = {'page':page,
+				'rowsperpage':rowsPerPage}
+		return self._request('patronReadingHistoryGet',{'patronBarcode':patronBarcode},patronPassword=patronPassword,params=params,**kwargs)
+
+	def iterReadingHistory(self,patronBarcode,patronPassword,rowsPerPage='50',prefetch=0,**kwargs):
+		'''
+			Generator over the PatronReadingHistoryGetRows of a patron's whole
+			reading history, fetching rowsPerPage rows per request. With
+			prefetch=N the next N pages are requested concurrently while the
+			current one is being consumed. Raises PAPIError if Polaris reports
+			an error.
+
+			Example:
+			>>> for row in papi.iterReadingHistory(patronBarcode='patronbarcode',patronPassword='patronpassword',rowsPerPage='100'):
+			...	print(row['Title'])
+		'''
+		def fetchPage(page):
+			return self.patronReadingHistoryGet(patronBarcode,patronPassword,str(page),str(rowsPerPage),**kwargs)
+		return self._iterPages(fetchPage,'PatronReadingHistoryGetRows',rowsPerPage,prefetch)
+
+	def patronSearch(self,accessToken=None,accessSecret=None,params=None,**kwargs):
+		'''
+			This protected method will return a list of patrons that match the
+			search criteria specified in the CCL submitted by the user. Data
+			returned includes the patron's name, barcode, Polaris Patron ID,
+			and Polaris Organization ID. This method offers query parameters
+			that allow the user to specify the number of patrons, the sort
+			order, and page of data to retrieve.
+
+			Example:
+			>>> papi.patronSearch(accessToken='accesstoken',accessSecret='accesssecret',params={'q':'PATNL=Bar'})
+		'''
+		return self._request('patronSearch',{'accessToken':accessToken},accessSecret=accessSecret,params=params,**kwargs)
+
+	def iterPatronSearch(self,accessToken=None,accessSecret=None,params=None,patronsPerPage='50',prefetch=0,**kwargs):
+		'''
+			Generator over the PatronSearchRows of every page of a
+			patronSearch, fetching patronsPerPage rows per request. With
+			prefetch=N the next N pages are requested concurrently while the
+			current one is being consumed. Raises PAPIError if Polaris reports
+			an error.
+
+			Example:
+			>>> for row in papi.iterPatronSearch(accessToken='accesstoken',accessSecret='accesssecret',params={'q':'PATNL=Bar'}):
+			...	print(row['Barcode'])
+		'''
+		def fetchPage(page):
+			pageParams = dict(params or {},page=str(page),patronsperpage=str(patronsPerPage))
+			return self.patronSearch(accessToken,accessSecret,pageParams,**kwargs)
+		return self._iterPages(fetchPage,'PatronSearchRows',patronsPerPage,prefetch)
+
+	def patronUpdate(self,patronBarcode,patronPassword,logonBranchID,logonUserID,logonWorkstationID,**kwargs):
+		'''
+			Update Patron Registration information. Currently supported fields
+			are the following:
+
+				- Reading List flag
+				- Email Format
+				- Delivery Option for Notices
+				- Primary Phone Number
+				- Phone Voice1
+				- Email Address
+
+			Example:
+			>>> papi.patronUpdate(patronBarcode='patronbarcode',patronPassword='patronpassword',logonBranchID='3',logonUserID='2',logonWorkstationID='1',emailFormat='2')
+		'''
+		data = {'LogonBranchID':logonBranchID,
+				'LogonUserID':logonUserID,
+				'LogonWorkstationID':logonWorkstationID,
+				'ReadingListFlag':kwargs.get('readingListFlag',None),
+				'EmailFormat':kwargs.get('emailFormat',None),
+				'DeliveryOption':kwargs.get('deliveryOption',None),
+				'EmailAddress':kwargs.get('emailAddress',None),
+				'PhoneVoice1':kwargs.get('phoneVoice1',None),
+				'Password':kwargs.get('password',None)
+				}
+		return self._request('patronUpdate',{'patronBarcode':patronBarcode},patronPassword=patronPassword,data=data,**kwargs)
+
+	def patronValidate(self,patronBarcode,patronPassword,**kwargs):
+		'''
+			Validate that a patron is part of the Polaris database.
+
+			Example:
+			>>> papi.patronValidate(patronBarcode='patronbarcode',patronPassword='patronpassword')
+		'''
+		return self._request('patronValidate',{'patronBarcode':patronBarcode},patronPassword=patronPassword,**kwargs)
+
+	def sortOptionsGet(self,**kwargs):
+		'''
+			Returns list of valid sort options.
+
+			Example:
+			>>> papi.sortOptionsGet()
+		'''
+		return self._request('sortOptionsGet',{},**kwargs)
+
+	def synchItemsByBibIDGet(self,accessToken=None,accessSecret=None,bibID=None,**kwargs):
+		'''
+			Example:
+			>>> papi.synchTasksCheckout(self,accessToken='accesstoken',accessSecret='accesssecret',workstationID='1',userID='2',vendorID='james',vendorContractID='12345',uniqueRecordID,patronBarcode,itemExpireDateTime,transactionDateTime)
+		'''
+
+		return self._request('synchItemsByBibIDGet',{'accessToken':accessToken,'bibID':bibID},accessSecret=accessSecret,**kwargs)
+
+
+	def synchTasksCheckout(self,accessToken=None,accessSecret=None,workstationID=None,userID=None,vendorID=None,vendorContractID=None,uniqueRecordID=None,patronBarcode=None,itemExpireDateTime=None,transactionDateTime=None,**kwargs):
+		'''
+			Example:
+			>>> papi.synchTasksCheckout(self,accessToken='accesstoken',accessSecret='accesssecret',workstationID='1',userID='2',vendorID='james',vendorContractID='12345',uniqueRecordID,patronBarcode,itemExpireDateTime,transactionDateTime)
+		'''
+
+		_require('synchTasksCheckout',workstationID=workstationID,userID=userID,vendorID=vendorID,vendorContractID=vendorContractID,uniqueRecordID=uniqueRecordID,patronBarcode=patronBarcode,itemExpireDateTime=itemExpireDateTime,transactionDateTime=transactionDateTime)
+		params={'wsid':workstationID,
+				'userid':userID}
+		data = {'VendorID':vendorID,
+				'VendorContractID':vendorContractID,
+				'UniqueRecordID':uniqueRecordID,
+				'PatronBarcode':patronBarcode,
+				'ItemExpireDateTime':'/Date({timestamp}000-0000)/'.format(timestamp=itemExpireDateTime),
+				'TransactionDateTime':'/Date({timestamp}000-0000)/'.format(timestamp=transactionDateTime)
+				} 
+		return self._request('synchTasksCheckout',{'accessToken':accessToken},accessSecret=accessSecret,params=params,data=data,**kwargs)
+
+
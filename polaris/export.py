@@ -0,0 +1,164 @@
+import json
+import os
+from time import time
+from .client import _body, _boundedMap
+
+class PatronExport(object):
+	'''
+	A pipelined bulk export of patrons from polaris.PAPI to JSON lines files
+
+	Example usage:
+
+	>>> import polaris.export
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',staffCredentials=('yourdomain','yourusername','yourpassword'))
+	>>> export = polaris.export.PatronExport(papi,'/var/lib/analytics/patrons',maxWorkers=32)
+	>>> export.run({'q':'PATNL=*'})
+	>>> export.report()
+	{'search': {'ok': 25000, 'failed': 0, 'perSecond': 310.2}, 'basicData': {...}, ...}
+
+	Patrons are paged through with patronSearch (params are its query
+	string parameters) and for every patron found patronBasicDataGet,
+	patronItemsOutGet, patronHoldRequestsGet and patronAccountGet are called
+	concurrently, maxWorkers calls at a time, using staff override. Each
+	stage writes one line of JSON per row, as soon as the patron is
+	complete, to a file in directory:
+
+		patrons.jsonl	the PatronBasicData of every patron
+		itemsout.jsonl	the PatronItemsOutGetRows of every patron
+		holds.jsonl	the PatronHoldRequestsGetRows of every patron
+		account.jsonl	the outstanding PatronAccountGetRows of every patron
+		errors.jsonl	the stage and error of every failed call
+
+	Every row is tagged with the PatronBarcode it belongs to. Memory use is
+	bounded by maxWorkers+queueDepth calls and prefetch pages of search
+	results, whatever the number of patrons.
+
+	Progress is saved to checkpoint.json every checkpointEvery patrons. A
+	run started on a directory holding a checkpoint cuts the files back to
+	the checkpoint and continues from the next patron, so an interrupted
+	export resumes where it left off without duplicate rows (provided the
+	search returns patrons in the same order). Delete the directory to
+	start afresh.
+
+	accessToken and accessSecret are those of authenticateStaffUser; when
+	omitted, those of the StaffTokenManager of papi are used. Further
+	keyword arguments are passed on to every PAPI call, which default to
+	priority='batch'.
+	'''
+
+	stages = (	('basicData','patronBasicDataGet',(),'PatronBasicData','patrons'),
+				('itemsOut','patronItemsOutGet',('all',),'PatronItemsOutGetRows','itemsout'),
+				('holds','patronHoldRequestsGet',('all',),'PatronHoldRequestsGetRows','holds'),
+				('account','patronAccountGet',('outstanding',),'PatronAccountGetRows','account'))
+
+	def __init__(self,papi,directory,maxWorkers=16,queueDepth=64,patronsPerPage=100,prefetch=2,checkpointEvery=100):
+		self._papi = papi
+		self._directory = directory
+		self._maxWorkers = maxWorkers
+		self._queueDepth = queueDepth
+		self._patronsPerPage = int(patronsPerPage)
+		self._prefetch = prefetch
+		self._checkpointEvery = checkpointEvery
+		self.stats = dict((stage,{'ok':0,'failed':0}) for stage in ['search']+[stage[0] for stage in self.stages])
+		self._started = None
+
+	def _path(self,name):
+		return os.path.join(self._directory,name)
+
+	def _credentials(self,accessToken,accessSecret):
+		if accessToken is not None: return accessToken,accessSecret
+		return self._papi._tokens.get()
+
+	def run(self,params,accessToken=None,accessSecret=None,**kwargs):
+		'''
+			Exports every patron found by patronSearch with params, resuming
+			from the checkpoint if there is one. Returns the number of
+			patrons exported by this run. Raises ValueError if neither
+			accessToken nor the staffCredentials of papi were given.
+		'''
+		if accessToken is None and self._papi._tokens is None:
+			raise ValueError('PatronExport.run needs accessToken and accessSecret, or a PAPI given staffCredentials')
+		kwargs.setdefault('priority','batch')
+		if not os.path.isdir(self._directory): os.makedirs(self._directory)
+		checkpoint = self._resume()
+		files = dict((name,open(self._path(name+'.jsonl'),'a')) for name in [stage[4] for stage in self.stages]+['errors'])
+		self._started = time()
+		exported = 0
+		try:
+			def tasks():
+				for patron in self._patrons(params,checkpoint['patrons'],accessToken,accessSecret,kwargs):
+					for stage in self.stages: yield patron,stage
+			def call(task):
+				patron,(stage,method,args,key,name) = task
+				token,secret = self._credentials(accessToken,accessSecret)
+				return _body(getattr(self._papi,method)(patron,secret,*args,accessToken=token,**kwargs)).get(key)
+			results = []
+			# Results come in input order, so those of a patron arrive
+			# together and patrons are written in search order.
+			for index,(patron,stage),rows,error in _boundedMap(call,tasks(),self._maxWorkers,self._queueDepth,ordered=True):
+				results.append((patron,stage,rows,error))
+				if len(results) < len(self.stages): continue
+				self._write(files,results)
+				results = []
+				exported += 1
+				checkpoint['patrons'] += 1
+				if checkpoint['patrons'] % self._checkpointEvery == 0: self._checkpoint(files,checkpoint)
+			self._checkpoint(files,checkpoint)
+		finally:
+			for file in files.values(): file.close()
+		return exported
+
+	def _patrons(self,params,skip,accessToken,accessSecret,kwargs):
+		# The barcodes of the patrons found, from the skip+1th on.
+		def fetchPage(page):
+			token,secret = self._credentials(accessToken,accessSecret)
+			pageParams = dict(params or {},page=str(page),patronsperpage=str(self._patronsPerPage))
+			return self._papi.patronSearch(token,secret,pageParams,**kwargs)
+		rows = self._papi._iterPages(fetchPage,'PatronSearchRows',self._patronsPerPage,self._prefetch,skip//self._patronsPerPage+1)
+		try:
+			for index,row in enumerate(rows):
+				if index < skip%self._patronsPerPage: continue
+				self.stats['search']['ok'] += 1
+				yield row['Barcode']
+		except Exception:
+			self.stats['search']['failed'] += 1
+			raise
+
+	def _write(self,files,results):
+		for patron,(stage,method,args,key,name),rows,error in results:
+			if error is not None:
+				self.stats[stage]['failed'] += 1
+				files['errors'].write(json.dumps({'PatronBarcode':patron,'stage':stage,'error':repr(error)})+'\n')
+				continue
+			self.stats[stage]['ok'] += 1
+			if isinstance(rows,dict): rows = [rows]
+			for row in rows or []:
+				row = dict(row,PatronBarcode=patron)
+				files[name].write(json.dumps(row,separators=(',',':'))+'\n')
+
+	def _checkpoint(self,files,checkpoint):
+		# Records the number of patrons exported and the matching length of
+		# every file, replacing the previous checkpoint atomically.
+		for name,file in files.items():
+			file.flush()
+			os.fsync(file.fileno())
+			checkpoint['sizes'][name] = file.tell()
+		path = self._path('checkpoint.json')
+		with open(path+'.tmp','w') as temporary: json.dump(checkpoint,temporary)
+		os.rename(path+'.tmp',path)
+
+	def _resume(self):
+		path = self._path('checkpoint.json')
+		if not os.path.exists(path): return {'patrons':0,'sizes':{}}
+		with open(path) as file: checkpoint = json.load(file)
+		for name,size in checkpoint['sizes'].items():
+			with open(self._path(name+'.jsonl'),'a') as file: file.truncate(size)
+		return checkpoint
+
+	def report(self):
+		'''
+			Returns, per stage, the number of successful and failed calls and
+			the rate of successful calls per second since the run started.
+		'''
+		elapsed = max(time()-self._started,1e-9) if self._started else None
+		return dict((stage,{'ok':counts['ok'],'failed':counts['failed'],'perSecond':counts['ok']/elapsed if elapsed else 0.0}) for stage,counts in self.stats.items())
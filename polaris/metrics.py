@@ -0,0 +1,133 @@
+import re
+import threading
+from time import time
+
+_errorCode = re.compile(br'"PAPIErrorCode"\s*:\s*(-?\d+)')
+
+class Metrics(object):
+	'''
+	Latency histograms and counters for the requests of polaris.PAPI
+
+	Example usage:
+
+	>>> import polaris.metrics
+	>>> metrics = polaris.metrics.Metrics()
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',instrumentation=metrics)
+	>>> papi.bibGet('353063').json()
+	>>> print(metrics.prometheus())
+	# HELP papi_phase_seconds Seconds spent per PAPI method and phase of a request.
+	# TYPE papi_phase_seconds histogram
+	papi_phase_seconds_bucket{endpoint="bibGet",phase="network",le="0.05"} 1
+	...
+
+	For every PAPI method (endpoint) a histogram is kept of the time spent
+	signing, preparing the rest of the request, on the network (sending
+	and receiving the whole response) and decoding the JSON of the
+	response with its json() method. Requests are counted by HTTP status,
+	failed requests by the type of error, bytes by direction, and
+	responses by PAPIErrorCode: negative codes individually, all others as
+	'ok'. Responses answered from a cache or by single-flight do not reach
+	the network and are not counted.
+
+	buckets are the upper bounds, in seconds, of the histogram buckets.
+	Serve prometheus() from the metrics endpoint of the application, or
+	read snapshot() directly.
+	'''
+
+	defaultBuckets = (0.0001,0.0005,0.001,0.005,0.01,0.025,0.05,0.1,0.25,0.5,1.0,2.5,5.0,10.0)
+
+	def __init__(self,buckets=None):
+		self.buckets = tuple(sorted(buckets or self.defaultBuckets))
+		self._lock = threading.Lock()
+		self._histograms = {}
+		self._counters = {}
+
+	def _observe(self,endpoint,phase,seconds):
+		key = (endpoint,phase)
+		with self._lock:
+			histogram = self._histograms.get(key)
+			if histogram is None: histogram = self._histograms[key] = [[0]*len(self.buckets),0.0,0]
+			for index,bound in enumerate(self.buckets):
+				if seconds <= bound:
+					histogram[0][index] += 1
+					break
+			histogram[1] += seconds
+			histogram[2] += 1
+
+	def _count(self,name,labels,amount=1):
+		key = (name,labels)
+		with self._lock: self._counters[key] = self._counters.get(key,0)+amount
+
+	def beforeSend(self,endpoint,preparedRequest):
+		pass
+
+	def afterResponse(self,endpoint,preparedRequest,response,error,timings):
+		endpoint = endpoint or 'unknown'
+		for phase,seconds in timings.items(): self._observe(endpoint,phase,seconds)
+		self._count('papi_request_bytes_total',(('endpoint',endpoint),),len(preparedRequest.body or ''))
+		if error is not None:
+			self._count('papi_transport_errors_total',(('endpoint',endpoint),('error',type(error).__name__)))
+			return
+		self._count('papi_requests_total',(('endpoint',endpoint),('status',str(response.status_code))))
+		# The body of a streamed response has not been read yet and is left
+		# alone; its size is known only from Content-Length.
+		content = response._content if response._content is not False else None
+		size = len(content) if content is not None else response.headers.get('Content-Length')
+		if size is not None: self._count('papi_response_bytes_total',(('endpoint',endpoint),),int(size))
+		if content is not None:
+			match = _errorCode.search(content)
+			if match is not None:
+				code = int(match.group(1))
+				self._count('papi_errorcode_total',(('endpoint',endpoint),('code',str(code) if code < 0 else 'ok')))
+		decode = response.json
+		def timedJSON(**kwargs):
+			started = time()
+			try: return decode(**kwargs)
+			finally: self._observe(endpoint,'decode',time()-started)
+		response.json = timedJSON
+
+	def snapshot(self):
+		'''
+			Returns {'histograms':{(endpoint,phase):(bucketCounts,sum,count)},
+			'counters':{(name,labels):value}}, bucketCounts not cumulative.
+		'''
+		with self._lock:
+			return {'histograms':dict((key,(list(histogram[0]),histogram[1],histogram[2])) for key,histogram in self._histograms.items()),
+					'counters':dict(self._counters)}
+
+	def prometheus(self):
+		'''
+			Returns the metrics in the Prometheus text exposition format.
+		'''
+		snapshot = self.snapshot()
+		lines = ['# HELP papi_phase_seconds Seconds spent per PAPI method and phase of a request.','# TYPE papi_phase_seconds histogram']
+		for (endpoint,phase),(counts,total,observations) in sorted(snapshot['histograms'].items()):
+			labels = 'endpoint="{0}",phase="{1}"'.format(_escape(endpoint),phase)
+			cumulative = 0
+			for bound,bucketCount in zip(self.buckets,counts):
+				cumulative += bucketCount
+				lines.append('papi_phase_seconds_bucket{{{0},le="{1!r}"}} {2}'.format(labels,bound,cumulative))
+			lines.append('papi_phase_seconds_bucket{{{0},le="+Inf"}} {1}'.format(labels,observations))
+			lines.append('papi_phase_seconds_sum{{{0}}} {1!r}'.format(labels,total))
+			lines.append('papi_phase_seconds_count{{{0}}} {1}'.format(labels,observations))
+		helps = {	'papi_requests_total':'PAPI requests answered, by method and HTTP status.',
+					'papi_transport_errors_total':'PAPI requests failed without a response, by method and error.',
+					'papi_request_bytes_total':'Bytes of PAPI request bodies sent, by method.',
+					'papi_response_bytes_total':'Bytes of PAPI response bodies received, by method.',
+					'papi_errorcode_total':'PAPI responses by method and PAPIErrorCode (non-negative codes as ok).'}
+		for name in sorted(helps):
+			counters = sorted((labels,value) for (counterName,labels),value in snapshot['counters'].items() if counterName == name)
+			if not counters: continue
+			lines.append('# HELP {0} {1}'.format(name,helps[name]))
+			lines.append('# TYPE {0} counter'.format(name))
+			for labels,value in counters:
+				lines.append('{0}{{{1}}} {2}'.format(name,','.join('{0}="{1}"'.format(key,_escape(label)) for key,label in labels),value))
+		return '\n'.join(lines)+'\n'
+
+	def reset(self):
+		with self._lock:
+			self._histograms.clear()
+			self._counters.clear()
+
+def _escape(value):
+	return str(value).replace('\\','\\\\').replace('"','\\"').replace('\n','\\n')
@@ -0,0 +1,224 @@
+import json
+import re
+import sqlite3
+import threading
+from time import time
+from .client import _body, _boundedMap
+
+class Mirror(object):
+	'''
+	A local mirror of bibliographic records and their holdings
+
+	Example usage:
+
+	>>> import polaris.mirror
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname')
+	>>> mirror = polaris.mirror.Mirror(papi,'/var/lib/opac/mirror.sqlite')
+	>>> mirror.refreshReference()
+	>>> failures = mirror.harvest(bibIDs,maxWorkers=16)
+	>>> mirror.bibsByISBN('0-316-76948-7')
+	['353063']
+	>>> mirror.itemByBarcode('31234000123456')
+	{'bibID': '353063', 'Barcode': '31234000123456', 'CircStatus': 'In', 'branch': 'Main Library', ...}
+	>>> mirror.availability('353063')
+	{'Main Library': {'total': 3, 'available': 1}, 'Branch Library': {'total': 1, 'available': 1}}
+
+	harvest stores the bibGet and bibHoldingsGet responses of every bibID
+	in a sqlite database at path (in memory by default), indexed by ISBN,
+	item barcode, collection and branch. refreshReference stores the
+	collections (collectionsGet) and branches (organizationsGet) so that
+	holdings can be queried by collection and branch ID or name. The query
+	methods only read the local store and take microseconds rather than a
+	round trip to Polaris.
+
+	Every bib records when it was last refreshed: see refreshedAt and
+	stale, whose result can be passed straight back to harvest.
+	'''
+
+	def __init__(self,papi,path=':memory:'):
+		self._papi = papi
+		self._lock = threading.Lock()
+		self._db = sqlite3.connect(path,timeout=30,isolation_level=None,check_same_thread=False)
+		if path != ':memory:': self._db.execute('PRAGMA journal_mode=WAL')
+		for statement in (	'CREATE TABLE IF NOT EXISTS mirror_bibs (bibID TEXT PRIMARY KEY, record TEXT NOT NULL, refreshed REAL NOT NULL)',
+							'CREATE INDEX IF NOT EXISTS mirror_bibs_refreshed ON mirror_bibs (refreshed)',
+							'CREATE TABLE IF NOT EXISTS mirror_isbns (isbn TEXT NOT NULL, bibID TEXT NOT NULL, PRIMARY KEY (isbn,bibID)) WITHOUT ROWID',
+							'CREATE TABLE IF NOT EXISTS mirror_items (bibID TEXT NOT NULL, barcode TEXT, branchID INTEGER, collectionID INTEGER, available INTEGER NOT NULL, row TEXT NOT NULL)',
+							'CREATE INDEX IF NOT EXISTS mirror_items_bib ON mirror_items (bibID)',
+							'CREATE INDEX IF NOT EXISTS mirror_items_barcode ON mirror_items (barcode)',
+							'CREATE INDEX IF NOT EXISTS mirror_items_collection ON mirror_items (collectionID,branchID)',
+							'CREATE INDEX IF NOT EXISTS mirror_items_branch ON mirror_items (branchID)',
+							'CREATE TABLE IF NOT EXISTS mirror_collections (collectionID INTEGER PRIMARY KEY, name TEXT NOT NULL)',
+							'CREATE TABLE IF NOT EXISTS mirror_branches (branchID INTEGER PRIMARY KEY, name TEXT NOT NULL)'):
+			self._db.execute(statement)
+		self._loadReference()
+
+	def _loadReference(self):
+		self._collections = dict(self._db.execute('SELECT name,collectionID FROM mirror_collections'))
+		self._branches = dict(self._db.execute('SELECT branchID,name FROM mirror_branches'))
+
+	def refreshReference(self,**kwargs):
+		'''
+			Stores the collections and branches of the Polaris system. Call
+			it before the first harvest and whenever they change.
+		'''
+		collections = _rows(self._papi.collectionsGet(**kwargs),'CollectionsRows')
+		branches = _rows(self._papi.organizationsGet('branch',**kwargs),'OrganizationsGetRows')
+		with self._lock:
+			self._write(	[('DELETE FROM mirror_collections',[()]),
+							('INSERT INTO mirror_collections (collectionID,name) VALUES (?,?)',[(row['ID'],row['Name']) for row in collections]),
+							('DELETE FROM mirror_branches',[()]),
+							('INSERT INTO mirror_branches (branchID,name) VALUES (?,?)',[(row['OrganizationID'],row.get('DisplayName') or row['Name']) for row in branches])])
+			self._loadReference()
+
+	def harvest(self,bibIDs,maxWorkers=8,queueDepth=32,**kwargs):
+		'''
+			Fetches and stores (or refreshes) the bib record and holdings of
+			every bibID in bibIDs, maxWorkers bibs at a time. Returns a list
+			of (bibID,error) for the bibs which could not be fetched; those
+			already in the mirror are left as they were.
+		'''
+		kwargs.setdefault('priority','batch')
+		def fetch(bibID):
+			return _rows(self._papi.bibGet(bibID,**kwargs),'BibGetRows'),_rows(self._papi.bibHoldingsGet(bibID,**kwargs),'BibHoldingsGetRows')
+		failures = []
+		for index,bibID,rows,error in _boundedMap(fetch,(str(bibID) for bibID in bibIDs),maxWorkers,queueDepth,ordered=False):
+			if error is not None: failures.append((bibID,error))
+			else: self._store(bibID,*rows)
+		return failures
+
+	def _store(self,bibID,bibRows,holdingsRows):
+		record = {}
+		isbns = set()
+		for element in bibRows:
+			label = (element.get('Label') or '').rstrip(':')
+			if label.upper().startswith('ISBN'):
+				isbn = normaliseISBN(element.get('Value'))
+				if isbn: isbns.add(isbn)
+			record.setdefault(label,element.get('Value'))
+		items = []
+		for holding in holdingsRows:
+			collectionID = holding.get('CollectionID')
+			if collectionID is None: collectionID = self._collections.get(holding.get('CollectionName'))
+			items.append((bibID,holding.get('Barcode'),holding.get('LocationID'),collectionID,1 if holding.get('CircStatus') == 'In' else 0,json.dumps(holding,separators=(',',':'))))
+		with self._lock:
+			self._write(	[('INSERT OR REPLACE INTO mirror_bibs (bibID,record,refreshed) VALUES (?,?,?)',[(bibID,json.dumps(record,separators=(',',':')),time())]),
+							('DELETE FROM mirror_isbns WHERE bibID=?',[(bibID,)]),
+							('INSERT OR IGNORE INTO mirror_isbns (isbn,bibID) VALUES (?,?)',[(isbn,bibID) for isbn in isbns]),
+							('DELETE FROM mirror_items WHERE bibID=?',[(bibID,)]),
+							('INSERT INTO mirror_items (bibID,barcode,branchID,collectionID,available,row) VALUES (?,?,?,?,?,?)',items)])
+
+	def _write(self,statements):
+		# Runs every (SQL,parameter list) pair in one transaction.
+		self._db.execute('BEGIN IMMEDIATE')
+		try:
+			for statement,parameters in statements: self._db.executemany(statement,parameters)
+			self._db.execute('COMMIT')
+		except Exception:
+			self._db.execute('ROLLBACK')
+			raise
+
+	def _query(self,statement,parameters=()):
+		with self._lock:
+			return self._db.execute(statement,parameters).fetchall()
+
+	def _item(self,bibID,branchID,row):
+		item = json.loads(row)
+		item['bibID'] = bibID
+		item['branch'] = self._branches.get(branchID,item.get('LocationName'))
+		return item
+
+	def _branchID(self,branch):
+		# Branches may be given by ID or by name.
+		if isinstance(branch,int): return branch
+		for branchID,name in self._branches.items():
+			if name == branch: return branchID
+		return int(branch) if str(branch).isdigit() else None
+
+	def bib(self,bibID):
+		'''
+			Returns the stored bib record as a dictionary of its labels
+			(Title, Author, ISBN, ...) and values, or None.
+		'''
+		rows = self._query('SELECT record FROM mirror_bibs WHERE bibID=?',(str(bibID),))
+		return json.loads(rows[0][0]) if rows else None
+
+	def holdings(self,bibID):
+		'''
+			Returns the stored holdings rows of bibID, each with its bibID
+			and branch name added.
+		'''
+		return [self._item(*row) for row in self._query('SELECT bibID,branchID,row FROM mirror_items WHERE bibID=?',(str(bibID),))]
+
+	def bibsByISBN(self,isbn):
+		'''
+			Returns the bibIDs with the ISBN, given in either its 10 or 13
+			digit form, with or without hyphens.
+		'''
+		return [row[0] for row in self._query('SELECT bibID FROM mirror_isbns WHERE isbn=?',(normaliseISBN(isbn),))]
+
+	def itemByBarcode(self,barcode):
+		'''
+			Returns the holdings row of the item with barcode, or None.
+		'''
+		rows = self._query('SELECT bibID,branchID,row FROM mirror_items WHERE barcode=?',(barcode,))
+		return self._item(*rows[0]) if rows else None
+
+	def itemsByCollection(self,collection,branch=None):
+		'''
+			Returns the holdings rows of the collection (its ID or name),
+			optionally only those at branch (its ID or name).
+		'''
+		collectionID = self._collections.get(collection,collection)
+		if branch is None: rows = self._query('SELECT bibID,branchID,row FROM mirror_items WHERE collectionID=?',(collectionID,))
+		else: rows = self._query('SELECT bibID,branchID,row FROM mirror_items WHERE collectionID=? AND branchID=?',(collectionID,self._branchID(branch)))
+		return [self._item(*row) for row in rows]
+
+	def itemsAtBranch(self,branch,available=False):
+		'''
+			Returns the holdings rows at branch (its ID or name), only those
+			checked in if available is True.
+		'''
+		statement = 'SELECT bibID,branchID,row FROM mirror_items WHERE branchID=?'+(' AND available=1' if available else '')
+		return [self._item(*row) for row in self._query(statement,(self._branchID(branch),))]
+
+	def availability(self,bibID):
+		'''
+			Returns, per branch name, the total number of items of bibID and
+			the number of them checked in.
+		'''
+		summary = {}
+		for branchID,total,available in self._query('SELECT branchID,COUNT(*),SUM(available) FROM mirror_items WHERE bibID=? GROUP BY branchID',(str(bibID),)):
+			summary[self._branches.get(branchID,str(branchID))] = {'total':total,'available':available}
+		return summary
+
+	def refreshedAt(self,bibID):
+		'''
+			Returns when bibID was last refreshed, in seconds since the Epoch,
+			or None if it is not in the mirror.
+		'''
+		rows = self._query('SELECT refreshed FROM mirror_bibs WHERE bibID=?',(str(bibID),))
+		return rows[0][0] if rows else None
+
+	def stale(self,maxAge,limit=None):
+		'''
+			Returns the bibIDs last refreshed more than maxAge seconds ago,
+			the least recently refreshed first.
+		'''
+		return [row[0] for row in self._query('SELECT bibID FROM mirror_bibs WHERE refreshed<? ORDER BY refreshed LIMIT ?',(time()-maxAge,-1 if limit is None else limit))]
+
+def _rows(response,rowsKey):
+	return _body(response).get(rowsKey) or []
+
+def normaliseISBN(value):
+	'''
+		Returns the 13 digit form of the first ISBN in value (such as
+		'0-316-76948-7 (pbk.)'), or None if there is none.
+	'''
+	match = re.search(r'\d[\d-]{8,15}[\dXx]',value or '')
+	if match is None: return None
+	isbn = re.sub(r'[^\dXx]','',match.group(0)).upper()
+	if len(isbn) == 10:
+		isbn = '978'+isbn[:9]
+		isbn += str((10-sum(int(digit)*(3 if position%2 else 1) for position,digit in enumerate(isbn))%10)%10)
+	return isbn if len(isbn) == 13 else None
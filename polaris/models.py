@@ -0,0 +1,132 @@
+from collections import namedtuple
+from .client import PAPIError
+
+# The key under which each PAPI method returns its rows.
+rowsKeys = {	'bibGet':'BibGetRows',
+				'bibHoldingsGet':'BibHoldingsGetRows',
+				'bibSearch':'BibSearchRows',
+				'headingSearch':'HeadingsSearchRows',
+				'collectionsGet':'CollectionsRows',
+				'limitFiltersGet':'LimitFiltersRows',
+				'organizationsGet':'OrganizationsGetRows',
+				'sortOptionsGet':'SortOptionsRows',
+				'patronAccountGet':'PatronAccountGetRows',
+				'patronHoldRequestsGet':'PatronHoldRequestsGetRows',
+				'patronItemsOutGet':'PatronItemsOutGetRows',
+				'patronMessagesGet':'PatronMessagesGetRows',
+				'patronReadingHistoryGet':'PatronReadingHistoryGetRows',
+				'patronSavedSearchesGet':'PatronSavedSearchesGetRows',
+				'patronSearch':'PatronSearchRows',
+				'synchItemsByBibIDGet':'ItemGetRows'}
+
+_rowTypes = {}
+
+def rowType(rowsKey,fields):
+	'''
+		Returns the row class (a namedtuple, so without a per-row __dict__)
+		for rows of rowsKey having exactly the given fields in that order.
+		Classes are created once and shared by every Result.
+	'''
+	cacheKey = (rowsKey,fields)
+	cls = _rowTypes.get(cacheKey)
+	if cls is None:
+		name = rowsKey[:-1] if rowsKey.endswith('Rows') else rowsKey
+		cls = _rowTypes[cacheKey] = namedtuple(name,fields,rename=True)
+	return cls
+
+def compactRows(rowsKey,rows):
+	'''
+		Converts a list of row dictionaries as decoded from PAPI JSON into a
+		tuple of row tuples.
+	'''
+	compact = []
+	fields = cls = None
+	for row in rows:
+		rowFields = tuple(row)
+		if rowFields != fields:
+			fields = rowFields
+			cls = rowType(rowsKey,fields)
+		compact.append(cls._make(row.values()))
+	return tuple(compact)
+
+class Result(object):
+	'''
+	The result of a PAPI method call, returned instead of the Response when
+	the method is called with the keyword argument model=True.
+
+	Example usage:
+
+	>>> result = papi.patronItemsOutGet('21234000123456','1234','all',model=True)
+	>>> result.errorCode
+	3
+	>>> for item in result: print(item.Title,item.DueDate)
+	>>> result.response.status_code
+	200
+
+	Nothing is decoded until an attribute other than response is first
+	read. The rows of methods returning a row collection (see rowsKeys) are
+	then converted to compact namedtuples whose attributes are the field
+	names used by Polaris, and the decoded dictionaries are dropped. body
+	holds the rest of the decoded JSON, without the rows.
+	'''
+
+	__slots__ = ('endpoint','response','_body','_rows')
+
+	def __init__(self,endpoint,response):
+		self.endpoint = endpoint
+		self.response = response
+		self._body = None
+		self._rows = ()
+
+	def _decode(self):
+		body = self.response.json()
+		rowsKey = rowsKeys.get(self.endpoint)
+		if isinstance(body,dict) and rowsKey in body:
+			self._rows = compactRows(rowsKey,body.pop(rowsKey) or ())
+		self._body = body
+		return body
+
+	@property
+	def body(self):
+		return self._decode() if self._body is None else self._body
+
+	@property
+	def rows(self):
+		if self._body is None: self._decode()
+		return self._rows
+
+	@property
+	def errorCode(self):
+		return int(self.body.get('PAPIErrorCode',0))
+
+	@property
+	def errorMessage(self):
+		return self.body.get('ErrorMessage') or ''
+
+	@property
+	def totalRecordsFound(self):
+		return self.body.get('TotalRecordsFound')
+
+	@property
+	def ok(self):
+		return self.response.status_code == 200 and self.errorCode >= 0
+
+	def raiseForError(self):
+		'''
+			Raises the requests HTTPError for an HTTP error status and
+			PAPIError for a negative PAPIErrorCode.
+		'''
+		self.response.raise_for_status()
+		if self.errorCode < 0: raise PAPIError(self.errorCode,self.errorMessage)
+
+	def __iter__(self):
+		return iter(self.rows)
+
+	def __len__(self):
+		return len(self.rows)
+
+	def __getitem__(self,index):
+		return self.rows[index]
+
+	def __repr__(self):
+		return '<Result {endpoint} [{status}]>'.format(endpoint=self.endpoint,status=self.response.status_code)
@@ -0,0 +1,169 @@
+import sqlite3
+import threading
+from time import time
+from .client import AdmissionTimeout
+
+class RateLimiter(object):
+	'''
+	A client-side rate limiter for polaris.PAPI
+
+	Example usage:
+
+	>>> import polaris.ratelimit
+	>>> limiter = polaris.ratelimit.RateLimiter(rate=20,burst=40,familyRates={'bib':10,'patron':(5,10)})
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',rateLimiter=limiter)
+
+	Requests are limited by token buckets: a bucket holds at most burst
+	tokens, refills at rate tokens per second, and every request sent to
+	Polaris (including each retry, but not responses answered from a cache
+	or by an identical request in flight) takes one token, waiting for it
+	if need be. rate limits all requests together; familyRates maps
+	endpoint families (the first segment of the PAPI URI: bib, patron,
+	holdrequest, synch, ...) to further limits of their own, given as a
+	rate or a (rate,burst) tuple. burst defaults to rate.
+
+	Every call may pass the keyword argument priority, naming one of lanes
+	(highest first). Calls default to the first lane, 'interactive', while
+	the batch helpers (bibGetMany and the like) default to 'batch'. A call
+	waiting for a bucket is always served before calls of lower lanes
+	waiting for the same bucket, so interactive patron requests go ahead of
+	a running bulk job. Lanes other than the first may moreover never take
+	the last reserve tokens of a bucket, which keeps headroom for
+	interactive calls made by other processes sharing the buckets. Calls
+	whose priority is not one of lanes are served in the last, lowest lane.
+
+	By default the buckets live in memory and limit a single process. Pass
+	store=SqliteBuckets(path) to have every process on a host using the
+	same file share one budget:
+
+	>>> limiter = polaris.ratelimit.RateLimiter(rate=20,store=polaris.ratelimit.SqliteBuckets('/var/tmp/papi-buckets.sqlite'),reserve=2)
+
+	A call whose deadline would pass while waiting for a token raises
+	polaris.client.AdmissionTimeout (a DeadlineExceeded) straight away; a
+	RetryPolicy neither retries it nor counts it as a failure. Tokens are
+	taken before waiting for a slot of any scheduler, so calls waiting for
+	a token do not keep others from being sent.
+	'''
+
+	def __init__(self,rate=None,burst=None,familyRates=None,lanes=('interactive','batch'),reserve=0,store=None):
+		self._global = _bucket('*',rate,burst) if rate else None
+		self._families = dict((family,_bucket(family,*(limit if isinstance(limit,tuple) else (limit,)))) for family,limit in (familyRates or {}).items())
+		self.lanes = tuple(lanes)
+		self._reserve = reserve
+		self._store = store if store is not None else MemoryBuckets()
+		self._cond = threading.Condition()
+		self._waiting = [dict() for lane in self.lanes]
+
+	def _buckets(self,family):
+		buckets = []
+		if self._global is not None: buckets.append(self._global)
+		if family in self._families: buckets.append(self._families[family])
+		return buckets
+
+	def _lane(self,priority):
+		# The index of the lane of priority; a priority which is not one of
+		# lanes (such as an extra class of a Scheduler) goes in the lowest.
+		if priority is None: return 0
+		if priority in self.lanes: return self.lanes.index(priority)
+		return len(self.lanes)-1
+
+	def _preempted(self,lane,buckets):
+		# True if a call of a higher lane is waiting for any of buckets.
+		return any(waiting.get(bucket[0]) for waiting in self._waiting[:lane] for bucket in buckets)
+
+	def acquire(self,family=None,priority=None,deadlineAt=None):
+		'''
+			Waits until a request of the endpoint family may be sent in the
+			lane priority, and takes its tokens. Raises AdmissionTimeout if
+			that would be after deadlineAt (in seconds since the Epoch).
+		'''
+		buckets = self._buckets(family)
+		if not buckets: return
+		lane = self._lane(priority)
+		waiting = self._waiting[lane]
+		with self._cond:
+			for bucket in buckets: waiting[bucket[0]] = waiting.get(bucket[0],0)+1
+			try:
+				while True:
+					wait = None
+					if not self._preempted(lane,buckets):
+						wait = self._store.take(buckets,self._reserve if lane else 0)
+						if not wait: return
+					if deadlineAt is not None:
+						remaining = deadlineAt-time()
+						if remaining <= 0 or (wait is not None and wait > remaining):
+							raise AdmissionTimeout('deadline exceeded waiting for the rate limit of {family}'.format(family=family or 'all requests'))
+						if wait is None: wait = remaining
+					self._cond.wait(wait)
+			finally:
+				for bucket in buckets: waiting[bucket[0]] -= 1
+				self._cond.notify_all()
+
+def _bucket(name,rate,burst=None):
+	return (name,float(rate),float(burst or max(rate,1)))
+
+def _refill(tokens,updated,rate,burst,now):
+	return min(burst,tokens+(now-updated)*rate)
+
+def _take(state,buckets,reserve,now):
+	# Takes a token from every one of buckets if each holds more than
+	# reserve; state maps bucket names to (tokens,updated). Returns the new
+	# state of the buckets, or the number of seconds to wait instead.
+	levels = []
+	wait = 0
+	for name,rate,burst in buckets:
+		tokens,updated = state.get(name,(burst,now))
+		tokens = _refill(tokens,updated,rate,burst,now)
+		needed = 1+min(reserve,burst-1)
+		if tokens < needed: wait = max(wait,(needed-tokens)/rate)
+		levels.append((name,tokens))
+	if wait: return wait
+	return dict((name,(tokens-1,now)) for name,tokens in levels)
+
+class MemoryBuckets(object):
+	'''
+	In-process storage for the token buckets of a RateLimiter.
+	'''
+
+	def __init__(self):
+		self._state = {}
+		self._lock = threading.Lock()
+
+	def take(self,buckets,reserve=0):
+		with self._lock:
+			taken = _take(self._state,buckets,reserve,time())
+			if isinstance(taken,dict):
+				self._state.update(taken)
+				return 0
+			return taken
+
+class SqliteBuckets(object):
+	'''
+	On-disk storage for the token buckets of a RateLimiter, shared by every
+	process using the same path. Each take is a single write transaction,
+	so concurrent processes never spend the same token twice.
+
+	Example:
+	>>> limiter = polaris.ratelimit.RateLimiter(rate=20,store=polaris.ratelimit.SqliteBuckets('/var/tmp/papi-buckets.sqlite'))
+	'''
+
+	def __init__(self,path):
+		self._lock = threading.Lock()
+		self._db = sqlite3.connect(path,timeout=30,isolation_level=None,check_same_thread=False)
+		self._db.execute('PRAGMA journal_mode=WAL')
+		self._db.execute('CREATE TABLE IF NOT EXISTS papi_buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)')
+
+	def take(self,buckets,reserve=0):
+		with self._lock:
+			self._db.execute('BEGIN IMMEDIATE')
+			try:
+				names = [bucket[0] for bucket in buckets]
+				rows = self._db.execute('SELECT name,tokens,updated FROM papi_buckets WHERE name IN ({0})'.format(','.join('?'*len(names))),names).fetchall()
+				taken = _take(dict((name,(tokens,updated)) for name,tokens,updated in rows),buckets,reserve,time())
+				if isinstance(taken,dict):
+					self._db.executemany('INSERT OR REPLACE INTO papi_buckets (name,tokens,updated) VALUES (?,?,?)',[(name,tokens,updated) for name,(tokens,updated) in taken.items()])
+				self._db.execute('COMMIT')
+			except Exception:
+				self._db.execute('ROLLBACK')
+				raise
+			return 0 if isinstance(taken,dict) else taken
@@ -0,0 +1,241 @@
+from collections import namedtuple
+import io
+import json
+import re
+import threading
+from time import sleep, time
+import requests
+from .client import _boundedMap, _endpoints
+
+Call = namedtuple('Call',['offset','endpoint','fields','params','data','version','langID','appID','orgID'])
+
+_redacted = '[redacted]'
+_secretKey = re.compile(r'password|secret|accesstoken',re.I)
+
+def _templateRegex(endpoint):
+	# Matches the URI path of a call of endpoint after its version, langID,
+	# appID and orgID, capturing the fields of its template.
+	parts = re.split(r'\{(\w+)\}',endpoint.template)
+	pattern = ''.join(re.escape(part) if index%2 == 0 else '(?P<{0}>[^/]+)'.format(part) for index,part in enumerate(parts))
+	return re.compile('^'+pattern+'$')
+
+# The most specific templates (those with the most literal characters)
+# are tried first, so bib/{bibID}/holdings wins over a shorter match.
+_templates = sorted(((endpoint,_templateRegex(endpoint)) for endpoint in _endpoints.values()),key=lambda pair: -len(re.sub(r'\{\w+\}','',pair[0].template)))
+_path = re.compile(r'^\w+://[^/]+/PAPIService/REST/(public|protected)/([^/]+/[^/]+/[^/]+/[^/]+)/([^?]*)(?:\?(.*))?$')
+
+def _identify(HTTPMethod,URL):
+	# Returns the endpoint of a request and its fields (with any access
+	# token redacted), or (None,None).
+	match = _path.match(URL)
+	if match is None: return None,None
+	protection,root,suffix,query = match.groups()
+	for endpoint,regex in _templates:
+		if endpoint.HTTPMethod != HTTPMethod or endpoint.protection != protection: continue
+		fields = regex.match(suffix)
+		if fields is None: continue
+		fields = fields.groupdict()
+		if 'accessToken' in fields: fields['accessToken'] = _redacted
+		return endpoint,fields
+	return None,None
+
+def _key(HTTPMethod,URL):
+	# What a request is matched on in replay: its method and URI without
+	# the host, with the access token of a protected method redacted.
+	match = _path.match(URL)
+	if match is None: return (HTTPMethod,URL)
+	protection,root,suffix,query = match.groups()
+	endpoint,fields = _identify(HTTPMethod,URL)
+	if endpoint is not None: suffix = endpoint.suffixURI(fields)
+	return (HTTPMethod,'{0}/{1}/{2}'.format(protection,root,suffix)+('?'+query if query else ''))
+
+def _redact(value):
+	# Replaces the values of password, secret and access token fields.
+	if isinstance(value,dict): return dict((key,_redacted if _secretKey.search(key) and value[key] else _redact(value[key])) for key in value)
+	if isinstance(value,list): return [_redact(item) for item in value]
+	return value
+
+class ReplayMiss(requests.exceptions.RequestException):
+	'''
+	Raised by a Replayer for a request which is not in its log.
+	'''
+
+class Recorder(object):
+	'''
+	A transport for polaris.PAPI which records its traffic for replay
+
+	Example usage:
+
+	>>> import polaris.replay
+	>>> recorder = polaris.replay.Recorder('/var/tmp/papi-traffic.jsonl')
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',transport=recorder)
+	>>> ...
+	>>> recorder.close()
+
+	Every request is sent with transport (by default a requests Session)
+	and logged as one line of JSON: when it was sent, relative to the
+	first, the PAPI method (found from the URI), its URI without the host,
+	the time until the whole response was received, and the status,
+	content type and body of the response.
+
+	Nothing that could authenticate as a patron or staff member is logged:
+	the Authorization and Date headers (the signature of the patron
+	password or access secret) and the X-PAPI-AccessToken header are
+	dropped, the access token in the URI of protected methods is replaced
+	by [redacted], and so are the values of every field of a JSON request
+	or response body whose name contains password, secret or accesstoken
+	(the Password of authenticateStaffUser, the AccessToken and
+	AccessSecret it returns, ...). Patron barcodes and the rest of the
+	data are logged as they are: keep the log as private as the
+	Polaris data itself.
+
+	A streamed response is read whole before it is returned.
+	'''
+
+	def __init__(self,path,transport=None):
+		self._transport = transport if transport is not None else requests.Session()
+		self._file = open(path,'a')
+		self._lock = threading.Lock()
+		self._started = None
+
+	def send(self,preparedRequest,timeout=None,stream=False):
+		started = time()
+		response = self._transport.send(preparedRequest,timeout=timeout,stream=stream)
+		content = response.content
+		latency = time()-started
+		endpoint,fields = _identify(preparedRequest.method,preparedRequest.url)
+		entry = {	'offset':None,
+					'method':preparedRequest.method,
+					'endpoint':endpoint.name if endpoint is not None else None,
+					'uri':_key(preparedRequest.method,preparedRequest.url)[1],
+					'latency':round(latency,6),
+					'status':response.status_code,
+					'type':response.headers.get('Content-Type')}
+		data = _json(preparedRequest.body)
+		if data: entry['data'] = _redact(data)
+		body = _json(content)
+		if body is not None: entry['body'] = _redact(body)
+		else: entry['text'] = content.decode(response.encoding or 'utf-8','replace')
+		with self._lock:
+			if self._started is None: self._started = started
+			entry['offset'] = round(started-self._started,6)
+			self._file.write(json.dumps(entry,separators=(',',':'))+'\n')
+			self._file.flush()
+		return response
+
+	def close(self):
+		with self._lock: self._file.close()
+
+class Replayer(object):
+	'''
+	A transport for polaris.PAPI which answers requests from a Recorder log
+
+	Example usage:
+
+	>>> import polaris.replay
+	>>> replayer = polaris.replay.Replayer('/var/tmp/papi-traffic.jsonl',timeScale=0.1)
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','localhost',transport=replayer,cache=polaris.cache.ResponseCache(ttls={'bibGet':3600}))
+	>>> replayer.drive(papi,maxWorkers=32)
+	{'calls': 18234, 'failed': 0, 'seconds': 361.8, 'perSecond': 50.4}
+
+	Requests are matched on their method and URI (without the host, and
+	with the access token of protected methods disregarded), so the
+	hostname and credentials of the PAPI replaying do not matter and no
+	signature is checked. A request recorded several times is answered with
+	each of its recorded responses in turn, starting again after the last;
+	one never recorded raises ReplayMiss.
+
+	With latency=True, each response is returned only after its recorded
+	latency multiplied by timeScale, so the wrapper and any middleware see
+	the timing of the live server: timeScale=0.1 replays ten times as
+	fast, timeScale=0 as fast as possible.
+
+	drive re-issues every recorded call through the methods of papi (with
+	their caching, coalescing, scheduling and instrumentation) at its
+	recorded offset multiplied by timeScale, maxWorkers at a time, making
+	runs reproducible for comparing throughput and caching changes.
+	'''
+
+	def __init__(self,path,timeScale=1.0,latency=True):
+		self.timeScale = timeScale
+		self._latency = latency
+		self._entries = []
+		self._responses = {}
+		self._served = {}
+		self._lock = threading.Lock()
+		with open(path) as file:
+			for line in file:
+				if not line.strip(): continue
+				entry = json.loads(line)
+				self._entries.append(entry)
+				self._responses.setdefault((entry['method'],entry['uri']),[]).append(entry)
+		self._entries.sort(key=lambda entry: entry['offset'])
+
+	def send(self,preparedRequest,timeout=None,stream=False):
+		key = _key(preparedRequest.method,preparedRequest.url)
+		entries = self._responses.get(key)
+		if not entries: raise ReplayMiss('no recorded response for {0} {1}'.format(*key),request=preparedRequest)
+		with self._lock:
+			served = self._served.get(key,0)
+			self._served[key] = served+1
+		entry = entries[served%len(entries)]
+		if self._latency and self.timeScale: sleep(entry['latency']*self.timeScale)
+		response = requests.Response()
+		response.status_code = entry['status']
+		response.url = preparedRequest.url
+		response.request = preparedRequest
+		response.encoding = 'utf-8'
+		if entry.get('type'): response.headers['Content-Type'] = entry['type']
+		content = json.dumps(entry['body']).encode('utf-8') if 'body' in entry else entry.get('text','').encode('utf-8')
+		response.headers['Content-Length'] = str(len(content))
+		# A streamed response is read from raw as it would be from the
+		# connection.
+		response.raw = io.BytesIO(content)
+		if not stream:
+			response._content = content
+			response._content_consumed = True
+		return response
+
+	def calls(self):
+		'''
+			Returns the recorded calls of PAPI methods, in the order they
+			were sent, as Call(offset,endpoint,fields,params,data,version,
+			langID,appID,orgID).
+		'''
+		calls = []
+		for entry in self._entries:
+			if entry['endpoint'] is None: continue
+			endpoint,fields = _identify(entry['method'],'http://replay/PAPIService/REST/'+entry['uri'])
+			uri,query = (entry['uri'].split('?',1)+[''])[:2]
+			params = dict(pair.split('=',1) for pair in query.split('&') if '=' in pair)
+			version,langID,appID,orgID = _path.match('http://replay/PAPIService/REST/'+entry['uri']).group(2).split('/')
+			calls.append(Call(entry['offset'],entry['endpoint'],fields,params,entry.get('data'),version,langID,appID,orgID))
+		return calls
+
+	def drive(self,papi,maxWorkers=8,queueDepth=32,**kwargs):
+		'''
+			Re-issues every recorded call through papi, each at its recorded
+			offset multiplied by timeScale, and returns the number of calls
+			made and failed, the seconds taken and the calls per second.
+			Further keyword arguments are passed on to every call.
+		'''
+		started = time()
+		def call(recorded):
+			delay = started+recorded.offset*self.timeScale-time()
+			if delay > 0: sleep(delay)
+			callKwargs = dict(kwargs,version=recorded.version,langID=recorded.langID,appID=recorded.appID,orgID=recorded.orgID)
+			if recorded.params: callKwargs['params'] = recorded.params
+			if recorded.data is not None: callKwargs['data'] = recorded.data
+			return papi._call(recorded.endpoint,recorded.fields,**callKwargs)
+		calls = failed = 0
+		for index,recorded,response,error in _boundedMap(call,self.calls(),maxWorkers,queueDepth,ordered=False):
+			calls += 1
+			if error is not None: failed += 1
+		seconds = time()-started
+		return {'calls':calls,'failed':failed,'seconds':seconds,'perSecond':calls/seconds if seconds else 0.0}
+
+def _json(content):
+	# The decoded JSON of a request or response body, or None.
+	if not content: return None
+	try: return json.loads(content.decode('utf-8') if isinstance(content,bytes) else content)
+	except ValueError: return None
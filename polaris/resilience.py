@@ -0,0 +1,165 @@
+import random
+import threading
+from time import sleep, time
+import requests
+from .client import DeadlineExceeded, NotAdmitted, _cappedTimeout
+
+class CircuitOpenError(requests.exceptions.RequestException):
+	'''
+	Raised instead of sending a request while the circuit breaker of its
+	endpoint family is open.
+	'''
+
+class RetryPolicy(object):
+	'''
+	Retry, backoff and circuit breaker policy for polaris.PAPI
+
+	Example usage:
+
+	>>> import polaris.resilience
+	>>> policy = polaris.resilience.RetryPolicy(retries=3,backoff=0.2,deadline=10)
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',retryPolicy=policy)
+
+	A request is retried when it fails to connect, times out or is answered
+	with one of retryStatuses, but only if its HTTP method is one of
+	retryMethods. By default that is GET alone: Polaris PUTs such as
+	itemRenew or holdRequestReply are not safe to repeat. Attempt n (from 0)
+	waits a random time of up to min(maxBackoff,backoff*2**n) seconds first
+	(exponential backoff with full jitter). PAPI signs every attempt anew.
+
+	deadline, if given, is the default number of seconds a call may take in
+	total; individual calls can set their own with the deadline keyword
+	argument. No attempt or backoff extends past it.
+
+	Each endpoint family (bib, patron, holdrequest, synch, ...) has its own
+	CircuitBreaker which opens after failureThreshold consecutive failures.
+	While open, calls of that family raise CircuitOpenError without being
+	sent. After resetTimeout seconds a single trial request is let through
+	and its outcome closes or reopens the breaker. Errors other than
+	failing to connect or timing out are raised at once, without retrying,
+	and count as failures, except polaris.NotAdmitted (QueueFull, and an
+	AdmissionTimeout waiting for a scheduler or rate limiter), which is
+	raised without counting at all.
+	'''
+
+	def __init__(self,retries=3,backoff=0.1,maxBackoff=5.0,deadline=None,retryMethods=('GET',),retryStatuses=(502,503,504),failureThreshold=5,resetTimeout=30.0):
+		self.retries = retries
+		self.backoff = backoff
+		self.maxBackoff = maxBackoff
+		self.deadline = deadline
+		self.retryMethods = retryMethods
+		self.retryStatuses = retryStatuses
+		self._failureThreshold = failureThreshold
+		self._resetTimeout = resetTimeout
+		self._breakers = {}
+		self._lock = threading.Lock()
+
+	def breaker(self,family):
+		'''
+			Returns the CircuitBreaker of the endpoint family.
+		'''
+		with self._lock:
+			breaker = self._breakers.get(family)
+			if breaker is None:
+				breaker = self._breakers[family] = CircuitBreaker(self._failureThreshold,self._resetTimeout)
+			return breaker
+
+	def breakerStates(self):
+		'''
+			Returns the state ('closed', 'open' or 'half-open') of the
+			circuit breaker of every endpoint family used so far.
+
+			Example:
+			>>> policy.breakerStates()
+			{'bib': 'closed', 'patron': 'open'}
+		'''
+		with self._lock:
+			return dict((family,breaker.state) for family,breaker in self._breakers.items())
+
+	def call(self,family,HTTPMethod,attempt,timeout=None,deadlineAt=None):
+		'''
+			Runs attempt(timeout), which sends one freshly signed request and
+			returns its Response, according to this policy. Returns the last
+			Response received or raises the last error once retries are
+			exhausted.
+		'''
+		breaker = self.breaker(family)
+		retries = self.retries if HTTPMethod in self.retryMethods else 0
+		tries = 0
+		while True:
+			if deadlineAt is not None and time() >= deadlineAt:
+				raise DeadlineExceeded('deadline exceeded after {tries} attempts'.format(tries=tries))
+			breaker.before(family)
+			response = error = None
+			try:
+				response = attempt(_cappedTimeout(timeout,deadlineAt))
+			except NotAdmitted:
+				# Held back by a scheduler or rate limiter: nothing was sent,
+				# so there is no outcome to retry or count.
+				breaker.release()
+				raise
+			except (requests.exceptions.ConnectionError,requests.exceptions.Timeout) as e:
+				error = e
+			except Exception:
+				# Any other error (a broken chunked body, a failing
+				# instrumentation hook, ...) is not retried, but still
+				# counts, so that a half-open breaker never stays stuck
+				# waiting for the outcome of its trial.
+				breaker.failure()
+				raise
+			if response is not None and response.status_code not in self.retryStatuses:
+				breaker.success()
+				return response
+			breaker.failure()
+			delay = random.uniform(0,min(self.maxBackoff,self.backoff*2**tries))
+			if tries >= retries or (deadlineAt is not None and time()+delay >= deadlineAt):
+				if response is not None: return response
+				raise error
+			if response is not None: response.close()
+			tries += 1
+			sleep(delay)
+
+class CircuitBreaker(object):
+	'''
+	A circuit breaker: 'closed' while requests succeed, 'open' (failing fast)
+	for resetTimeout seconds after failureThreshold consecutive failures,
+	then 'half-open' until a single trial request succeeds or fails.
+	'''
+
+	def __init__(self,failureThreshold=5,resetTimeout=30.0):
+		self._failureThreshold = failureThreshold
+		self._resetTimeout = resetTimeout
+		self._lock = threading.Lock()
+		self._failures = 0
+		self._openedAt = 0
+		self._trial = False
+		self.state = 'closed'
+
+	def before(self,family=None):
+		with self._lock:
+			if self.state == 'open':
+				if time()-self._openedAt < self._resetTimeout:
+					raise CircuitOpenError('circuit open for endpoint family {family}'.format(family=family))
+				self.state = 'half-open'
+			if self.state == 'half-open':
+				if self._trial: raise CircuitOpenError('circuit half-open for endpoint family {family}'.format(family=family))
+				self._trial = True
+
+	def success(self):
+		with self._lock:
+			self._failures = 0
+			self._trial = False
+			self.state = 'closed'
+
+	def release(self):
+		# Ends a trial request which was never sent, leaving the breaker
+		# half-open for the next one.
+		with self._lock: self._trial = False
+
+	def failure(self):
+		with self._lock:
+			self._failures += 1
+			self._trial = False
+			if self.state == 'half-open' or self._failures >= self._failureThreshold:
+				self.state = 'open'
+				self._openedAt = time()
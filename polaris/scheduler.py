@@ -0,0 +1,209 @@
+from collections import deque
+import threading
+from time import time
+from .client import AdmissionTimeout, NotAdmitted
+
+class QueueFull(NotAdmitted):
+	'''
+	Raised instead of queueing a request when the queue of its priority
+	class is full.
+	'''
+
+class Scheduler(object):
+	'''
+	A priority request scheduler for polaris.PAPI
+
+	Example usage:
+
+	>>> import polaris.scheduler
+	>>> scheduler = polaris.scheduler.Scheduler(maxConcurrency=12,concurrency={'batch':6},maxQueue={'batch':5000},maxWait={'interactive':2})
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',scheduler=scheduler,poolSize=12)
+	>>> print(scheduler.prometheus())
+	# HELP papi_scheduler_queue_depth Requests waiting to be sent, by priority class.
+	# TYPE papi_scheduler_queue_depth gauge
+	papi_scheduler_queue_depth{class="batch"} 4210
+	...
+
+	At most maxConcurrency requests are sent to Polaris at once. Every
+	call may pass the keyword argument priority, naming one of classes:
+	calls default to the first, 'interactive', while the batch helpers
+	(bibGetMany and the like) and the bulk engines default to 'batch'.
+	Requests beyond the limit wait in a queue per class. Whenever a request
+	completes, the next one is taken from the queues in proportion to the
+	weights of the classes (by default 8 interactive requests for every
+	batch one while both are waiting), so interactive calls never wait
+	behind the whole backlog of a running sweep, yet the sweep is never
+	starved. concurrency caps the requests of a class in flight at once,
+	keeping slots free for the others even before they queue. Requests
+	whose priority is not one of classes are queued in the last, lowest.
+
+	Admission is controlled per class: a request finding maxQueue requests
+	of its class already waiting raises QueueFull at once, and one which
+	has waited maxWait seconds, or would wait past the deadline of its
+	call, raises polaris.client.AdmissionTimeout (a DeadlineExceeded).
+	Neither is retried or counted against the circuit breakers of a
+	RetryPolicy, since the request never reached Polaris. weights,
+	concurrency, maxQueue and maxWait map class names to their values;
+	classes without an entry have weight 1 and no further limits.
+
+	Every attempt sent to Polaris, including each retry, takes a slot for
+	as long as it waits for its response (a streamed response frees its
+	slot once its headers arrive). Responses answered from a cache or by an
+	identical request in flight do not queue. Queue depths, requests in
+	flight, outcomes and queue waits per class are read with stats() or, in
+	the Prometheus text format, with prometheus().
+	'''
+
+	defaultWeights = {'interactive':8,'batch':1}
+	waitBuckets = (0.001,0.005,0.01,0.025,0.05,0.1,0.25,0.5,1.0,2.5,5.0,10.0,30.0)
+
+	def __init__(self,maxConcurrency=10,classes=('interactive','batch'),weights=None,concurrency=None,maxQueue=None,maxWait=None):
+		self.maxConcurrency = maxConcurrency
+		self.classes = tuple(classes)
+		weights = dict(self.defaultWeights,**(weights or {}))
+		self._classes = dict((name,_Class(name,weights.get(name,1),(concurrency or {}).get(name),(maxQueue or {}).get(name),(maxWait or {}).get(name),len(self.waitBuckets))) for name in self.classes)
+		self._lock = threading.Lock()
+		self._inFlight = 0
+		self._virtual = 0.0
+
+	def run(self,priority,deadlineAt,func):
+		'''
+			Calls func once a slot is free for the class priority and returns
+			its result. Raises QueueFull or AdmissionTimeout if the request is
+			not admitted, AdmissionTimeout once deadlineAt (in seconds since
+			the Epoch) has passed.
+		'''
+		cls = self._classes[self._class(priority)]
+		self._admit(cls,deadlineAt)
+		try: return func()
+		finally: self._release(cls)
+
+	def _class(self,priority):
+		# The name of the class of priority; a priority which is not one of
+		# classes (such as the 'batch' of the bulk engines, when classes
+		# names it otherwise) goes in the last, lowest class.
+		if priority is None: return self.classes[0]
+		if priority in self._classes: return priority
+		return self.classes[-1]
+
+	def _admit(self,cls,deadlineAt):
+		now = time()
+		with self._lock:
+			if not cls.queue and self._inFlight < self.maxConcurrency and cls.free():
+				self._start(cls,0.0)
+				return
+			if cls.maxQueue is not None and len(cls.queue) >= cls.maxQueue:
+				cls.rejected += 1
+				raise QueueFull('the queue of {name} requests is full'.format(name=cls.name))
+			if not cls.queue: cls.finish = max(cls.finish,self._virtual)
+			waiter = _Waiter(now)
+			cls.queue.append(waiter)
+		endAt = now+cls.maxWait if cls.maxWait is not None else None
+		if deadlineAt is not None and (endAt is None or deadlineAt < endAt): endAt = deadlineAt
+		waiter.event.wait(None if endAt is None else max(endAt-time(),0))
+		with self._lock:
+			if waiter.admitted: return
+			cls.queue.remove(waiter)
+			cls.expired += 1
+			# The waiter may have been the only thing keeping another class
+			# from being served.
+			self._dispatch()
+		raise AdmissionTimeout('deadline exceeded after {seconds:.3f}s in the queue of {name} requests'.format(seconds=time()-now,name=cls.name))
+
+	def _start(self,cls,waited):
+		self._inFlight += 1
+		cls.inFlight += 1
+		cls.admitted += 1
+		cls.waitSum += waited
+		cls.waitMax = max(cls.waitMax,waited)
+		for index,bound in enumerate(self.waitBuckets):
+			if waited <= bound:
+				cls.waitCounts[index] += 1
+				break
+
+	def _release(self,cls):
+		with self._lock:
+			self._inFlight -= 1
+			cls.inFlight -= 1
+			self._dispatch()
+
+	def _dispatch(self):
+		# Admits waiting requests while slots are free: each time from the
+		# class, among those with a request waiting and a slot of their own
+		# left, with the earliest virtual finish time; serving a request
+		# advances the finish time of its class by 1/weight.
+		now = time()
+		while self._inFlight < self.maxConcurrency:
+			ready = [cls for cls in self._classes.values() if cls.queue and cls.free()]
+			if not ready: return
+			cls = min(ready,key=lambda cls: (cls.finish,self.classes.index(cls.name)))
+			self._virtual = cls.finish
+			cls.finish += 1.0/cls.weight
+			waiter = cls.queue.popleft()
+			waiter.admitted = True
+			self._start(cls,now-waiter.queued)
+			waiter.event.set()
+
+	def stats(self):
+		'''
+			Returns, per class, the number of requests queued and in flight,
+			admitted, rejected (QueueFull) and expired (AdmissionTimeout), and
+			the total and longest time admitted requests waited in the queue.
+		'''
+		with self._lock:
+			return dict((cls.name,{'queued':len(cls.queue),'inFlight':cls.inFlight,'admitted':cls.admitted,'rejected':cls.rejected,'expired':cls.expired,'waitSeconds':cls.waitSum,'waitMax':cls.waitMax}) for cls in self._classes.values())
+
+	def prometheus(self):
+		'''
+			Returns the queue metrics in the Prometheus text exposition format.
+		'''
+		with self._lock:
+			classes = [(cls.name,len(cls.queue),cls.inFlight,cls.admitted,cls.rejected,cls.expired,list(cls.waitCounts),cls.waitSum) for cls in self._classes.values()]
+		lines = ['# HELP papi_scheduler_queue_depth Requests waiting to be sent, by priority class.','# TYPE papi_scheduler_queue_depth gauge']
+		lines += ['papi_scheduler_queue_depth{{class="{0}"}} {1}'.format(name,queued) for name,queued,inFlight,admitted,rejected,expired,counts,total in classes]
+		lines += ['# HELP papi_scheduler_in_flight Requests being sent, by priority class.','# TYPE papi_scheduler_in_flight gauge']
+		lines += ['papi_scheduler_in_flight{{class="{0}"}} {1}'.format(name,inFlight) for name,queued,inFlight,admitted,rejected,expired,counts,total in classes]
+		lines += ['# HELP papi_scheduler_requests_total Requests by priority class and admission outcome.','# TYPE papi_scheduler_requests_total counter']
+		for name,queued,inFlight,admitted,rejected,expired,counts,total in classes:
+			for outcome,value in (('admitted',admitted),('rejected',rejected),('expired',expired)):
+				lines.append('papi_scheduler_requests_total{{class="{0}",outcome="{1}"}} {2}'.format(name,outcome,value))
+		lines += ['# HELP papi_scheduler_wait_seconds Seconds admitted requests waited in the queue, by priority class.','# TYPE papi_scheduler_wait_seconds histogram']
+		for name,queued,inFlight,admitted,rejected,expired,counts,total in classes:
+			cumulative = 0
+			for bound,bucketCount in zip(self.waitBuckets,counts):
+				cumulative += bucketCount
+				lines.append('papi_scheduler_wait_seconds_bucket{{class="{0}",le="{1!r}"}} {2}'.format(name,bound,cumulative))
+			lines.append('papi_scheduler_wait_seconds_bucket{{class="{0}",le="+Inf"}} {1}'.format(name,admitted))
+			lines.append('papi_scheduler_wait_seconds_sum{{class="{0}"}} {1!r}'.format(name,total))
+			lines.append('papi_scheduler_wait_seconds_count{{class="{0}"}} {1}'.format(name,admitted))
+		return '\n'.join(lines)+'\n'
+
+class _Class(object):
+	# The queue, limits and counters of a priority class.
+
+	def __init__(self,name,weight,concurrency,maxQueue,maxWait,buckets):
+		self.name = name
+		self.weight = float(weight)
+		self.concurrency = concurrency
+		self.maxQueue = maxQueue
+		self.maxWait = maxWait
+		self.queue = deque()
+		self.inFlight = 0
+		self.finish = 0.0
+		self.admitted = 0
+		self.rejected = 0
+		self.expired = 0
+		self.waitCounts = [0]*buckets
+		self.waitSum = 0.0
+		self.waitMax = 0.0
+
+	def free(self):
+		return self.concurrency is None or self.inFlight < self.concurrency
+
+class _Waiter(object):
+	__slots__ = ('event','queued','admitted')
+
+	def __init__(self,queued):
+		self.event = threading.Event()
+		self.queued = queued
+		self.admitted = False
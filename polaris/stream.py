@@ -0,0 +1,139 @@
+import codecs
+import json
+import re
+from .client import PAPIError
+from .models import rowsKeys, rowType
+
+_whitespace = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+# The characters which may continue a number, such as the fraction of a
+# number split after its integer part.
+_numberCharacters = frozenset('0123456789.eE+-')
+
+class RowStream(object):
+	'''
+	The rows of a PAPI method call, decoded while the response is received.
+	Returned instead of the Response when a method is called with the
+	keyword argument stream=True.
+
+	Example usage:
+
+	>>> for row in papi.patronReadingHistoryGet('21234000123456','1234','1','0',stream=True):
+	...	print(row['Title'])
+
+	Only one row (and one chunk of the response body) is held in memory at
+	a time, however large the response. With model=True as well, rows are
+	yielded as the compact namedtuples of polaris.models.Result.
+
+	Iteration raises the requests HTTPError for an HTTP error status and
+	PAPIError for a negative PAPIErrorCode. Once the rows have been read,
+	body holds the rest of the decoded JSON (PAPIErrorCode, ErrorMessage,
+	TotalRecordsFound, ...). A stream can be iterated only once; stopping
+	early closes the connection. With polaris.aio.AsyncPAPI the body is
+	read while iterating, so iterate on a worker thread.
+	'''
+
+	def __init__(self,endpoint,response,compact=False,chunkSize=65536):
+		self.endpoint = endpoint
+		self.response = response
+		self.body = {}
+		self._compact = compact
+		self._chunkSize = chunkSize
+
+	def __iter__(self):
+		try:
+			self.response.raise_for_status()
+			rowsKey = rowsKeys.get(self.endpoint)
+			reader = _Reader(self.response.iter_content(self._chunkSize),self.response.encoding or 'utf-8')
+			reader.expect('{')
+			if reader.peek() == '}': return
+			while True:
+				key = reader.value()
+				reader.expect(':')
+				if key == rowsKey and reader.peek() == '[':
+					self._raiseForError()
+					for row in self._rows(reader,rowsKey): yield row
+				else: self.body[key] = reader.value()
+				if reader.expect(',}') == '}': break
+			self._raiseForError()
+		finally:
+			self.response.close()
+
+	def _raiseForError(self):
+		if self.body.get('PAPIErrorCode',0) < 0:
+			raise PAPIError(self.body['PAPIErrorCode'],self.body.get('ErrorMessage',''))
+
+	def _rows(self,reader,rowsKey):
+		reader.expect('[')
+		if reader.peek() == ']':
+			reader.expect(']')
+			return
+		fields = cls = None
+		while True:
+			row = reader.value()
+			if self._compact:
+				rowFields = tuple(row)
+				if rowFields != fields:
+					fields = rowFields
+					cls = rowType(rowsKey,fields)
+				row = cls._make(row.values())
+			yield row
+			if reader.expect(',]') == ']': return
+
+class _Reader(object):
+	# An incremental reader of JSON text arriving in chunks.
+
+	def __init__(self,chunks,encoding):
+		self._chunks = iter(chunks)
+		self._decode = codecs.getincrementaldecoder(encoding)().decode
+		self._buffer = ''
+		self._pos = 0
+		self._eof = False
+
+	def _more(self,length):
+		# Reads until the unconsumed buffer is at least length characters
+		# long; False at the end of the body.
+		pieces = [self._buffer[self._pos:]]
+		size = len(pieces[0])
+		while size < length and not self._eof:
+			try: chunk = next(self._chunks)
+			except StopIteration:
+				self._eof = True
+				chunk = b''
+				pieces.append(self._decode(chunk,True))
+				break
+			text = self._decode(chunk)
+			pieces.append(text)
+			size += len(text)
+		self._buffer = ''.join(pieces)
+		self._pos = 0
+		return size >= length
+
+	def peek(self):
+		while True:
+			self._pos = _whitespace.match(self._buffer,self._pos).end()
+			if self._pos < len(self._buffer): return self._buffer[self._pos]
+			if not self._more(1): raise ValueError('unexpected end of JSON response')
+
+	def expect(self,characters):
+		character = self.peek()
+		if character not in characters:
+			raise ValueError('expected {expected!r} but found {character!r} in JSON response'.format(expected=characters,character=character))
+		self._pos += 1
+		return character
+
+	def value(self):
+		# A value is only accepted once the character after it has arrived
+		# and, after a number, is not one which could continue it, so that
+		# a number split across two chunks is not cut short. A failed
+		# attempt doubles the text read before the next one.
+		self.peek()
+		while True:
+			try:
+				value,end = _decoder.raw_decode(self._buffer,self._pos)
+				if self._eof or (end < len(self._buffer) and not (self._buffer[self._pos] in _numberCharacters and self._buffer[end] in _numberCharacters)):
+					self._pos = end
+					return value
+			except ValueError:
+				if self._eof: raise
+			self._more(2*(len(self._buffer)-self._pos)+1)
@@ -0,0 +1,152 @@
+from collections import namedtuple
+from hashlib import sha1
+import json
+import sqlite3
+from time import time
+from .client import _body, _boundedMap
+
+ItemChange = namedtuple('ItemChange',['bibID','itemID','kind','row'])
+
+class ItemSync(object):
+	'''
+	Incremental synchronisation of item records with synchItemsByBibIDGet
+
+	Example usage:
+
+	>>> import polaris.sync
+	>>> papi = polaris.PAPI('YOUR-POLARIS-API-ACCESS-KEY','yourapiuser','your.library.hostname',staffCredentials=('yourdomain','yourusername','yourpassword'))
+	>>> sync = polaris.sync.ItemSync(papi,'/var/lib/vendor/items.sqlite')
+	>>> sync.track(bibIDs)
+	>>> sync.track(frontlistBibIDs,priority=10)
+	>>> for change in sync.run(limit=5000,maxWorkers=16):
+	...	vendor.apply(change.kind,change.bibID,change.itemID,change.row)
+
+	The item rows last seen for every tracked bib are kept in a sqlite
+	database at path, each with a hash of its content. A run fetches the
+	items of the bibs that are due, compares them with the stored rows and
+	yields an ItemChange(bibID,itemID,kind,row) for every item inserted,
+	updated or deleted since the bib was last synchronised (kind is
+	'insert', 'update' or 'delete'; row is the new row, or the last seen
+	one for a deletion). The store is updated bib by bib, once all the
+	changes of a bib have been yielded, so a run which is stopped part way
+	loses nothing: the changes of a bib left unfinished are yielded again
+	by the next run.
+
+	A bib is due once its interval has passed since it was last
+	synchronised. The interval starts at minInterval seconds, returns to it
+	whenever the bib is found changed, and doubles, up to maxInterval,
+	whenever it is not: bibs which rarely change are rarely requested.
+	Due bibs are synchronised in order of priority (highest first) and
+	then of how long they have been due, and limit caps the bibs requested
+	by one run, so a run can be given a fixed request budget.
+
+	Items are identified by their itemKey field. Keyword arguments of run
+	are passed on to synchItemsByBibIDGet (accessToken and accessSecret
+	unless the PAPI manages staff tokens) and to the batch helper
+	(maxWorkers, queueDepth); calls default to priority='batch'.
+	'''
+
+	def __init__(self,papi,path,itemKey='ItemRecordID',minInterval=3600,maxInterval=7*86400):
+		self._papi = papi
+		self._itemKey = itemKey
+		self._minInterval = minInterval
+		self._maxInterval = maxInterval
+		self.stats = {'requested':0,'changed':0,'failed':0,'insert':0,'update':0,'delete':0}
+		self._db = sqlite3.connect(path,timeout=30,isolation_level=None,check_same_thread=False)
+		self._db.execute('PRAGMA journal_mode=WAL')
+		self._db.execute('CREATE TABLE IF NOT EXISTS sync_bibs (bibID TEXT PRIMARY KEY, priority INTEGER NOT NULL, synced REAL, changed REAL, interval REAL NOT NULL, due REAL NOT NULL)')
+		self._db.execute('CREATE INDEX IF NOT EXISTS sync_bibs_due ON sync_bibs (due)')
+		self._db.execute('CREATE TABLE IF NOT EXISTS sync_items (bibID TEXT NOT NULL, itemID TEXT NOT NULL, hash TEXT NOT NULL, row TEXT NOT NULL, PRIMARY KEY (bibID,itemID))')
+
+	def track(self,bibIDs,priority=0):
+		'''
+			Starts synchronising bibIDs, due at once, or changes the priority
+			of those already tracked.
+		'''
+		now = time()
+		self._db.execute('BEGIN IMMEDIATE')
+		for bibID in bibIDs:
+			self._db.execute('INSERT OR IGNORE INTO sync_bibs (bibID,priority,interval,due) VALUES (?,?,?,?)',(str(bibID),priority,self._minInterval,now))
+			self._db.execute('UPDATE sync_bibs SET priority=? WHERE bibID=?',(priority,str(bibID)))
+		self._db.execute('COMMIT')
+
+	def untrack(self,bibIDs):
+		'''
+			Stops synchronising bibIDs and forgets their items.
+		'''
+		self._db.execute('BEGIN IMMEDIATE')
+		for bibID in bibIDs:
+			self._db.execute('DELETE FROM sync_bibs WHERE bibID=?',(str(bibID),))
+			self._db.execute('DELETE FROM sync_items WHERE bibID=?',(str(bibID),))
+		self._db.execute('COMMIT')
+
+	def due(self,limit=None,now=None):
+		'''
+			Returns the bibIDs due for synchronisation, in the order a run
+			would request them.
+		'''
+		rows = self._db.execute('SELECT bibID FROM sync_bibs WHERE due<=? ORDER BY priority DESC, due LIMIT ?',(time() if now is None else now,-1 if limit is None else limit))
+		return [row[0] for row in rows]
+
+	def items(self,bibID):
+		'''
+			Returns the item rows last seen for bibID.
+		'''
+		return [json.loads(row[0]) for row in self._db.execute('SELECT row FROM sync_items WHERE bibID=? ORDER BY itemID',(str(bibID),))]
+
+	def run(self,limit=None,maxWorkers=8,queueDepth=32,**kwargs):
+		'''
+			Synchronises the bibs which are due, at most limit of them, and
+			yields the ItemChanges found. A bib whose items cannot be fetched
+			is counted as failed in stats and tried again in the next run.
+		'''
+		kwargs.setdefault('priority','batch')
+		def fetch(bibID):
+			return _body(self._papi.synchItemsByBibIDGet(bibID=bibID,**kwargs)).get('ItemGetRows') or []
+		for index,bibID,rows,error in _boundedMap(fetch,self.due(limit),maxWorkers,queueDepth,ordered=False):
+			self.stats['requested'] += 1
+			if error is not None:
+				self.stats['failed'] += 1
+				continue
+			changes,writes,deletes = self._diff(bibID,rows)
+			for change in changes: yield change
+			# Stored only once every change of the bib has been consumed.
+			self._apply(bibID,changes,writes,deletes)
+
+	def _diff(self,bibID,rows):
+		# Returns the changes of the items of bibID against those stored,
+		# with the rows to write and the itemIDs to delete to store them.
+		seen = dict((itemID,(hash,row)) for itemID,hash,row in self._db.execute('SELECT itemID,hash,row FROM sync_items WHERE bibID=?',(bibID,)))
+		changes = []
+		writes = []
+		for row in rows:
+			itemID = str(row.get(self._itemKey))
+			text = json.dumps(row,sort_keys=True)
+			hash = sha1(text.encode('utf-8')).hexdigest()
+			previous = seen.pop(itemID,None)
+			if previous is None: changes.append(ItemChange(bibID,itemID,'insert',row))
+			elif previous[0] != hash: changes.append(ItemChange(bibID,itemID,'update',row))
+			else: continue
+			writes.append((bibID,itemID,hash,text))
+		for itemID,(hash,row) in seen.items():
+			changes.append(ItemChange(bibID,itemID,'delete',json.loads(row)))
+		return changes,writes,list(seen)
+
+	def _apply(self,bibID,changes,writes,deletes):
+		# Stores the items of bibID, rescheduling the bib according to
+		# whether they changed.
+		now = time()
+		interval = self._db.execute('SELECT interval FROM sync_bibs WHERE bibID=?',(bibID,)).fetchone()[0]
+		interval = self._minInterval if changes else min(interval*2,self._maxInterval)
+		self._db.execute('BEGIN IMMEDIATE')
+		try:
+			self._db.executemany('INSERT OR REPLACE INTO sync_items (bibID,itemID,hash,row) VALUES (?,?,?,?)',writes)
+			self._db.executemany('DELETE FROM sync_items WHERE bibID=? AND itemID=?',[(bibID,itemID) for itemID in deletes])
+			if changes: self._db.execute('UPDATE sync_bibs SET synced=?, changed=?, interval=?, due=? WHERE bibID=?',(now,now,interval,now+interval,bibID))
+			else: self._db.execute('UPDATE sync_bibs SET synced=?, interval=?, due=? WHERE bibID=?',(now,interval,now+interval,bibID))
+			self._db.execute('COMMIT')
+		except Exception:
+			self._db.execute('ROLLBACK')
+			raise
+		if changes: self.stats['changed'] += 1
+		for change in changes: self.stats[change.kind] += 1
@@ -0,0 +1,66 @@
+'''
+	The stub Polaris API server of the tests: the mock server of the
+	benchmarks (benchmarks/mock_papi.py), which checks every signature as
+	Polaris does, run in process and recording how many requests it was
+	answering at once, and a variant injecting faults.
+'''
+from collections import deque
+import os
+import sys
+from time import sleep
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),os.pardir,'benchmarks'))
+from mock_papi import MockPAPI, _payload, bibRows, holdingsRows, readingHistoryRows
+
+accessKey = 'test-access-key'
+accessKeyID = 'test'
+patronBarcode = '21234000123456'
+patronPassword = '1234'
+
+class StubPAPI(MockPAPI):
+	'''
+	A MockPAPI which takes delay seconds over every answer and keeps the
+	peak number of requests it was answering at once.
+	'''
+
+	def __init__(self,delay=0.0,readingHistorySize=250):
+		MockPAPI.__init__(self,accessKey,accessKeyID,{patronBarcode:patronPassword},readingHistorySize)
+		self.delay = delay
+		self.active = 0
+		self.peak = 0
+
+	def answer(self,method,path,headers):
+		with self._lock:
+			self.active += 1
+			self.peak = max(self.peak,self.active)
+		try:
+			if self.delay: sleep(self.delay)
+			return MockPAPI.answer(self,method,path,headers)
+		finally:
+			with self._lock: self.active -= 1
+
+class FaultyPAPI(StubPAPI):
+	'''
+	A StubPAPI answering requests with the faults queued by fail, one per
+	request in the order received, then normally again: 'reset' drops the
+	connection unanswered, a number is answered as that HTTP status and
+	('slow',seconds) answers normally after seconds. Every request is
+	recorded in seen as (method,path,Date header).
+	'''
+
+	def __init__(self,**kwargs):
+		StubPAPI.__init__(self,**kwargs)
+		self.faults = deque()
+		self.seen = []
+
+	def fail(self,*faults):
+		with self._lock: self.faults.extend(faults)
+
+	def answer(self,method,path,headers):
+		with self._lock:
+			self.seen.append((method,path,headers.get('Date')))
+			fault = self.faults.popleft() if self.faults else None
+		if fault == 'reset': return None,None
+		if isinstance(fault,int): return fault,_payload({'PAPIErrorCode':-1,'ErrorMessage':'Injected fault'})
+		if isinstance(fault,tuple): sleep(fault[1])
+		return StubPAPI.answer(self,method,path,headers)
@@ -0,0 +1,82 @@
+import asyncio
+import unittest
+import polaris.aio
+from .stub import StubPAPI, accessKey, accessKeyID, bibRows, holdingsRows, patronBarcode, patronPassword
+
+class AsyncPAPITest(unittest.TestCase):
+
+	def setUp(self):
+		self.server = StubPAPI()
+		self.hostname = self.server.start()
+
+	def tearDown(self):
+		self.server.stop()
+
+	def wait(self,coroutine):
+		return asyncio.run(coroutine)
+
+	def papi(self,concurrency=10,accessKey=accessKey):
+		return polaris.aio.AsyncPAPI(accessKey,accessKeyID,self.hostname,concurrency=concurrency)
+
+	def test_results(self):
+		async def calls():
+			async with self.papi() as papi:
+				return await asyncio.gather(papi.bibGet('353063'),papi.bibHoldingsGet('353063'),papi.patronBasicDataGet(patronBarcode,patronPassword))
+		bib,holdings,patron = self.wait(calls())
+		self.assertEqual(bib.status_code,200)
+		self.assertEqual(bib.json()['BibGetRows'],bibRows('353063'))
+		self.assertEqual(holdings.json()['BibHoldingsGetRows'],holdingsRows())
+		self.assertEqual(patron.json()['PatronBasicData']['Barcode'],patronBarcode)
+
+	def test_concurrency(self):
+		self.server.delay = 0.05
+		async def calls():
+			async with self.papi(concurrency=3) as papi:
+				return await asyncio.gather(*[papi.bibGet(str(bibID)) for bibID in range(12)])
+		responses = self.wait(calls())
+		self.assertEqual([response.status_code for response in responses],[200]*12)
+		self.assertEqual(self.server.peak,3)
+
+	def test_signatures(self):
+		async def calls(papi,password):
+			async with papi:
+				return await asyncio.gather(papi.bibGet('1'),papi.patronBasicDataGet(patronBarcode,password))
+		responses = self.wait(calls(self.papi(),patronPassword))
+		self.assertEqual([response.status_code for response in responses],[200,200])
+		self.assertEqual(self.server.rejected,0)
+		responses = self.wait(calls(self.papi(),'wrong'))
+		self.assertEqual([response.status_code for response in responses],[200,401])
+		responses = self.wait(calls(self.papi(accessKey='wrong-access-key'),patronPassword))
+		self.assertEqual([response.status_code for response in responses],[401,401])
+		self.assertEqual(self.server.rejected,3)
+
+	def test_batchHelpers(self):
+		async def calls():
+			async with self.papi(concurrency=4) as papi:
+				results = [result async for result in papi.bibGetMany([str(bibID) for bibID in range(20)],maxWorkers=8)]
+				paged = [row async for row in papi.iterReadingHistory(patronBarcode,patronPassword,rowsPerPage='100',prefetch=1)]
+				whole = [row async for row in papi.iterReadingHistory(patronBarcode,patronPassword,rowsPerPage='0')]
+				return results,paged,whole
+		requests = self.server.requests
+		results,paged,whole = self.wait(calls())
+		self.assertEqual([result.key for result in results],[str(bibID) for bibID in range(20)])
+		self.assertTrue(all(result.error is None and result.response.status_code == 200 for result in results))
+		self.assertEqual([row['PatronReadingHistoryID'] for row in paged],list(range(250)))
+		self.assertEqual(paged,whole)
+		# 20 bibs, 3 pages (the last short, plus at most one prefetched)
+		# and the single page of rowsPerPage='0'.
+		self.assertIn(self.server.requests-requests,(24,25))
+
+	def test_bibAvailabilityGet(self):
+		async def calls():
+			async with self.papi(concurrency=2) as papi:
+				return await papi.bibAvailabilityGet(['1','2','3'],orgIDs=[3,4])
+		availability = self.wait(calls())
+		# The stub has no organizationsGet, so the holdings rows name their
+		# own branches.
+		expected = {'Main Library':{'total':2,'available':1},'North Branch':{'total':2,'available':1}}
+		self.assertEqual(availability,{'1':expected,'2':expected,'3':expected})
+		self.assertLessEqual(self.server.peak,2)
+
+if __name__ == '__main__':
+	unittest.main()
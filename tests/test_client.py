@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+import unittest
+from time import sleep
+import requests
+import polaris
+import polaris.client
+from .stub import StubPAPI, accessKey, accessKeyID, patronBarcode, patronPassword
+
+characters = [chr(code) for code in range(32,127)]+[u'é',u'€',u'\U0001f600']
+
+class BuildURITest(unittest.TestCase):
+
+	def test_fastPathMatchesRequests(self):
+		# Whichever path _buildURI takes, the URI it signs must be the one
+		# requests sends.
+		papi = polaris.PAPI(accessKey,accessKeyID,'papi.example.org')
+		for character in characters:
+			for suffixURI,params in ((u'bib/a'+character+u'b',{}),(u'bib/1',{u'q':u'a'+character+u'b'}),(u'bib/1',{u'q'+character:u'x'}),(u'bib/1',{u'q':u'['+character+u']'})):
+				URI = papi._buildURI('http','public',suffixURI,params=params)
+				expected = polaris.client._normaliseURL(papi._rootURI('http','public')+suffixURI+papi._dictParse(params))
+				self.assertEqual(URI,expected,repr((suffixURI,params)))
+
+	def test_bracketsVerify(self):
+		server = StubPAPI()
+		hostname = server.start()
+		try:
+			papi = polaris.PAPI(accessKey,accessKeyID,hostname)
+			self.assertEqual(papi.bibGet('1',params={'q':'[x]'}).status_code,200)
+			self.assertEqual(papi.bibGet('1',params={'q':'a b&c=[d]'}).status_code,200)
+			self.assertEqual(server.rejected,0)
+		finally:
+			server.stop()
+
+class IterPagesTest(unittest.TestCase):
+
+	def fetched(self,prefetch):
+		# The pages requested while the first one is being consumed.
+		fetched = []
+		lock = threading.Lock()
+		def fetchPage(page):
+			with lock: fetched.append(page)
+			response = requests.Response()
+			response.status_code = 200
+			response._content = json.dumps({'PAPIErrorCode':10,'Rows':[{'page':page}]*10}).encode('utf-8')
+			return response
+		papi = polaris.PAPI(accessKey,accessKeyID,'papi.example.org')
+		rows = papi._iterPages(fetchPage,'Rows',10,prefetch)
+		next(rows)
+		sleep(0.3)
+		with lock: pages = sorted(fetched)
+		rows.close()
+		return pages
+
+	def test_prefetch(self):
+		self.assertEqual(self.fetched(0),[1])
+		self.assertEqual(self.fetched(1),[1,2])
+		self.assertEqual(self.fetched(2),[1,2,3])
+
+	def test_iterReadingHistory(self):
+		server = StubPAPI()
+		hostname = server.start()
+		try:
+			papi = polaris.PAPI(accessKey,accessKeyID,hostname)
+			self.assertEqual(len(list(papi.iterReadingHistory(patronBarcode,patronPassword,rowsPerPage='0',prefetch=2))),250)
+			self.assertEqual(server.requests,1)
+			for prefetch in (0,1,2):
+				rows = list(papi.iterReadingHistory(patronBarcode,patronPassword,rowsPerPage='100',prefetch=prefetch))
+				self.assertEqual([row['PatronReadingHistoryID'] for row in rows],list(range(250)))
+		finally:
+			server.stop()
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from time import sleep, time
+import polaris
+import polaris.client
+import polaris.ratelimit
+import polaris.resilience
+from .stub import StubPAPI, accessKey, accessKeyID
+
+class RateLimiterTest(unittest.TestCase):
+
+	def race(self,limiter,first,second):
+		# Starts a call of the lane first waiting for the only bucket, then
+		# one of the lane second, and returns the order they were served in.
+		served = []
+		def acquire(priority):
+			limiter.acquire('bib',priority)
+			served.append(priority)
+		threads = [threading.Thread(target=acquire,args=(priority,)) for priority in (first,second)]
+		for thread in threads:
+			thread.start()
+			sleep(0.02)
+		for thread in threads: thread.join()
+		return served
+
+	def test_lanePreemption(self):
+		limiter = polaris.ratelimit.RateLimiter(familyRates={'bib':(10,1)})
+		limiter.acquire('bib')
+		self.assertEqual(self.race(limiter,'batch','interactive'),['interactive','batch'])
+
+	def test_unknownPriority(self):
+		limiter = polaris.ratelimit.RateLimiter(familyRates={'bib':(10,1)})
+		self.assertEqual(limiter._lane('bulk'),1)
+		limiter.acquire('bib','bulk')
+		self.assertEqual(self.race(limiter,'bulk','interactive'),['interactive','bulk'])
+
+	def test_reserve(self):
+		limiter = polaris.ratelimit.RateLimiter(rate=1,burst=3,reserve=2)
+		limiter.acquire(None,'batch',time()+0.1)
+		self.assertRaises(polaris.client.AdmissionTimeout,limiter.acquire,None,'batch',time()+0.1)
+		limiter.acquire(None,'interactive',time()+0.1)
+		limiter.acquire(None,'interactive',time()+0.1)
+
+	def test_sqliteBucketsShared(self):
+		directory = tempfile.mkdtemp()
+		try:
+			path = os.path.join(directory,'buckets.sqlite')
+			limiters = [polaris.ratelimit.RateLimiter(rate=1,burst=2,store=polaris.ratelimit.SqliteBuckets(path)) for limiter in range(2)]
+			limiters[0].acquire(None,None,time()+0.1)
+			limiters[1].acquire(None,None,time()+0.1)
+			for limiter in limiters:
+				self.assertRaises(polaris.client.AdmissionTimeout,limiter.acquire,None,None,time()+0.1)
+			started = time()
+			limiters[1].acquire()
+			self.assertGreater(time()-started,0.5)
+		finally:
+			shutil.rmtree(directory)
+
+	def test_admissionTimeoutWithRetryPolicy(self):
+		server = StubPAPI()
+		hostname = server.start()
+		try:
+			policy = polaris.resilience.RetryPolicy(retries=3,backoff=0,failureThreshold=1)
+			limiter = polaris.ratelimit.RateLimiter(familyRates={'bib':(1,1)})
+			papi = polaris.PAPI(accessKey,accessKeyID,hostname,rateLimiter=limiter,retryPolicy=policy)
+			self.assertEqual(papi.bibGet('1').status_code,200)
+			started = time()
+			self.assertRaises(polaris.client.AdmissionTimeout,papi.bibGet,'1',deadline=0.2)
+			self.assertLess(time()-started,0.2)
+			self.assertEqual(policy.breakerStates(),{'bib':'closed'})
+			self.assertEqual(server.requests,1)
+		finally:
+			server.stop()
+
+if __name__ == '__main__':
+	unittest.main()
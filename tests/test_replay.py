@@ -0,0 +1,46 @@
+import os
+import shutil
+import tempfile
+import unittest
+import polaris
+import polaris.replay
+from .stub import StubPAPI, accessKey, accessKeyID, patronBarcode, patronPassword
+
+class ReplayTest(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.path = os.path.join(self.directory,'traffic.jsonl')
+		server = StubPAPI()
+		hostname = server.start()
+		try:
+			recorder = polaris.replay.Recorder(self.path)
+			papi = polaris.PAPI(accessKey,accessKeyID,hostname,transport=recorder)
+			papi.bibGet('1')
+			papi.bibGet('1',orgID='3')
+			papi.bibHoldingsGet('2',version='v2',langID='1036',appID='101')
+			papi.patronBasicDataGet(patronBarcode,patronPassword)
+			recorder.close()
+		finally:
+			server.stop()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def test_calls(self):
+		calls = polaris.replay.Replayer(self.path).calls()
+		self.assertEqual([(call.endpoint,call.version,call.langID,call.appID,call.orgID) for call in calls],[
+			('bibGet','v1','1033','100','1'),
+			('bibGet','v1','1033','100','3'),
+			('bibHoldingsGet','v2','1036','101','1'),
+			('patronBasicDataGet','v1','1033','100','1')])
+
+	def test_drive(self):
+		replayer = polaris.replay.Replayer(self.path,timeScale=0)
+		papi = polaris.PAPI('another-access-key','another','replay.example.org',transport=replayer)
+		report = replayer.drive(papi,maxWorkers=2)
+		self.assertEqual((report['calls'],report['failed']),(4,0))
+		self.assertRaises(polaris.replay.ReplayMiss,papi.bibGet,'1',orgID='4')
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,111 @@
+from email.utils import formatdate
+import threading
+import unittest
+from time import sleep, time
+import requests
+import polaris
+import polaris.client
+import polaris.resilience
+from .stub import FaultyPAPI, accessKey, accessKeyID, patronBarcode, patronPassword
+
+class RetryPolicyTest(unittest.TestCase):
+
+	def setUp(self):
+		self.server = FaultyPAPI()
+		self.hostname = self.server.start()
+
+	def tearDown(self):
+		self.server.stop()
+
+	def papi(self,**kwargs):
+		policy = polaris.resilience.RetryPolicy(**dict({'retries':3,'backoff':0},**kwargs))
+		return polaris.PAPI(accessKey,accessKeyID,self.hostname,retryPolicy=policy),policy
+
+	def test_getRetried(self):
+		papi,policy = self.papi()
+		self.server.fail(503,'reset',503)
+		response = papi.bibGet('353063')
+		self.assertEqual(response.status_code,200)
+		self.assertEqual([method for method,path,date in self.server.seen],['GET']*4)
+		self.assertEqual(self.server.rejected,0)
+
+	def test_getRetriesExhausted(self):
+		papi,policy = self.papi(retries=1)
+		self.server.fail('reset','reset')
+		self.assertRaises(requests.exceptions.ConnectionError,papi.bibGet,'353063')
+		self.assertEqual(len(self.server.seen),2)
+
+	def test_putNotRetried(self):
+		papi,policy = self.papi()
+		self.server.fail(503)
+		response = papi.itemRenew(patronBarcode,patronPassword,'8675309','3','2','1','true')
+		self.assertEqual(response.status_code,503)
+		self.server.fail('reset')
+		self.assertRaises(requests.exceptions.ConnectionError,papi.itemRenew,patronBarcode,patronPassword,'8675309','3','2','1','true')
+		self.assertEqual([method for method,path,date in self.server.seen],['PUT','PUT'])
+
+	def test_freshDate(self):
+		# The Date header only changes once a second; stand in a clock
+		# which moves a second on every signature, so that every attempt
+		# must be signed anew to be accepted.
+		papi,policy = self.papi()
+		calls = []
+		def httpDate():
+			calls.append(None)
+			return formatdate(time()+len(calls),localtime=False,usegmt=True)
+		original = polaris.client._httpDate
+		polaris.client._httpDate = httpDate
+		try:
+			self.server.fail(503,503)
+			response = papi.bibGet('353063')
+		finally:
+			polaris.client._httpDate = original
+		self.assertEqual(response.status_code,200)
+		dates = [date for method,path,date in self.server.seen]
+		self.assertEqual(len(dates),3)
+		self.assertEqual(len(set(dates)),3)
+		self.assertEqual(self.server.rejected,0)
+
+	def test_deadline(self):
+		papi,policy = self.papi(deadline=0.5)
+		self.server.fail(*[('slow',2)]*5)
+		started = time()
+		self.assertRaises(requests.exceptions.Timeout,papi.bibGet,'353063')
+		self.assertLess(time()-started,1.5)
+		started = time()
+		self.assertRaises(polaris.DeadlineExceeded,papi.bibGet,'353063',deadline=0)
+		self.assertLess(time()-started,0.5)
+
+	def test_breaker(self):
+		papi,policy = self.papi(retries=0,failureThreshold=2,resetTimeout=0.5)
+		self.server.fail(503,503)
+		self.assertEqual([papi.bibGet('1').status_code for call in range(2)],[503,503])
+		self.assertEqual(policy.breakerStates(),{'bib':'open'})
+		self.assertRaises(polaris.resilience.CircuitOpenError,papi.bibGet,'1')
+		self.assertEqual(len(self.server.seen),2)
+		# Other families have breakers of their own.
+		self.assertEqual(papi.patronBasicDataGet(patronBarcode,patronPassword).status_code,200)
+		sleep(0.6)
+		self.server.fail(('slow',0.5))
+		trial = {}
+		thread = threading.Thread(target=lambda: trial.update(response=papi.bibGet('1')))
+		thread.start()
+		sleep(0.2)
+		self.assertEqual(policy.breakerStates()['bib'],'half-open')
+		self.assertRaises(polaris.resilience.CircuitOpenError,papi.bibGet,'1')
+		thread.join()
+		self.assertEqual(trial['response'].status_code,200)
+		self.assertEqual(policy.breakerStates()['bib'],'closed')
+		self.assertEqual(papi.bibGet('1').status_code,200)
+
+	def test_trialReopens(self):
+		papi,policy = self.papi(retries=0,failureThreshold=1,resetTimeout=0.2)
+		self.server.fail('reset')
+		self.assertRaises(requests.exceptions.ConnectionError,papi.bibGet,'1')
+		sleep(0.3)
+		self.server.fail(503)
+		self.assertEqual(papi.bibGet('1').status_code,503)
+		self.assertEqual(policy.breakerStates()['bib'],'open')
+
+if __name__ == '__main__':
+	unittest.main()
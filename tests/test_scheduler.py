@@ -0,0 +1,87 @@
+import threading
+import unittest
+from time import sleep, time
+import polaris
+import polaris.resilience
+import polaris.scheduler
+from .stub import StubPAPI, accessKey, accessKeyID
+
+class SchedulerTest(unittest.TestCase):
+
+	def setUp(self):
+		self.server = StubPAPI()
+		self.hostname = self.server.start()
+
+	def tearDown(self):
+		self.server.stop()
+
+	def occupy(self,scheduler,priority='interactive'):
+		# Takes a slot of scheduler until the returned event is set.
+		release = threading.Event()
+		thread = threading.Thread(target=scheduler.run,args=(priority,None,release.wait))
+		thread.start()
+		while scheduler.stats()[priority]['inFlight'] == 0: sleep(0.001)
+		return release,thread
+
+	def test_weightedDispatch(self):
+		# Interactive requests go ahead of a batch backlog queued before
+		# them, but the backlog still gets one request in every nine.
+		scheduler = polaris.scheduler.Scheduler(maxConcurrency=1)
+		release,holder = self.occupy(scheduler)
+		served = []
+		threads = []
+		for priority in ['batch']*4+['interactive']*4:
+			thread = threading.Thread(target=scheduler.run,args=(priority,None,lambda priority=priority: served.append(priority)))
+			thread.start()
+			threads.append(thread)
+			queued = len(threads)
+			while sum(stats['queued'] for stats in scheduler.stats().values()) < queued: sleep(0.001)
+		release.set()
+		for thread in [holder]+threads: thread.join()
+		self.assertEqual(served,['interactive','batch','interactive','interactive','interactive','batch','batch','batch'])
+		self.assertEqual(scheduler.stats()['batch']['admitted'],4)
+
+	def test_queueFull(self):
+		scheduler = polaris.scheduler.Scheduler(maxConcurrency=1,maxQueue={'batch':1})
+		release,holder = self.occupy(scheduler)
+		waiter = threading.Thread(target=scheduler.run,args=('batch',None,lambda: None))
+		waiter.start()
+		while scheduler.stats()['batch']['queued'] == 0: sleep(0.001)
+		self.assertRaises(polaris.scheduler.QueueFull,scheduler.run,'batch',None,lambda: None)
+		release.set()
+		holder.join()
+		waiter.join()
+		self.assertEqual((scheduler.stats()['batch']['admitted'],scheduler.stats()['batch']['rejected']),(1,1))
+
+	def test_admissionErrorsWithRetryPolicy(self):
+		# Requests never admitted are neither retried nor counted against
+		# the circuit breaker.
+		scheduler = polaris.scheduler.Scheduler(maxConcurrency=1,maxQueue={'batch':0},maxWait={'interactive':0.1})
+		policy = polaris.resilience.RetryPolicy(retries=3,backoff=0,failureThreshold=2)
+		papi = polaris.PAPI(accessKey,accessKeyID,self.hostname,scheduler=scheduler,retryPolicy=policy)
+		release,holder = self.occupy(scheduler)
+		for call in range(3):
+			started = time()
+			self.assertRaises(polaris.client.AdmissionTimeout,papi.bibGet,'1')
+			self.assertLess(time()-started,0.5)
+		self.assertRaises(polaris.scheduler.QueueFull,papi.bibGet,'1',priority='batch')
+		self.assertRaises(polaris.DeadlineExceeded,papi.bibGet,'1',deadline=0.05)
+		release.set()
+		holder.join()
+		stats = scheduler.stats()
+		self.assertEqual((stats['interactive']['expired'],stats['batch']['rejected']),(4,1))
+		self.assertEqual(policy.breakerStates(),{'bib':'closed'})
+		self.assertEqual(self.server.requests,0)
+		self.assertEqual(papi.bibGet('1').status_code,200)
+
+	def test_unknownPriority(self):
+		scheduler = polaris.scheduler.Scheduler(maxConcurrency=2,classes=('interactive','bulk'))
+		papi = polaris.PAPI(accessKey,accessKeyID,self.hostname,scheduler=scheduler)
+		results = list(papi.bibGetMany(['1','2','3']))
+		self.assertEqual([result.error for result in results],[None]*3)
+		self.assertEqual(papi.bibGet('4',priority='urgent').status_code,200)
+		stats = scheduler.stats()
+		self.assertEqual((stats['interactive']['admitted'],stats['bulk']['admitted']),(0,4))
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+import io
+import json
+import unittest
+import requests
+import polaris
+import polaris.stream
+from .stub import StubPAPI, accessKey, accessKeyID, patronBarcode, patronPassword
+
+rowsKey = 'PatronReadingHistoryGetRows'
+rows = [{'PatronReadingHistoryID':1,'Title':u'Café € \U0001f600','Ratio':-1.5e-3,'Due':None,'Holdable':True,'Tags':[u'ü',{'n':12345}]},
+		{'PatronReadingHistoryID':123456789,'Title':u'日本語','Ratio':0,'Due':'/Date(1491058000000-0400)/','Holdable':False,'Tags':[]}]
+
+def response(body,encoding='utf-8'):
+	content = body if isinstance(body,bytes) else json.dumps(body,ensure_ascii=False).encode(encoding)
+	response = requests.Response()
+	response.status_code = 200
+	response.encoding = encoding
+	response.raw = io.BytesIO(content)
+	return response
+
+def stream(body,chunkSize,compact=False):
+	return polaris.stream.RowStream('patronReadingHistoryGet',response(body),compact=compact,chunkSize=chunkSize)
+
+class RowStreamTest(unittest.TestCase):
+
+	def test_chunkSizes(self):
+		# Every chunk size up to the whole body splits multibyte characters,
+		# strings, numbers and literals at every possible place.
+		body = {'PAPIErrorCode':2,'ErrorMessage':u'',rowsKey:rows,'TotalRecordsFound':98765}
+		length = len(json.dumps(body,ensure_ascii=False).encode('utf-8'))
+		for chunkSize in range(1,length+1):
+			rowStream = stream(body,chunkSize)
+			self.assertEqual(list(rowStream),rows,chunkSize)
+			self.assertEqual(rowStream.body,{'PAPIErrorCode':2,'ErrorMessage':u'','TotalRecordsFound':98765},chunkSize)
+
+	def test_numbersAtChunkEnds(self):
+		for text in (b'{"PAPIErrorCode":2,"PatronReadingHistoryGetRows":[12,345],"TotalRecordsFound":6789}',b'{"PatronReadingHistoryGetRows":[1.25e10,-7],"PAPIErrorCode":2}'):
+			expected = json.loads(text.decode('utf-8'))
+			for chunkSize in range(1,len(text)+1):
+				rowStream = stream(text,chunkSize)
+				self.assertEqual(list(rowStream),expected[rowsKey],(text,chunkSize))
+				self.assertEqual(rowStream.body,dict((key,value) for key,value in expected.items() if key != rowsKey))
+
+	def test_errorAfterRows(self):
+		for chunkSize in (1,7,65536):
+			rowStream = stream(OrderedDict([(rowsKey,rows),('PAPIErrorCode',-3000),('ErrorMessage','Patron does not exist')]),chunkSize)
+			yielded = []
+			with self.assertRaises(polaris.PAPIError):
+				for row in rowStream: yielded.append(row)
+			self.assertEqual(yielded,rows)
+			self.assertEqual(rowStream.body['PAPIErrorCode'],-3000)
+
+	def test_errorBeforeRows(self):
+		rowStream = stream(OrderedDict([('PAPIErrorCode',-3000),('ErrorMessage','Patron does not exist'),(rowsKey,rows)]),3)
+		yielded = []
+		with self.assertRaises(polaris.PAPIError):
+			for row in rowStream: yielded.append(row)
+		self.assertEqual(yielded,[])
+
+	def test_empty(self):
+		for body in ({'PAPIErrorCode':0,rowsKey:[]},{rowsKey:[ ],'PAPIErrorCode':0},{rowsKey:None,'PAPIErrorCode':0},{}):
+			for chunkSize in (1,2,65536):
+				rowStream = stream(body,chunkSize)
+				self.assertEqual(list(rowStream),[],(body,chunkSize))
+		self.assertEqual(list(stream(b'{ "PatronReadingHistoryGetRows" : [ \n ] }',1)),[])
+
+	def test_truncated(self):
+		self.assertRaises(ValueError,list,stream(b'{"PatronReadingHistoryGetRows":[{"Title":"x"},',4))
+
+	def test_compact(self):
+		compact = list(stream({rowsKey:rows,'PAPIErrorCode':2},5,compact=True))
+		self.assertEqual([row.PatronReadingHistoryID for row in compact],[1,123456789])
+		self.assertEqual(compact[0].Title,rows[0]['Title'])
+
+	def test_encoding(self):
+		self.assertEqual(list(polaris.stream.RowStream('patronReadingHistoryGet',response({rowsKey:rows},'utf-16'),chunkSize=3)),rows)
+
+	def test_stub(self):
+		server = StubPAPI()
+		hostname = server.start()
+		try:
+			papi = polaris.PAPI(accessKey,accessKeyID,hostname)
+			streamed = list(papi.patronReadingHistoryGet(patronBarcode,patronPassword,'1','0',stream=True))
+			self.assertEqual(streamed,papi.patronReadingHistoryGet(patronBarcode,patronPassword,'1','0').json()[rowsKey])
+			self.assertEqual(len(streamed),250)
+		finally:
+			server.stop()
+
+if __name__ == '__main__':
+	unittest.main()